@@ -0,0 +1,90 @@
+"""Minimal local HTTP/1.1 server that answers after a configurable delay."""
+
+import asyncio
+
+from collections.abc import Callable
+from types import TracebackType
+
+
+class DelayedServer:
+    """
+    Serve `body` on 127.0.0.1 after `delay()` seconds per request.
+
+    Keeps connections alive, counts requests, and is used as an async
+    context manager:
+
+        >>> async with DelayedServer(lambda: 0.01, b"{}") as server:
+        ...     await client.get(server.url)
+    """
+
+    def __init__(
+        self,
+        delay: Callable[[], float],
+        body: bytes,
+        content_type: str = "application/json",
+    ) -> None:
+        self.delay = delay
+        self.body = body
+        self.content_type = content_type
+        self.requests = 0
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            msg = "Server is not running"
+            raise RuntimeError(msg)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/"
+
+    async def __aenter__(self) -> "DelayedServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while await read_request(reader):
+                self.requests += 1
+                await asyncio.sleep(self.delay())
+                head = (
+                    "HTTP/1.1 200 OK\r\n"
+                    f"Content-Type: {self.content_type}\r\n"
+                    f"Content-Length: {len(self.body)}\r\n"
+                    "\r\n"
+                )
+                writer.write(head.encode() + self.body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Clients hang up on cancelled requests, and asyncio.run cancels
+            # handlers still sleeping at exit; neither is worth a traceback.
+            pass
+        finally:
+            writer.close()
+
+
+async def read_request(reader: asyncio.StreamReader) -> bytes:
+    """
+    Read one request and skip its body; return the request line and headers.
+
+    Returns b"" when the client closed the connection.
+    """
+    head = await reader.readuntil(b"\r\n\r\n") if not reader.at_eof() else b""
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            await reader.readexactly(int(value))
+    return head
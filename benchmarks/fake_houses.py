@@ -0,0 +1,197 @@
+"""Local stand-ins for every exchange house, serving the test fixtures."""
+
+import asyncio
+import random
+
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+import httpx
+
+from delayed_server import read_request
+from perexchange.scrapers import (
+    cambiafx,
+    cambioseguro,
+    chapacambio,
+    cuantoestaeldolar,
+    dollarhouse,
+    instakash,
+    srcambio,
+    tkambio,
+    tucambista,
+    westernunion,
+    yanki,
+)
+from scoped_parsing import FIXTURES_DIR
+
+
+# Every URL a scraper requests, with the house it belongs to and the fixture
+# served for it.
+ROUTES = {
+    cambiafx.URL: ("cambiafx", "happy_path.json"),
+    cambioseguro.URL: ("cambioseguro", "happy_path.json"),
+    chapacambio.URL: ("chapacambio", "happy_path.json"),
+    cuantoestaeldolar.URL: ("cuantoestaeldolar", "happy_path.html"),
+    dollarhouse.URL: ("dollarhouse", "happy_path.html"),
+    instakash.URL: ("instakash", "happy_path.html"),
+    srcambio.URL: ("srcambio", "happy_path.json"),
+    tkambio.URL: ("tkambio", "happy_path.json"),
+    tucambista.URL: ("tucambista", "happy_path.json"),
+    westernunion.PAGE_URL: ("westernunion", "page.html"),
+    westernunion.API_URL: ("westernunion", "happy_path.json"),
+    yanki.URL: ("yanki", "happy_path.json"),
+}
+
+
+@dataclass
+class Behavior:
+    """How a fake house answers: delay in seconds and share of 503s."""
+
+    latency: float = 0.05
+    jitter: float = 0.0  # Latency varies uniformly by up to this much
+    failure_rate: float = 0.0
+
+
+@dataclass
+class _Page:
+    house: str
+    body: bytes
+    content_type: str
+
+
+class FakeHouses:
+    """
+    One local HTTP/1.1 server per exchange-house host.
+
+    Each host gets its own port, so a client keeps one connection pool per
+    house as it would against the real sites. Route a client to the servers
+    with `transport()`:
+
+        >>> async with FakeHouses({"yanki": Behavior(failure_rate=0.1)}) as fake:
+        ...     client = create_http_client(10.0, transport=fake.transport())
+    """
+
+    def __init__(
+        self,
+        behaviors: dict[str, Behavior] | None = None,
+        default: Behavior | None = None,
+        seed: int = 42,
+        fixtures: Path = FIXTURES_DIR,
+    ) -> None:
+        self.behaviors = behaviors or {}
+        self.default = default or Behavior()
+        self.requests: dict[str, int] = {}
+        self.failures: dict[str, int] = {}
+        self.connections: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._pages: dict[str, dict[str, _Page]] = {}
+        for url, (house, fixture) in ROUTES.items():
+            parsed = httpx.URL(url)
+            content_type = (
+                "text/html" if fixture.endswith(".html") else "application/json"
+            )
+            body = (fixtures / house / fixture).read_bytes()
+            self._pages.setdefault(parsed.host, {})[parsed.path] = _Page(
+                house, body, f"{content_type}; charset=utf-8"
+            )
+        self._servers: dict[str, asyncio.Server] = {}
+
+    @property
+    def ports(self) -> dict[str, int]:
+        """Local port serving each original host."""
+        return {
+            host: server.sockets[0].getsockname()[1]
+            for host, server in self._servers.items()
+        }
+
+    def transport(self, limits: httpx.Limits | None = None) -> "LocalTransport":
+        """An httpx transport that sends each house's requests to its server."""
+        inner = httpx.AsyncHTTPTransport(limits=limits or httpx.Limits())
+        return LocalTransport(self.ports, inner)
+
+    async def __aenter__(self) -> "FakeHouses":
+        for host, pages in self._pages.items():
+
+            async def serve(
+                reader: asyncio.StreamReader,
+                writer: asyncio.StreamWriter,
+                pages: dict[str, _Page] = pages,
+            ) -> None:
+                await self._serve(pages, reader, writer)
+
+            self._servers[host] = await asyncio.start_server(serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        for server in self._servers.values():
+            server.close()
+        for server in self._servers.values():
+            await server.wait_closed()
+        self._servers.clear()
+
+    async def _serve(
+        self,
+        pages: dict[str, _Page],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        house = next(iter(pages.values())).house
+        self.connections[house] = self.connections.get(house, 0) + 1
+        try:
+            while head := await read_request(reader):
+                path = head.split(b" ", 2)[1].decode().partition("?")[0]
+                writer.write(await self._respond(pages.get(path)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Clients hang up on cancelled requests; not worth a traceback.
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, page: _Page | None) -> bytes:
+        if page is None:
+            return _response("404 Not Found", "text/plain", b"Not found\n")
+        behavior = self.behaviors.get(page.house, self.default)
+        self.requests[page.house] = self.requests.get(page.house, 0) + 1
+        jitter = self._rng.uniform(-behavior.jitter, behavior.jitter)
+        await asyncio.sleep(max(behavior.latency + jitter, 0.0))
+        if self._rng.random() < behavior.failure_rate:
+            self.failures[page.house] = self.failures.get(page.house, 0) + 1
+            return _response("503 Service Unavailable", "text/plain", b"")
+        return _response("200 OK", page.content_type, page.body)
+
+
+class LocalTransport(httpx.AsyncBaseTransport):
+    """Rewrite requests for known hosts to 127.0.0.1 on that host's port."""
+
+    def __init__(self, ports: dict[str, int], inner: httpx.AsyncBaseTransport) -> None:
+        self._ports = ports
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        port = self._ports.get(request.url.host)
+        if port is not None:
+            # The Host header still names the real house.
+            request.url = request.url.copy_with(
+                scheme="http", host="127.0.0.1", port=port
+            )
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _response(status: str, content_type: str, body: bytes) -> bytes:
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    return head.encode() + body
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Measure how hedged requests change tail latency against a slow upstream.
+
+Starts a local server whose responses are usually fast but occasionally very
+slow, then sends the same sequence of requests through fetch_with_retry with
+and without a Hedger, and prints latency percentiles and the extra load the
+hedges added.
+
+Usage:
+    uv run python benchmarks/hedging.py [--requests N] [--tail-rate P]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from collections.abc import Callable
+
+import httpx
+
+from delayed_server import DelayedServer
+from perexchange.context import current_house
+from perexchange.hedge import Hedger, hedger
+from perexchange.scrapers.base import create_http_client, fetch_with_retry
+
+
+def latency_model(fast: float, slow: float, tail_rate: float) -> Callable[[], float]:
+    rng = random.Random(42)
+
+    def delay() -> float:
+        if rng.random() < tail_rate:
+            return rng.uniform(slow / 2, slow)
+        return rng.uniform(fast / 2, fast)
+
+    return delay
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def run(
+    url: str, requests: int, concurrency: int, active: Hedger | None
+) -> list[float]:
+    current_house.set("bench")
+    hedger.set(active)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(client: httpx.AsyncClient) -> bytes:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    async with create_http_client(10.0, httpx.Limits(max_connections=None)) as client:
+
+        async def one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                await fetch_with_retry(fetch, 10.0, 1, 0.0, url, client=client)
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    print(
+        f"{'mode':<10} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+        f"{'max ms':>8} {'requests':>9} {'extra':>6}"
+    )
+    for mode in ("baseline", "hedged"):
+        delay = latency_model(args.fast, args.slow, args.tail_rate)
+        active = Hedger(max_extra=args.max_extra) if mode == "hedged" else None
+        async with DelayedServer(delay, b'{"buy": 3.37, "sell": 3.39}') as server:
+            if active is not None:
+                # Learn the house's latency first, as a long-lived session would.
+                await run(server.url, active.min_samples * 5, args.concurrency, active)
+                server.requests = 0
+            latencies = await run(server.url, args.requests, args.concurrency, active)
+            sent = server.requests
+
+        extra = sent / args.requests - 1
+        print(
+            f"{mode:<10} {percentile(latencies, 0.5) * 1e3:>8.1f} "
+            f"{percentile(latencies, 0.9) * 1e3:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1e3:>8.1f} "
+            f"{max(latencies) * 1e3:>8.1f} {sent:>9} {extra:>6.1%}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--fast", type=float, default=0.02, help="seconds")
+    parser.add_argument("--slow", type=float, default=0.5, help="seconds")
+    parser.add_argument("--tail-rate", type=float, default=0.05)
+    parser.add_argument("--max-extra", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
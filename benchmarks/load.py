@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Drive fetch_rates against local fake exchange houses and measure throughput.
+
+Starts one local server per house host (see fake_houses.py) serving the test
+fixtures with configurable latency, jitter and failure rate, then runs
+`--calls` fetch_rates calls, `--concurrency` at a time, through one
+RateSession (or a new client per call with --one-shot). Prints throughput,
+latency percentiles, connections opened, requests and retries overall and
+per house.
+
+Usage:
+    uv run python benchmarks/load.py [--calls N] [--concurrency C]
+        [--latency S] [--jitter S] [--failure-rate P]
+        [--house NAME=LATENCY[:JITTER[:FAILURE_RATE]] ...] [--one-shot]
+"""
+
+import argparse
+import asyncio
+import time
+
+from collections import Counter
+
+from fake_houses import Behavior, FakeHouses
+from hedging import percentile
+from perexchange import FetchResult, RateSession, events
+from perexchange.events import FetchEvent
+from perexchange.scrapers import resolve_houses
+from perexchange.scrapers.base import create_http_client, pool_limits
+
+
+def parse_house(value: str) -> tuple[str, Behavior]:
+    name, _, spec = value.partition("=")
+    numbers = [float(part) for part in spec.split(":")] if spec else []
+    return name.lower(), Behavior(*numbers)
+
+
+async def fetch(
+    fake: FakeHouses, session: RateSession | None, timeout: float, max_retries: int
+) -> FetchResult:
+    if session is not None:
+        return await session.fetch_rates(report=True)
+    limits = pool_limits(len(resolve_houses()))
+    async with (
+        create_http_client(timeout, transport=fake.transport(limits)) as client,
+        RateSession(timeout=timeout, max_retries=max_retries, client=client) as one,
+    ):
+        return await one.fetch_rates(report=True)
+
+
+async def run(
+    args: argparse.Namespace, fake: FakeHouses
+) -> tuple[list[float], list[FetchResult], float]:
+    latencies: list[float] = []
+    results: list[FetchResult] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    client = session = None
+    if not args.one_shot:
+        limits = pool_limits(len(resolve_houses()))
+        client = create_http_client(args.timeout, transport=fake.transport(limits))
+        session = RateSession(
+            timeout=args.timeout, max_retries=args.max_retries, client=client
+        )
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            result = await fetch(fake, session, args.timeout, args.max_retries)
+            latencies.append(time.perf_counter() - started)
+            results.append(result)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one() for _ in range(args.calls)))
+    finally:
+        if client is not None:
+            await client.aclose()
+    return latencies, results, time.perf_counter() - started
+
+
+def print_summary(
+    latencies: list[float],
+    results: list[FetchResult],
+    elapsed: float,
+    fake: FakeHouses,
+    retries: Counter[str],
+) -> None:
+    rates = sum(len(result) for result in results) / len(results)
+    print(
+        f"{len(results)} calls in {elapsed:.2f}s: {len(results) / elapsed:.1f} calls/s, "
+        f"{rates:.1f} rates per call"
+    )
+    print(
+        f"call latency ms: p50 {percentile(latencies, 0.5) * 1e3:.1f}  "
+        f"p95 {percentile(latencies, 0.95) * 1e3:.1f}  "
+        f"p99 {percentile(latencies, 0.99) * 1e3:.1f}  "
+        f"max {max(latencies) * 1e3:.1f}"
+    )
+    print(
+        f"connections {sum(fake.connections.values())}  "
+        f"requests {sum(fake.requests.values())}  "
+        f"server failures {sum(fake.failures.values())}  "
+        f"retries {sum(retries.values())}"
+    )
+
+    print(
+        f"\n{'house':<18} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'conns':>6} {'reqs':>6} {'503s':>6} {'retries':>8} {'errors':>7}"
+    )
+    for house in resolve_houses():
+        reports = [result.report[house] for result in results]
+        elapsed_by_house = [report.elapsed for report in reports]
+        errors = sum(report.status != "ok" for report in reports)
+        print(
+            f"{house:<18} {percentile(elapsed_by_house, 0.5) * 1e3:>8.1f} "
+            f"{percentile(elapsed_by_house, 0.95) * 1e3:>8.1f} "
+            f"{percentile(elapsed_by_house, 0.99) * 1e3:>8.1f} "
+            f"{fake.connections.get(house, 0):>6} {fake.requests.get(house, 0):>6} "
+            f"{fake.failures.get(house, 0):>6} {retries[house]:>8} {errors:>7}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    default = Behavior(args.latency, args.jitter, args.failure_rate)
+    behaviors = dict(parse_house(value) for value in args.house)
+    retries: Counter[str] = Counter()
+
+    def count_retries(event: FetchEvent) -> None:
+        if event.kind == "retry":
+            retries[event.house] += 1
+
+    async with FakeHouses(behaviors, default) as fake:
+        with events.listening(count_retries):
+            latencies, results, elapsed = await run(args, fake)
+    print_summary(latencies, results, elapsed, fake, retries)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--house",
+        action="append",
+        default=[],
+        metavar="NAME=LATENCY[:JITTER[:FAILURE_RATE]]",
+        help="override the defaults for one house; repeatable",
+    )
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument(
+        "--one-shot",
+        action="store_true",
+        help="open a new client per call, as px.fetch_rates does",
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
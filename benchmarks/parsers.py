@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Time every scraper's parser on the fixture corpus and on scaled-up payloads.
+
+Each case calls a house's `_parse_json` or `_parse_html` directly, with no
+network, on its happy_path fixture and on synthetic versions many times
+larger (a cuantoestaeldolar page with 1,000 cards, JSON lists with 1,000
+entries, HTML pages padded with unrelated markup). Prints ops/sec and peak
+memory per case.
+
+Save a baseline on a known-good commit, then compare against it; any case
+that got slower by more than the tolerance is listed and the exit status is
+1. Baselines are machine-specific, so save and compare on the same machine.
+
+Usage:
+    uv run python benchmarks/parsers.py [--min-time S] [--scale N]
+    uv run python benchmarks/parsers.py --save baseline.json
+    uv run python benchmarks/parsers.py --compare baseline.json [--tolerance F]
+"""
+
+import argparse
+import copy
+import json
+import time
+import tracemalloc
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+from perexchange.scrapers import (
+    cambiafx,
+    cambioseguro,
+    chapacambio,
+    cuantoestaeldolar,
+    dollarhouse,
+    instakash,
+    srcambio,
+    tkambio,
+    tucambista,
+    westernunion,
+    yanki,
+)
+from scoped_parsing import FIXTURES_DIR, pad
+
+
+JSON_PARSERS: dict[str, Callable[[Any], Any]] = {
+    "cambiafx": cambiafx._parse_json,
+    "cambioseguro": cambioseguro._parse_json,
+    "chapacambio": chapacambio._parse_json,
+    "srcambio": srcambio._parse_json,
+    "tkambio": tkambio._parse_json,
+    "tucambista": tucambista._parse_json,
+    "westernunion": westernunion._parse_json,
+    "yanki": yanki._parse_json,
+}
+
+HTML_PARSERS: dict[str, Callable[[str], Any]] = {
+    "cuantoestaeldolar": cuantoestaeldolar._parse_html,
+    "dollarhouse": dollarhouse._parse_html,
+    "instakash": instakash._parse_html,
+}
+
+Case = tuple[Callable[[Any], Any], Any]
+
+
+def load_json(house: str) -> Any:
+    with (FIXTURES_DIR / house / "happy_path.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_html(house: str, name: str = "happy_path.html") -> str:
+    return (FIXTURES_DIR / house / name).read_text(encoding="utf-8")
+
+
+def scale_json(data: Any, entries: int) -> Any | None:
+    """Repeat the payload's list of rates to `entries` items; None if it has none."""
+    if isinstance(data, list):
+        return (data * entries)[:entries]
+    for key, value in data.items():
+        if isinstance(value, list) and value:
+            return {**data, key: (value * entries)[:entries]}
+    return None
+
+
+def scale_cards(html: str, cards: int) -> str:
+    """Copy the cuantoestaeldolar fixture's house cards until there are `cards`."""
+    soup = BeautifulSoup(html, "lxml")
+    column = soup.find("div", class_=lambda c: bool(c and "item_col" in c))
+    if not isinstance(column, Tag) or column.parent is None:
+        msg = "cuantoestaeldolar fixture has no house cards"
+        raise ValueError(msg)
+    container = column.parent
+    existing = list(container.find_all("div", recursive=False))
+    for i in range(cards - len(existing)):
+        container.append(copy.copy(existing[i % len(existing)]))
+    return str(soup)
+
+
+def build_cases(scale: int, padding: int) -> dict[str, Case]:
+    cases: dict[str, Case] = {}
+    for house, parse in JSON_PARSERS.items():
+        data = load_json(house)
+        cases[house] = (parse, data)
+        scaled = scale_json(data, scale)
+        if scaled is not None:
+            cases[f"{house} x{scale}"] = (parse, scaled)
+
+    for house, parse in HTML_PARSERS.items():
+        html = load_html(house)
+        cases[house] = (parse, html)
+        if house == "cuantoestaeldolar":
+            cases[f"{house} x{scale} cards"] = (parse, scale_cards(html, scale))
+        else:
+            cases[f"{house} padded"] = (parse, pad(html, padding))
+
+    cases["westernunion token"] = (
+        westernunion._extract_verification_token,
+        load_html("westernunion", "page.html"),
+    )
+    return cases
+
+
+def measure(parse: Callable[[Any], Any], payload: Any, min_time: float) -> float:
+    """Best ops/sec over three runs of at least `min_time` seconds each."""
+    parse(payload)  # warm up imports and regex caches
+    best = 0.0
+    for _ in range(3):
+        calls = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            parse(payload)
+            calls += 1
+            elapsed = time.perf_counter() - started
+        best = max(best, calls / elapsed)
+    return best
+
+
+def peak_memory(parse: Callable[[Any], Any], payload: Any) -> int:
+    tracemalloc.start()
+    try:
+        parse(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """Cases whose ops/sec fell more than `tolerance` below the baseline."""
+    return [
+        f"{case}: {ops:,.0f} ops/s vs {baseline[case]:,.0f} baseline "
+        f"({ops / baseline[case] - 1:+.0%})"
+        for case, ops in results.items()
+        if case in baseline and ops < baseline[case] * (1 - tolerance)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds")
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--padding", type=int, default=500)
+    parser.add_argument("--save", type=Path, help="write ops/sec to this file")
+    parser.add_argument("--compare", type=Path, help="baseline file to check")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    results: dict[str, float] = {}
+
+    print(f"{'case':<30} {'ops/sec':>12} {'peak KiB':>9} {'vs baseline':>12}")
+    for case, (parse, payload) in build_cases(args.scale, args.padding).items():
+        ops = measure(parse, payload, args.min_time)
+        peak = peak_memory(parse, payload)
+        results[case] = ops
+        change = f"{ops / baseline[case] - 1:+.1%}" if case in baseline else ""
+        print(f"{case:<30} {ops:>12,.0f} {peak / 1024:>9.0f} {change:>12}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved baseline to {args.save}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nSlower than baseline by more than {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare full-document parsing with SoupStrainer-scoped parsing.
+
+Runs every HTML scraper over its happy_path fixture, once as it is and once
+padded with unrelated markup to approximate the size of the live pages, and
+prints time per parse and peak memory for both strategies.
+
+Usage:
+    uv run python benchmarks/scoped_parsing.py [--rounds N] [--padding N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+from perexchange.scrapers import cuantoestaeldolar, dollarhouse, instakash
+
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES_DIR = ROOT / "pkg" / "core" / "tests" / "fixtures"
+
+SCRAPERS = {
+    "cuantoestaeldolar": cuantoestaeldolar,
+    "dollarhouse": dollarhouse,
+    "instakash": instakash,
+}
+
+FILLER = (
+    '<section class="promo"><h2>Cambia seguro</h2>'
+    '<p>Lorem ipsum dolor sit amet, <a href="#">consectetur</a> adipiscing.</p>'
+    "<ul><li>Uno</li><li>Dos</li><li>Tres</li></ul></section>"
+)
+
+
+def full_parse(
+    html_content: str, features: str, scope: Any, extract: Callable[..., Any]
+) -> Any:
+    return extract(BeautifulSoup(html_content, features))
+
+
+def pad(html: str, sections: int) -> str:
+    filler = FILLER * sections
+    if "</body>" not in html:
+        return html + filler
+    return html.replace("</body>", f"{filler}</body>", 1)
+
+
+def measure(module: Any, html: str, rounds: int) -> tuple[float, int]:
+    module._parse_html(html)  # warm up imports and regex caches
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        module._parse_html(html)
+    per_parse = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    module._parse_html(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_parse, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--padding", type=int, default=500)
+    args = parser.parse_args()
+
+    header = f"{'house':<18} {'page':>8} {'full ms':>9} {'scoped ms':>10} "
+    header += f"{'speedup':>8} {'full KiB':>9} {'scoped KiB':>11}"
+    print(header)
+
+    for house, module in SCRAPERS.items():
+        html = (FIXTURES_DIR / house / "happy_path.html").read_text(encoding="utf-8")
+        for label, page in (("fixture", html), ("padded", pad(html, args.padding))):
+            scoped_time, scoped_peak = measure(module, page, args.rounds)
+            with patch.object(module, "parse_scoped", full_parse):
+                full_time, full_peak = measure(module, page, args.rounds)
+
+            print(
+                f"{house:<18} {label:>8} {full_time * 1e3:>9.2f} "
+                f"{scoped_time * 1e3:>10.2f} {full_time / scoped_time:>7.1f}x "
+                f"{full_peak / 1024:>9.0f} {scoped_peak / 1024:>11.0f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,8 +6,6 @@ import asyncio
 import json
 import pathlib
 
-from datetime import datetime, timedelta, timezone
-
 import perexchange as px
 
 
@@ -103,32 +101,16 @@ async def working_with_tiers():
 
 
 async def simple_caching():
-    """Cache results to avoid redundant API calls. Users must implement their own caching logic."""
-    cache = {"rates": None, "timestamp": None}
-    cache_duration = timedelta(minutes=5)
-
-    async def get_rates_cached():
-        now = datetime.now(timezone.utc)
-
-        if cache["rates"] and cache["timestamp"]:
-            age = now - cache["timestamp"]
-            if age < cache_duration:
-                print(f"Cache hit (age: {age.seconds}s)")
-                return cache["rates"]
-
-        print("Cache miss, fetching")
-        rates = await px.fetch_rates()
-        cache["rates"] = rates
-        cache["timestamp"] = now
-        return rates
-
-    rates1 = await get_rates_cached()
+    """Serve repeated calls from memory while the rates are still fresh."""
+    cache = px.RateCache(ttl=300.0)
+
+    rates1 = await px.fetch_rates(cache=cache)
     print(f"First call: {len(rates1)} rates")
 
     await asyncio.sleep(2)
 
-    rates2 = await get_rates_cached()
-    print(f"Second call: {len(rates2)} rates")
+    rates2 = await px.fetch_rates(cache=cache)
+    print(f"Second call: {len(rates2)} rates (from cache)")
 
 
 async def market_overview():
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import sys
 
 import httpx
@@ -9,6 +10,7 @@ from perexchange import (
     fetch_rates,
     find_best_buy,
     find_best_sell,
+    stream_rates,
 )
 from perexchange.analysis import get_top_n
 
@@ -17,6 +19,19 @@ def print_separator():
     print("=" * 60)
 
 
+async def cmd_fetch_stream():
+    print("Streaming current exchange rates...", file=sys.stderr)
+    async for rate in stream_rates():
+        line = {
+            "name": rate.name,
+            "buy_price": rate.buy_price,
+            "sell_price": rate.sell_price,
+            "spread": round(rate.spread, 4),
+            "timestamp": rate.timestamp.isoformat(),
+        }
+        print(json.dumps(line), flush=True)
+
+
 async def cmd_fetch():
     print("Fetching current exchange rates...")
     rates = await fetch_rates()
@@ -113,6 +128,7 @@ def print_help():
     print("\nUsage: perexchange [command]")
     print("\nCommands:")
     print("  fetch       - Fetch and display all current rates")
+    print("                --stream prints one JSON line per rate as houses respond")
     print("  best-buy    - Show best place to buy dollars")
     print("  best-sell   - Show best place to sell dollars")
     print("  top-buy     - Show top 5 places to buy")
@@ -121,16 +137,20 @@ def print_help():
     print("  help        - Show this help message")
     print("\nExamples:")
     print("  perexchange best-buy")
+    print("  perexchange fetch --stream")
     print("  perexchange top-sell")
 
 
-async def run_command(command: str | None = None):
+async def run_command(command: str | None = None, options: list[str] | None = None):
+    options = options or []
     if command is None or command == "help" or command == "--help" or command == "-h":
         print_help()
         return
 
     try:
-        if command == "fetch":
+        if command == "fetch" and "--stream" in options:
+            await cmd_fetch_stream()
+        elif command == "fetch":
             await cmd_fetch()
         elif command == "best-buy":
             await cmd_best_buy()
@@ -156,7 +176,7 @@ def main():
     command = sys.argv[1] if len(sys.argv) > 1 else None
 
     try:
-        asyncio.run(run_command(command))
+        asyncio.run(run_command(command, sys.argv[2:]))
     except KeyboardInterrupt:
         print("\nInterrupted by user")
         sys.exit(0)
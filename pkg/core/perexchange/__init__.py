@@ -8,9 +8,55 @@ Example:
     >>> print(f"{best.name}: S/{best.buy_price}")
 """
 
-from perexchange.core import fetch_rates
-from perexchange.models import ExchangeRate
+from perexchange.breaker import BreakerState, CircuitBreaker, CircuitOpenError
+from perexchange.cache import RateCache
+from perexchange.cassette import Cassette, CassetteMissError
+from perexchange.core import fetch_rates, stream_rates, watch_rates
+from perexchange.delta import DeltaTracker, RateChange, RateDelta
+from perexchange.events import FetchEvent
+from perexchange.executor import ParseBudgetError, ParseExecutor, ParseStats
+from perexchange.hedge import Hedger, HedgeStats
+from perexchange.history import HistoryStore, SQLiteHistory
+from perexchange.http_cache import HTTPCache, HTTPCacheStats
+from perexchange.metrics import Metrics
+from perexchange.models import ExchangeRate, FetchResult, HouseReport
+from perexchange.retry import RetryBudget, RetryPolicy
+from perexchange.session import HouseBudgetError, RateSession
+from perexchange.watch import HouseSchedule, PollScheduler
 
 
 __version__ = "1.0.0"
-__all__ = ["ExchangeRate", "fetch_rates"]
+__all__ = [
+    "BreakerState",
+    "Cassette",
+    "CassetteMissError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeltaTracker",
+    "ExchangeRate",
+    "FetchEvent",
+    "FetchResult",
+    "HTTPCache",
+    "HTTPCacheStats",
+    "HedgeStats",
+    "Hedger",
+    "HistoryStore",
+    "HouseBudgetError",
+    "HouseReport",
+    "HouseSchedule",
+    "Metrics",
+    "ParseBudgetError",
+    "ParseExecutor",
+    "ParseStats",
+    "PollScheduler",
+    "RateCache",
+    "RateChange",
+    "RateDelta",
+    "RateSession",
+    "RetryBudget",
+    "RetryPolicy",
+    "SQLiteHistory",
+    "fetch_rates",
+    "stream_rates",
+    "watch_rates",
+]
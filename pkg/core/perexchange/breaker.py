@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Literal
+
+import httpx
+
+from perexchange.context import house_cutoff
+from perexchange.models import ExchangeRate
+from perexchange.scrapers.base import ExchangeRateScraper
+
+
+BreakerStatus = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """
+    A house was skipped because its circuit breaker is open.
+
+    Subclasses httpx.HTTPError so code that already handles a house being
+    unreachable handles a skipped house the same way.
+    """
+
+
+@dataclass
+class BreakerState:
+    """Circuit breaker state for one house."""
+
+    status: BreakerStatus = "closed"
+    failures: int = 0  # Consecutive network failures
+    opened_at: float | None = None  # Clock time the breaker last opened
+    trips: int = 0  # Times the breaker has opened
+
+
+class CircuitBreaker:
+    """
+    Skip houses that keep failing, and probe them again after a cool-down.
+
+    Each house has its own breaker. After `failure_threshold` consecutive
+    network failures (httpx.HTTPError once retries are exhausted) it opens,
+    and calls for that house fail at once with CircuitOpenError instead of
+    spending their retries and backoff. After `cooldown` seconds the next
+    call goes through as a single probe request, without retries: if it
+    succeeds the breaker closes, if it fails the breaker opens again. Calls
+    made while the probe is running are skipped.
+
+    Through RateSession, concurrent callers that share one coalesced
+    request go through the breaker once, so one upstream failure counts
+    once however many callers were waiting on it.
+
+    A house cancelled because it ran out of time, over its `house_budget`
+    or past the call's `deadline`, counts as a failure: a house that hangs
+    is the outage the breaker is for. Parse errors don't count: the house
+    answered, and failing to parse costs no retries.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=3, cooldown=60.0)
+        >>> async with RateSession(circuit_breaker=breaker) as session:
+        ...     rates = await session.fetch_rates()
+        >>> breaker.state("westernunion").status
+        'closed'
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a house's breaker
+            cooldown: Seconds an open breaker waits before probing the house
+            clock: Monotonic time source, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._states: dict[str, BreakerState] = {}
+
+    def state(self, house: str) -> BreakerState:
+        """Return a snapshot of the breaker for `house`."""
+        return replace(self._state(house.lower()))
+
+    def states(self) -> dict[str, BreakerState]:
+        """Snapshots of every breaker that has seen a call."""
+        return {house: replace(state) for house, state in self._states.items()}
+
+    def reset(self, house: str | None = None) -> None:
+        """Close one house's breaker, or every breaker if None."""
+        if house is None:
+            self._states.clear()
+        else:
+            self._states.pop(house.lower(), None)
+
+    def wrap(self, house: str, scraper: ExchangeRateScraper) -> ExchangeRateScraper:
+        """Return a scraper for `house` guarded by its breaker."""
+
+        async def guarded_scraper(
+            timeout: float = 10.0,
+            max_retries: int = 3,
+            retry_delay: float = 0.5,
+            client: httpx.AsyncClient | None = None,
+        ) -> list[ExchangeRate]:
+            state = self._state(house)
+            probing = self._admit(house, state)
+            try:
+                rates = await scraper(
+                    timeout=timeout,
+                    max_retries=1 if probing else max_retries,
+                    retry_delay=retry_delay,
+                    client=client,
+                )
+            except httpx.HTTPError:
+                self._record_failure(state)
+                raise
+            except BaseException as e:
+                if isinstance(e, asyncio.CancelledError) and _out_of_time():
+                    # Cut off by the house budget or deadline: upstream hung.
+                    self._record_failure(state)
+                elif probing:
+                    # No verdict (parse error or cancellation); allow a new probe.
+                    state.status = "open"
+                raise
+            state.status = "closed"
+            state.failures = 0
+            return rates
+
+        return guarded_scraper
+
+    def _state(self, house: str) -> BreakerState:
+        return self._states.setdefault(house, BreakerState())
+
+    def _admit(self, house: str, state: BreakerState) -> bool:
+        """Let a call through, or raise CircuitOpenError. True for a probe."""
+        if state.status == "closed":
+            return False
+        if state.status == "open" and state.opened_at is not None:
+            remaining = state.opened_at + self.cooldown - self._clock()
+            if remaining <= 0:
+                state.status = "half_open"
+                return True
+            msg = f"Circuit for {house} is open; next probe in {remaining:.1f}s"
+        else:
+            msg = f"Circuit for {house} is half-open; a probe is in progress"
+        raise CircuitOpenError(msg)
+
+    def _record_failure(self, state: BreakerState) -> None:
+        state.failures += 1
+        if state.status == "half_open" or state.failures >= self.failure_threshold:
+            if state.status != "open":
+                state.trips += 1
+            state.status = "open"
+            state.opened_at = self._clock()
+
+
+def _out_of_time() -> bool:
+    """Whether the current house is past the cutoff its caller gave it."""
+    cutoff = house_cutoff.get()
+    return cutoff is not None and asyncio.get_running_loop().time() >= cutoff
@@ -0,0 +1,244 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from types import TracebackType
+
+import httpx
+
+from perexchange.context import house_cutoff
+from perexchange.events import house_trace
+from perexchange.models import ExchangeRate
+from perexchange.scrapers.base import (
+    ExchangeRateScraper,
+    create_http_client,
+    pool_limits,
+)
+
+
+@dataclass
+class _Entry:
+    rates: list[ExchangeRate]
+    stored_at: float
+
+
+class RateCache:
+    """
+    In-memory cache of parsed rates, keyed by house.
+
+    An entry younger than its TTL is served as is. Once the TTL passes, the
+    entry stays usable for another `stale_ttl` seconds: callers get the stale
+    rates immediately while a single background request refreshes them.
+    Entries older than that are dropped and fetched again in the foreground.
+
+    Background refreshes run on a client held by the cache, so they outlive
+    the call that started them; close the cache with `aclose()` (or use it
+    as an async context manager) to cancel them and close that client.
+
+    Example:
+        >>> async with RateCache(ttl=30.0, ttls={"westernunion": 120.0}) as cache:
+        ...     rates = await fetch_rates(cache=cache)  # hits upstream
+        ...     rates = await fetch_rates(cache=cache)  # served from memory
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        *,
+        ttls: Mapping[str, float] | None = None,
+        stale_ttl: float = 300.0,
+        max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttl: Seconds a house's rates are considered fresh
+            ttls: Per-house overrides for ttl
+            stale_ttl: Seconds past the TTL during which stale rates are still
+                       served while a background refresh runs
+            max_entries: Maximum number of houses kept; least recently used
+                         entries are evicted first
+            clock: Monotonic time source, in seconds
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Background refreshes by house, with the client each one runs on.
+        self._refreshing: dict[
+            str, tuple[asyncio.Task[None], httpx.AsyncClient | None]
+        ] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    async def __aenter__(self) -> "RateCache":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, house: str) -> list[ExchangeRate] | None:
+        """Return fresh rates for a house, or None if missing or stale."""
+        entry = self._entries.get(house)
+        if entry is None or self._age(entry) >= self._ttl_for(house):
+            return None
+        self._entries.move_to_end(house)
+        return list(entry.rates)
+
+    def set(self, house: str, rates: list[ExchangeRate]) -> None:
+        """Store rates for a house, evicting the least recently used entry if full."""
+        self._entries[house] = _Entry(list(rates), self._clock())
+        self._entries.move_to_end(house)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, house: str | None = None) -> None:
+        """Drop one house, or every house if None."""
+        if house is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(house, None)
+
+    async def wait_refreshes(self, client: httpx.AsyncClient | None = None) -> None:
+        """Wait for the background refreshes in progress, or those on `client`."""
+        while tasks := self._refreshes_on(client):
+            await asyncio.wait(tasks)
+
+    async def aclose(self) -> None:
+        """Cancel the refreshes on the cache's own client and close it."""
+        if self._client is None:
+            return
+        tasks = self._refreshes_on(self._client)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        if self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = self._client_loop = None
+
+    def wrap(
+        self,
+        house: str,
+        scraper: ExchangeRateScraper,
+        *,
+        shared: bool = True,
+    ) -> ExchangeRateScraper:
+        """
+        Return a scraper for `house` that reads through this cache.
+
+        With `shared`, the caller's client is a plain one like any other, and
+        stale entries are refreshed on the cache's own client. Otherwise they
+        are refreshed on the caller's client, so its transport applies, and
+        its owner must `wait_refreshes(client)` before closing it.
+        """
+
+        async def cached_scraper(
+            timeout: float = 10.0,
+            max_retries: int = 3,
+            retry_delay: float = 0.5,
+            client: httpx.AsyncClient | None = None,
+        ) -> list[ExchangeRate]:
+            entry = self._entries.get(house)
+            if entry is not None:
+                age = self._age(entry)
+                ttl = self._ttl_for(house)
+                if age < ttl + self.stale_ttl:
+                    self._entries.move_to_end(house)
+                    trace = house_trace.get()
+                    if trace is not None:
+                        trace.source = "cache"
+                    if age >= ttl:
+                        self._revalidate(
+                            house,
+                            scraper,
+                            timeout,
+                            max_retries,
+                            retry_delay,
+                            self._own_client(timeout) if shared else client,
+                        )
+                    return list(entry.rates)
+                del self._entries[house]
+
+            rates = await scraper(
+                timeout=timeout,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                client=client,
+            )
+            self.set(house, rates)
+            return rates
+
+        return cached_scraper
+
+    def _revalidate(
+        self,
+        house: str,
+        scraper: ExchangeRateScraper,
+        timeout: float,
+        max_retries: int,
+        retry_delay: float,
+        client: httpx.AsyncClient | None,
+    ) -> None:
+        if house in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            # Outlives the call that started it: its requests don't count
+            # towards that call's report, nor against its time limits.
+            house_trace.set(None)
+            house_cutoff.set(None)
+            try:
+                rates = await scraper(
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    retry_delay=retry_delay,
+                    client=client,
+                )
+            except (httpx.HTTPError, ValueError):
+                return
+            self.set(house, rates)
+
+        task = asyncio.create_task(refresh())
+        self._refreshing[house] = (task, client)
+        task.add_done_callback(lambda _: self._refreshing.pop(house, None))
+
+    def _refreshes_on(
+        self, client: httpx.AsyncClient | None
+    ) -> list[asyncio.Task[None]]:
+        return [
+            task
+            for task, on in self._refreshing.values()
+            if client is None or on is client
+        ]
+
+    def _own_client(self, timeout: float) -> httpx.AsyncClient:
+        """The cache's client for the running loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_loop is not loop
+        ):
+            # A client from an earlier loop can't be used (or closed) here.
+            self._client = create_http_client(timeout, pool_limits(self.max_entries))
+            self._client_loop = loop
+        return self._client
+
+    def _age(self, entry: _Entry) -> float:
+        return self._clock() - entry.stored_at
+
+    def _ttl_for(self, house: str) -> float:
+        return self.ttls.get(house, self.ttl)
@@ -0,0 +1,224 @@
+import asyncio
+import base64
+import gzip
+import json
+import os
+import time
+
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+
+CassetteMode = Literal["record", "replay"]
+
+_FORMAT_VERSION = 1
+
+
+class CassetteMissError(httpx.TransportError):
+    """A replaying cassette has no recorded response for a request."""
+
+
+@dataclass(frozen=True)
+class Interaction:
+    """One recorded request and the response upstream sent back."""
+
+    method: str
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes  # As received, before content decoding
+    ttfb: float  # Seconds from sending the request to the response headers
+    download: float  # Seconds from the headers to the end of the body
+
+
+class Cassette:
+    """
+    Record real HTTP exchanges to a file, and serve them back offline.
+
+    In "record" mode requests go to the network as usual, and every response
+    (status, headers, raw body, time to headers and download time) is kept
+    and written to `path` as gzip-compressed JSON when the session's client
+    closes. In "replay" mode nothing touches the network: each request is
+    answered with the next recording for its method and URL, cycling when
+    they run out. With `realtime=True` replies wait as long as the recorded
+    ones took, so a slow production run can be reproduced and profiled.
+
+    Example:
+        >>> async with RateSession(cassette=Cassette("run.cassette", "record")) as s:
+        ...     await s.fetch_rates()
+        >>> replay = Cassette("run.cassette", realtime=True)
+        >>> async with RateSession(cassette=replay) as session:
+        ...     rates = await session.fetch_rates()
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        mode: CassetteMode = "replay",
+        *,
+        realtime: bool = False,
+    ) -> None:
+        """
+        Args:
+            path: Archive to write (record) or read (replay)
+            mode: "record" to capture network responses, "replay" to serve them
+            realtime: When replaying, wait the recorded time before each
+                      response's headers and body
+
+        Raises:
+            FileNotFoundError: If replaying and `path` does not exist
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.realtime = realtime
+        self.interactions: list[Interaction] = []
+        self._recorded: dict[tuple[str, str], list[Interaction]] = {}
+        self._next: dict[tuple[str, str], int] = {}
+        if mode == "replay":
+            self.interactions = _load(self.path)
+            for interaction in self.interactions:
+                key = (interaction.method, interaction.url)
+                self._recorded.setdefault(key, []).append(interaction)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def transport(self, inner: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        """Wrap `inner`; replaying cassettes never send requests through it."""
+        if self.mode == "record":
+            return _RecordingTransport(inner, self)
+        return _ReplayingTransport(inner, self)
+
+    def save(self) -> None:
+        """Write the recorded interactions to `path`."""
+        document = {
+            "version": _FORMAT_VERSION,
+            "interactions": [_encode(i) for i in self.interactions],
+        }
+        data = json.dumps(document, separators=(",", ":")).encode()
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_bytes(gzip.compress(data))
+        tmp.replace(self.path)
+
+    def _match(self, request: httpx.Request) -> Interaction:
+        key = (request.method, str(request.url))
+        recorded = self._recorded.get(key)
+        if not recorded:
+            msg = f"No recorded response for {request.method} {request.url}"
+            raise CassetteMissError(msg, request=request)
+        index = self._next.get(key, 0)
+        self._next[key] = index + 1
+        return recorded[index % len(recorded)]
+
+
+class _RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        headers_at = time.perf_counter()
+        try:
+            if not isinstance(response.stream, httpx.AsyncByteStream):
+                msg = "Transport returned a synchronous stream"
+                raise TypeError(msg)
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+
+        self._cassette.interactions.append(
+            Interaction(
+                method=request.method,
+                url=str(request.url),
+                status=response.status_code,
+                headers=response.headers.multi_items(),
+                body=body,
+                ttfb=headers_at - started,
+                download=time.perf_counter() - headers_at,
+            )
+        )
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self._cassette.save()
+
+
+class _ReplayingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._cassette._match(request)
+        if self._cassette.realtime:
+            await asyncio.sleep(interaction.ttfb)
+            stream: httpx.AsyncByteStream = _DelayedStream(
+                interaction.body, interaction.download
+            )
+        else:
+            stream = httpx.ByteStream(interaction.body)
+        return httpx.Response(
+            status_code=interaction.status,
+            headers=interaction.headers,
+            stream=stream,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _DelayedStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes, delay: float) -> None:
+        self._body = body
+        self._delay = delay
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        await asyncio.sleep(self._delay)
+        yield self._body
+
+
+def _encode(interaction: Interaction) -> dict[str, Any]:
+    return {
+        "method": interaction.method,
+        "url": interaction.url,
+        "status": interaction.status,
+        "headers": interaction.headers,
+        "body": base64.b64encode(interaction.body).decode("ascii"),
+        "ttfb": round(interaction.ttfb, 6),
+        "download": round(interaction.download, 6),
+    }
+
+
+def _load(path: Path) -> list[Interaction]:
+    document = json.loads(gzip.decompress(path.read_bytes()))
+    if document.get("version") != _FORMAT_VERSION:
+        msg = f"Unsupported cassette version in {path}: {document.get('version')!r}"
+        raise ValueError(msg)
+    return [
+        Interaction(
+            method=item["method"],
+            url=item["url"],
+            status=item["status"],
+            headers=[(name, value) for name, value in item["headers"]],
+            body=base64.b64decode(item["body"]),
+            ttfb=item["ttfb"],
+            download=item["download"],
+        )
+        for item in document["interactions"]
+    ]
@@ -0,0 +1,151 @@
+import asyncio
+import weakref
+
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+import httpx
+
+from perexchange.events import HouseTrace, house_trace
+from perexchange.models import ExchangeRate
+from perexchange.scrapers.base import ExchangeRateScraper
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Share one in-flight call per key between concurrent callers.
+
+    The first caller for a key starts the call; everyone who asks for the same
+    key before it finishes awaits that same call. Once it completes, the next
+    caller starts a new one. If every caller waiting on a call is cancelled,
+    the call is cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+        self._waiters: dict[asyncio.Future[T], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shielded so a cancelled caller does not cancel the call for the
+            # others; the last one to leave cancels it below.
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+                    # Let the call unwind while its caller's client is open.
+                    await asyncio.wait([task])
+
+    def _forget(self, key: Hashable, task: asyncio.Future[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the error as retrieved in case every caller went away.
+            task.exception()
+
+
+# A scrape's rates, with the house trace of the caller that made the request.
+_Scrape = tuple[list[ExchangeRate], HouseTrace | None]
+
+_flights: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, SingleFlight[_Scrape]
+] = weakref.WeakKeyDictionary()
+
+
+def in_flight() -> SingleFlight[_Scrape]:
+    """Return the scrape registry shared by every caller on the running loop."""
+    loop = asyncio.get_running_loop()
+    flight = _flights.get(loop)
+    if flight is None:
+        flight = _flights[loop] = SingleFlight()
+    return flight
+
+
+class _StarterClosedError(Exception):
+    """The shared call failed because its caller's client was closed under it."""
+
+    def __init__(self, error: Exception) -> None:
+        super().__init__(error)
+        self.error = error
+
+
+def coalesce(
+    house: str,
+    scraper: ExchangeRateScraper,
+    *,
+    shared: bool = True,
+) -> ExchangeRateScraper:
+    """
+    Return a scraper for `house` that joins any scrape already in progress.
+
+    Concurrent fetch_rates calls, in one session or many, trigger a single
+    upstream request per house. The shared request runs with the options and
+    client of whichever caller started it; every caller gets its own copy of
+    the resulting list, and callers that joined get the request's attempts
+    and bytes added to their own house trace. If that caller's client is
+    closed before the request finishes (its session hit a deadline or was
+    cancelled), the callers still waiting scrape again with their own
+    clients.
+
+    With `shared=False` a scrape is only joined by callers passing the same
+    client, so a session with its own client, cassette or HTTP cache always
+    gets its answers from its own transport.
+    """
+
+    async def coalesced_scraper(
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        client: httpx.AsyncClient | None = None,
+    ) -> list[ExchangeRate]:
+        async def call() -> _Scrape:
+            try:
+                rates = await scraper(
+                    timeout=timeout,
+                    max_retries=max_retries,
+                    retry_delay=retry_delay,
+                    client=client,
+                )
+            except Exception as e:
+                if client is not None and client.is_closed:
+                    raise _StarterClosedError(e) from e
+                raise
+            return rates, house_trace.get()
+
+        key = house if shared else (house, client)
+        while True:
+            try:
+                rates, trace = await in_flight().run(key, call)
+            except _StarterClosedError as e:
+                if client is not None and client.is_closed:
+                    raise e.error from None
+                continue
+            _join_trace(trace)
+            return list(rates)
+
+    return coalesced_scraper
+
+
+def _join_trace(shared: HouseTrace | None) -> None:
+    """Credit a request another caller made to the current house trace."""
+    trace = house_trace.get()
+    if trace is None or shared is None or trace is shared:
+        return
+    trace.attempts += shared.attempts
+    trace.bytes_received += shared.bytes_received
+    trace.source = "shared"
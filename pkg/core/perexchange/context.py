@@ -0,0 +1,12 @@
+from contextvars import ContextVar
+
+
+# Name of the house being fetched by the current task. Set by RateSession so
+# layers below the scrapers (transports, parsers, hooks) can attribute work.
+current_house: ContextVar[str | None] = ContextVar("current_house", default=None)
+
+# Event-loop time by which the current house must finish: the earlier of the
+# session's house_budget and the call's deadline. Set by RateSession so the
+# circuit breaker can tell a house that ran out of time from one cancelled
+# for another reason.
+house_cutoff: ContextVar[float | None] = ContextVar("house_cutoff", default=None)
@@ -1,12 +1,16 @@
-import asyncio
+from collections.abc import AsyncIterator, Mapping, Sequence
+from contextlib import aclosing
 
-from collections.abc import Sequence
-
-import httpx
-
-from perexchange.models import ExchangeRate
-from perexchange.scrapers import get_scrapers
-from perexchange.scrapers.base import ExchangeRateScraper
+from perexchange.breaker import CircuitBreaker
+from perexchange.cache import RateCache
+from perexchange.cassette import Cassette
+from perexchange.executor import ParseExecutor
+from perexchange.hedge import Hedger
+from perexchange.http_cache import HTTPCache
+from perexchange.models import ExchangeRate, FetchResult
+from perexchange.retry import RetryPolicy
+from perexchange.session import RateSession
+from perexchange.watch import PollScheduler
 
 
 async def fetch_rates(
@@ -14,7 +18,17 @@ async def fetch_rates(
     *,
     timeout: float = 10.0,
     max_retries: int = 3,
-) -> list[ExchangeRate]:
+    cache: RateCache | None = None,
+    http_cache: HTTPCache | None = None,
+    parse_executor: ParseExecutor | None = None,
+    hedger: Hedger | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    retry_policy: RetryPolicy | Mapping[str, RetryPolicy] | None = None,
+    house_budget: float | None = None,
+    cassette: Cassette | None = None,
+    deadline: float | None = None,
+    report: bool = False,
+) -> FetchResult:
     """
     Fetch current exchange rates from Peruvian exchange houses.
 
@@ -24,47 +38,165 @@ async def fetch_rates(
                            instakash, srcambio, tkambio, tucambista, westernunion, yanki
         timeout: Request timeout per house (seconds)
         max_retries: Retry attempts for failed requests
+        cache: Serve houses from this cache while their rates are fresh. Stale
+               rates are returned at once and refreshed in the background,
+               on the cache's own client; see RateCache.
+        http_cache: Send conditional requests and skip downloading and parsing
+                    bodies that upstream reports as unchanged.
+        parse_executor: Run parsing inline (default), in a thread pool or in a
+                        process pool so large pages don't block the event loop.
+        hedger: Send a backup request when a house is slower than its usual
+                p90 latency. Reuse one Hedger across calls so it can learn
+                each house's latency.
+        circuit_breaker: Skip houses whose breaker is open instead of
+                         spending retries on them. Reuse one breaker across
+                         calls so it can track consecutive failures.
+        retry_policy: Which errors are retried and how long to wait, for all
+                      houses or per house name. By default only timeouts,
+                      connection errors, 429 and 5xx are retried.
+        house_budget: Upper bound for one house (seconds), covering all of its
+                      attempts, requests and backoff. Houses that run over
+                      are cancelled and listed in `over_budget`.
+        cassette: Record responses to a file, or replay a recording instead
+                  of using the network, for reproducible offline runs.
+        deadline: Upper bound for the whole call (seconds). Houses that have
+                  not finished by then are cancelled; the rates that did
+                  arrive are returned and the late houses are listed in
+                  `missed`.
+        report: Also return a HouseReport per house in the result's
+                `report`, with its status, attempts, elapsed time, bytes
+                received and error.
 
     Returns:
-        List of ExchangeRate objects. Empty list if all houses fail.
+        FetchResult, a list of ExchangeRate objects. Empty if all houses fail.
 
     Example:
         >>> rates = await fetch_rates()
         >>> rates = await fetch_rates(houses=["tkambio", "cambioseguro"])
         >>> best = min(rates, key=lambda r: r.buy_price)
         >>> print(f"Best: {best.name} at S/{best.buy_price}")
+        >>> rates = await fetch_rates(deadline=2.0)
+        >>> rates.missed
+        ['westernunion']
+        >>> rates = await fetch_rates(report=True)
+        >>> rates.report["westernunion"].status
+        'error'
 
     Note:
         Failed houses are silently skipped. Network errors are retried,
-        parsing errors fail immediately.
+        parsing errors fail immediately. This is a one-shot wrapper around
+        RateSession; use a session directly when polling repeatedly so
+        connections stay warm between calls.
+    """
+    async with RateSession(
+        timeout=timeout,
+        max_retries=max_retries,
+        cache=cache,
+        http_cache=http_cache,
+        parse_executor=parse_executor,
+        hedger=hedger,
+        circuit_breaker=circuit_breaker,
+        retry_policy=retry_policy,
+        house_budget=house_budget,
+        cassette=cassette,
+    ) as session:
+        return await session.fetch_rates(houses, deadline=deadline, report=report)
+
+
+async def stream_rates(
+    houses: Sequence[str] | None = None,
+    *,
+    timeout: float = 10.0,
+    max_retries: int = 3,
+    cache: RateCache | None = None,
+    http_cache: HTTPCache | None = None,
+    parse_executor: ParseExecutor | None = None,
+    hedger: Hedger | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    retry_policy: RetryPolicy | Mapping[str, RetryPolicy] | None = None,
+    house_budget: float | None = None,
+    cassette: Cassette | None = None,
+) -> AsyncIterator[ExchangeRate]:
+    """
+    Yield exchange rates as each house responds, instead of all at once.
+
+    Takes the same arguments as fetch_rates. Houses are scraped
+    concurrently and their rates are yielded in completion order, so fast
+    houses are available while slow ones are still retrying. A name that
+    was already yielded is yielded again only with a more recent rate.
+
+    Example:
+        >>> async for rate in stream_rates():
+        ...     print(f"{rate.name}: S/{rate.buy_price}")
+
+    Note:
+        Leaving the loop early cancels the houses that are still running.
+    """
+    async with (
+        RateSession(
+            timeout=timeout,
+            max_retries=max_retries,
+            cache=cache,
+            http_cache=http_cache,
+            parse_executor=parse_executor,
+            hedger=hedger,
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+            house_budget=house_budget,
+            cassette=cassette,
+        ) as session,
+        aclosing(session.stream_rates(houses)) as rates,
+    ):
+        async for rate in rates:
+            yield rate
+
+
+async def watch_rates(
+    houses: Sequence[str] | None = None,
+    *,
+    scheduler: PollScheduler | None = None,
+    timeout: float = 10.0,
+    max_retries: int = 3,
+    cache: RateCache | None = None,
+    http_cache: HTTPCache | None = None,
+    parse_executor: ParseExecutor | None = None,
+    hedger: Hedger | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    retry_policy: RetryPolicy | Mapping[str, RetryPolicy] | None = None,
+    house_budget: float | None = None,
+    cassette: Cassette | None = None,
+) -> AsyncIterator[ExchangeRate]:
+    """
+    Poll exchange houses until the loop stops, yielding rates as they change.
+
+    Takes the same arguments as stream_rates, plus `scheduler`. Each house
+    gets its own polling interval, which grows while its prices stay the
+    same and shrinks when they move, so houses that rarely change are rarely
+    requested. Every rate is yielded once at the start and again each time
+    its price changes.
+
+    Example:
+        >>> async for rate in watch_rates(["yanki", "tkambio"]):
+        ...     print(f"{rate.name}: S/{rate.buy_price}")
+
+    Note:
+        One session (and its connections) is kept for the whole watch.
+        Leaving the loop cancels the polls in progress.
     """
-    scrapers = get_scrapers(houses)
-
-    tasks = [_safe_fetch(scraper, timeout, max_retries) for scraper in scrapers]
-    results = await asyncio.gather(*tasks)
-
-    all_rates = [rate for result in results for rate in result]
-
-    # Deduplicate by name, keeping the most recent rate for each house.
-    # This handles cases where cuantoestaeldolar (an aggregator) returns rates for houses
-    # we also scrape directly (e.g., chapacambio). We prioritize the most recent timestamp,
-    # which is typically from direct scrapers since they have fresher data.
-    # This is a temporary measure until cuantoestaeldolar is replaced with individual scrapers.
-    seen: dict[str, ExchangeRate] = {}
-    for rate in all_rates:
-        if rate.name not in seen or rate.timestamp > seen[rate.name].timestamp:
-            seen[rate.name] = rate
-
-    return list(seen.values())
-
-
-async def _safe_fetch(
-    scraper: ExchangeRateScraper,
-    timeout: float,
-    max_retries: int,
-) -> list[ExchangeRate]:
-    """Fetch from one scraper, return empty list on failure."""
-    try:
-        return await scraper(timeout=timeout, max_retries=max_retries)
-    except (httpx.HTTPError, ValueError):
-        return []
+    async with (
+        RateSession(
+            timeout=timeout,
+            max_retries=max_retries,
+            cache=cache,
+            http_cache=http_cache,
+            parse_executor=parse_executor,
+            hedger=hedger,
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+            house_budget=house_budget,
+            cassette=cassette,
+        ) as session,
+        aclosing(session.watch_rates(houses, scheduler=scheduler)) as rates,
+    ):
+        async for rate in rates:
+            yield rate
@@ -0,0 +1,110 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from perexchange.models import ExchangeRate
+
+
+@dataclass(frozen=True)
+class RateChange:
+    """A rate whose price moved since it was last emitted."""
+
+    previous: ExchangeRate
+    current: ExchangeRate
+
+    @property
+    def buy_change(self) -> float:
+        return self.current.buy_price - self.previous.buy_price
+
+    @property
+    def sell_change(self) -> float:
+        return self.current.sell_price - self.previous.sell_price
+
+
+@dataclass(frozen=True)
+class RateDelta:
+    """What changed between two snapshots. False when nothing did."""
+
+    added: list[ExchangeRate] = field(default_factory=list)
+    changed: list[RateChange] = field(default_factory=list)
+    removed: list[ExchangeRate] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class DeltaTracker:
+    """
+    Turn repeated full snapshots of rates into added/changed/removed deltas.
+
+    Keeps the last emitted rate per `ExchangeRate.name`. A rate counts as
+    changed when its buy or sell price moved by more than `tolerance`
+    (soles) from the last emitted one, so slow drift below the tolerance
+    still adds up and is reported once it crosses it. Timestamps alone never
+    count as a change.
+
+    fetch_rates skips houses that fail, so a name missing from one snapshot
+    may just be a house that was briefly down. Set `remove_after` to report
+    a name as removed only after that many snapshots in a row without it.
+
+    Example:
+        >>> tracker = DeltaTracker(tolerance=0.001, remove_after=3)
+        >>> async with RateSession() as session:
+        ...     while True:
+        ...         delta = tracker.update(await session.fetch_rates())
+        ...         if delta:
+        ...             publish(delta)
+        ...         await asyncio.sleep(30)
+    """
+
+    def __init__(self, tolerance: float = 0.0, remove_after: int = 1) -> None:
+        """
+        Args:
+            tolerance: Price moves up to this size (soles) are not changes
+            remove_after: Consecutive snapshots a name must be missing from
+                          before it is reported as removed
+        """
+        self.tolerance = tolerance
+        self.remove_after = max(remove_after, 1)
+        self._rates: dict[str, ExchangeRate] = {}
+        self._missing: dict[str, int] = {}
+
+    @property
+    def snapshot(self) -> dict[str, ExchangeRate]:
+        """Last emitted rate per name."""
+        return dict(self._rates)
+
+    def update(self, rates: Iterable[ExchangeRate]) -> RateDelta:
+        """Compare `rates` with the snapshot, record them, and return the delta."""
+        delta = RateDelta()
+        current = {rate.name: rate for rate in rates}
+
+        for name, rate in current.items():
+            self._missing.pop(name, None)
+            previous = self._rates.get(name)
+            if previous is None:
+                delta.added.append(rate)
+                self._rates[name] = rate
+            elif self._moved(previous, rate):
+                delta.changed.append(RateChange(previous, rate))
+                self._rates[name] = rate
+
+        for name in list(self._rates):
+            if name in current:
+                continue
+            self._missing[name] = self._missing.get(name, 0) + 1
+            if self._missing[name] >= self.remove_after:
+                delta.removed.append(self._rates.pop(name))
+                del self._missing[name]
+
+        return delta
+
+    def reset(self) -> None:
+        """Forget the snapshot; the next update reports every rate as added."""
+        self._rates.clear()
+        self._missing.clear()
+
+    def _moved(self, previous: ExchangeRate, rate: ExchangeRate) -> bool:
+        return (
+            abs(rate.buy_price - previous.buy_price) > self.tolerance
+            or abs(rate.sell_price - previous.sell_price) > self.tolerance
+        )
@@ -0,0 +1,200 @@
+import time
+import warnings
+
+from collections.abc import AsyncIterator, Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, ClassVar, Literal
+
+import httpx
+
+from perexchange.context import current_house
+from perexchange.models import RateSource
+
+
+EventKind = Literal[
+    "connect",  # DNS lookup and TCP connect of a new connection
+    "tls",  # TLS handshake of a new connection
+    "ttfb",  # Request sent until response headers received
+    "download",  # Response headers until the body was read or closed
+    "parse",  # One call to a scraper's parse function
+    "retry",  # A failed attempt that will be retried
+    "outcome",  # A house finished, successfully or not
+]
+
+
+@dataclass(frozen=True)
+class FetchEvent:
+    """
+    One measurement from the fetch path.
+
+    `seconds` is the duration of the step; for "retry" it is the wait before
+    the next attempt. Fields that don't apply to a kind keep their defaults.
+    """
+
+    kind: EventKind
+    house: str
+    seconds: float
+    url: str | None = None
+    bytes_received: int = 0  # Body bytes, for "download" and "outcome"
+    attempt: int = 0  # 1-based attempt number, or attempts made for "outcome"
+    status: str | None = None  # For "outcome": ok, error, over_budget, cancelled
+    error: BaseException | None = None
+
+
+Listener = Callable[[FetchEvent], None]
+
+_listeners: list[Listener] = []
+
+
+def add_listener(listener: Listener) -> None:
+    """Call `listener` with every FetchEvent, from any session or house."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Listener) -> None:
+    """Stop calling `listener`. Does nothing if it was not registered."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@contextmanager
+def listening(listener: Listener) -> Generator[Listener, None, None]:
+    """
+    Register `listener` for the duration of a with block.
+
+    Example:
+        >>> with listening(print):
+        ...     rates = await fetch_rates(["tkambio"])
+        FetchEvent(kind='ttfb', house='tkambio', seconds=0.182, ...)
+    """
+    add_listener(listener)
+    try:
+        yield listener
+    finally:
+        remove_listener(listener)
+
+
+def enabled() -> bool:
+    """Whether anyone is listening; check before doing work to build an event."""
+    return bool(_listeners)
+
+
+def emit(kind: EventKind, seconds: float, **fields: Any) -> None:
+    """Send an event for the current house to every listener."""
+    if not _listeners:
+        return
+    event = FetchEvent(kind, current_house.get() or "", seconds, **fields)
+    for listener in _listeners.copy():  # A listener may remove itself
+        try:
+            listener(event)
+        except Exception as e:  # noqa: BLE001 (a broken listener must not fail the fetch)
+            warnings.warn(
+                f"FetchEvent listener {listener!r} raised {e!r}",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+
+@dataclass
+class HouseTrace:
+    """Counters for one house's fetch, shared by everything it runs."""
+
+    attempts: int = 0
+    bytes_received: int = 0  # Counted only when `meter` is set or someone listens
+    elapsed: float = 0.0  # Seconds, set when the house finishes
+    meter: bool = False
+    source: RateSource = "network"
+
+
+# Trace of the house fetch running in the current task; RateSession sets it.
+house_trace: ContextVar[HouseTrace | None] = ContextVar("house_trace", default=None)
+
+
+def count_attempt() -> int:
+    """Record an attempt in the current house trace; return its number."""
+    trace = house_trace.get()
+    if trace is None:
+        return 0
+    trace.attempts += 1
+    return trace.attempts
+
+
+_STARTED = "perexchange.started"
+
+
+async def on_request(request: httpx.Request) -> None:  # noqa: RUF029 (httpx awaits hooks)
+    """httpx request hook: start timing, and trace connection setup if wanted."""
+    request.extensions[_STARTED] = time.perf_counter()
+    if _listeners and "trace" not in request.extensions:
+        request.extensions["trace"] = _ConnectionTrace(str(request.url))
+
+
+async def on_response(response: httpx.Response) -> None:  # noqa: RUF029 (httpx awaits hooks)
+    """httpx response hook: report time to first byte and meter the body."""
+    started = response.request.extensions.get(_STARTED)
+    if started is None:
+        return
+    headers_at = time.perf_counter()
+    url = str(response.request.url)
+    emit("ttfb", headers_at - started, url=url)
+    trace = house_trace.get()
+    metered = _listeners or (trace is not None and trace.meter)
+    if metered and isinstance(response.stream, httpx.AsyncByteStream):
+        response.stream = _MeteredStream(response.stream, url, headers_at)
+
+
+class _ConnectionTrace:
+    """httpcore trace callback timing TCP connect and TLS handshake."""
+
+    _STEPS: ClassVar[dict[str, EventKind]] = {
+        "connection.connect_tcp": "connect",
+        "connection.start_tls": "tls",
+    }
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, name: str, info: dict[str, Any]) -> None:
+        step, _, phase = name.rpartition(".")
+        kind = self._STEPS.get(step)
+        if kind is None:
+            return
+        if phase == "started":
+            self._started[step] = time.perf_counter()
+        elif phase == "complete" and step in self._started:
+            emit(kind, time.perf_counter() - self._started.pop(step), url=self.url)
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body that counts bytes and reports the download when closed."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, url: str, started: float) -> None:
+        self._inner = inner
+        self._url = url
+        self._started = started
+        self._bytes = 0
+        self._reported = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._inner:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            if not self._reported:
+                self._reported = True
+                trace = house_trace.get()
+                if trace is not None:
+                    trace.bytes_received += self._bytes
+                emit(
+                    "download",
+                    time.perf_counter() - self._started,
+                    url=self._url,
+                    bytes_received=self._bytes,
+                )
@@ -0,0 +1,134 @@
+import asyncio
+import time
+
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar
+
+from perexchange.context import current_house
+
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["inline", "thread", "process"]
+
+
+class ParseBudgetError(ValueError):
+    """A parse used more CPU time than its executor allows."""
+
+
+@dataclass
+class ParseStats:
+    """Parse work done for one house, kept apart from network time."""
+
+    parses: int = 0
+    seconds: float = 0.0  # Wall time, including any wait for a free worker
+    cpu_seconds: float = 0.0  # CPU time spent in the parse function itself
+
+
+class ParseExecutor:
+    """
+    Where scrapers run their HTML and JSON parsing.
+
+    `inline` parses inside the calling coroutine, which is the cheapest option
+    for small JSON payloads but blocks the event loop while a large page is
+    parsed. `thread` and `process` hand parsing to a worker pool so the loop
+    keeps serving other houses; `process` also sidesteps the GIL at the cost of
+    pickling the payload and the parsed rates.
+
+    With a `budget`, a parse that burns more CPU seconds than that fails with
+    ParseBudgetError. Pool executors also stop waiting for the result once
+    `budget` seconds of wall time have passed; an inline parse cannot be
+    interrupted and is only checked after it finishes.
+
+    Example:
+        >>> executor = ParseExecutor("thread", max_workers=2, budget=0.5)
+        >>> async with RateSession(parse_executor=executor) as session:
+        ...     rates = await session.fetch_rates()
+        >>> executor.stats()["cuantoestaeldolar"].cpu_seconds
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind = "inline",
+        *,
+        max_workers: int | None = None,
+        budget: float | None = None,
+    ) -> None:
+        if kind not in {"inline", "thread", "process"}:
+            msg = f"Unknown executor kind: {kind!r}"
+            raise ValueError(msg)
+        self.kind = kind
+        self.max_workers = max_workers
+        self.budget = budget
+        self._pool: Executor | None = None
+        self._stats: dict[str, ParseStats] = {}
+
+    def stats(self) -> dict[str, ParseStats]:
+        """Parse statistics per house."""
+        return dict(self._stats)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` according to this executor's kind."""
+        started = time.perf_counter()
+
+        if self.kind == "inline":
+            result, cpu_seconds = _timed_call(fn, args, self.budget)
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._get_pool(), _timed_call, fn, args, self.budget
+            )
+            try:
+                result, cpu_seconds = await asyncio.wait_for(future, self.budget)
+            except asyncio.TimeoutError:
+                msg = f"Parsing took longer than {self.budget}s"
+                raise ParseBudgetError(msg) from None
+
+        self._record(time.perf_counter() - started, cpu_seconds)
+        return result
+
+    def close(self) -> None:
+        """Shut the worker pool down, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="perexchange-parse"
+                )
+        return self._pool
+
+    def _record(self, seconds: float, cpu_seconds: float) -> None:
+        stats = self._stats.setdefault(current_house.get() or "", ParseStats())
+        stats.parses += 1
+        stats.seconds += seconds
+        stats.cpu_seconds += cpu_seconds
+
+
+def _timed_call(
+    fn: Callable[..., T],
+    args: tuple[Any, ...],
+    budget: float | None,
+) -> tuple[T, float]:
+    """Call `fn` and measure the CPU time of the calling thread."""
+    started = time.thread_time()
+    result = fn(*args)
+    cpu_seconds = time.thread_time() - started
+    if budget is not None and cpu_seconds > budget:
+        msg = f"Parsing used {cpu_seconds:.3f}s of CPU, budget is {budget}s"
+        raise ParseBudgetError(msg)
+    return result, cpu_seconds
+
+
+INLINE = ParseExecutor("inline")
+
+# Executor used by scrapers in the current task; RateSession sets it per house.
+parse_executor: ContextVar[ParseExecutor] = ContextVar("parse_executor", default=INLINE)
@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Collection, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from perexchange.context import current_house
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    """Hedging activity for one house."""
+
+    requests: int = 0  # Primary requests sent
+    hedges: int = 0  # Second requests sent because the first was slow
+    hedge_wins: int = 0  # Hedges that answered before the primary
+    skipped: int = 0  # Hedges not sent because the extra-load cap was reached
+
+
+class Hedger:
+    """
+    Send a second request when a house is slower than usual.
+
+    Latencies of successful requests are tracked per house. Once a house has
+    `min_samples` of them, a request that has not answered after the house's
+    `quantile` latency (p90 by default) gets an identical backup request; the
+    first one to succeed wins and the other is cancelled.
+
+    Hedges are capped at `max_extra` times the number of primary requests
+    (10% by default), counted across every house, so a slow upstream cannot
+    make the fetcher double its load.
+
+    Example:
+        >>> hedger = Hedger(houses={"westernunion", "cuantoestaeldolar"})
+        >>> async with RateSession(hedger=hedger) as session:
+        ...     rates = await session.fetch_rates()
+        >>> hedger.stats()["westernunion"].hedge_wins
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.9,
+        max_extra: float = 0.1,
+        houses: Collection[str] | None = None,
+        min_samples: int = 20,
+        window: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            quantile: Latency quantile after which a hedge is sent
+            max_extra: Hedges allowed per primary request, across all houses
+            houses: Houses to hedge. If None, every house is hedged.
+            min_samples: Latencies needed for a house before it is hedged
+            window: Recent latencies kept per house
+            clock: Monotonic time source, in seconds
+        """
+        if not 0 < quantile < 1:
+            msg = f"quantile must be between 0 and 1, got {quantile}"
+            raise ValueError(msg)
+        self.quantile = quantile
+        self.max_extra = max_extra
+        self.houses = None if houses is None else {h.lower() for h in houses}
+        self.min_samples = min_samples
+        self.window = window
+        self._clock = clock
+        self._latencies: dict[str, deque[float]] = {}
+        self._stats: dict[str, HedgeStats] = {}
+        self._requests = 0
+        self._hedges = 0
+
+    def stats(self) -> dict[str, HedgeStats]:
+        """Hedging statistics per house."""
+        return dict(self._stats)
+
+    def delay(self, house: str) -> float | None:
+        """Seconds to wait before hedging a request to `house`, if it is hedged."""
+        if self.houses is not None and house not in self.houses:
+            return None
+        samples = self._latencies.get(house)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[math.ceil(self.quantile * len(ordered)) - 1]
+
+    def wrap(
+        self,
+        fetch_fn: Callable[[httpx.AsyncClient], Awaitable[T]],
+    ) -> Callable[[httpx.AsyncClient], Awaitable[T]]:
+        """Return `fetch_fn` with hedging for the current house."""
+        house = current_house.get() or ""
+
+        async def hedged(client: httpx.AsyncClient) -> T:
+            stats = self._stats.setdefault(house, HedgeStats())
+            stats.requests += 1
+            self._requests += 1
+
+            primary = asyncio.ensure_future(self._timed(house, fetch_fn, client))
+            attempts = [primary]
+            try:
+                done, _ = await asyncio.wait(attempts, timeout=self.delay(house))
+                if done:
+                    return primary.result()
+
+                if not self._may_hedge():
+                    stats.skipped += 1
+                    return await primary
+
+                stats.hedges += 1
+                self._hedges += 1
+                attempts.append(
+                    asyncio.ensure_future(self._timed(house, fetch_fn, client))
+                )
+                winner = await _first_success(attempts)
+                if winner is not primary:
+                    stats.hedge_wins += 1
+                return winner.result()
+            finally:
+                # Let the losing attempt unwind while the caller's client is open.
+                for attempt in attempts:
+                    attempt.cancel()
+                await asyncio.gather(*attempts, return_exceptions=True)
+
+        return hedged
+
+    def _may_hedge(self) -> bool:
+        return self._hedges < self.max_extra * self._requests
+
+    async def _timed(
+        self,
+        house: str,
+        fetch_fn: Callable[[httpx.AsyncClient], Awaitable[T]],
+        client: httpx.AsyncClient,
+    ) -> T:
+        started = self._clock()
+        result = await fetch_fn(client)
+        samples = self._latencies.setdefault(house, deque(maxlen=self.window))
+        samples.append(self._clock() - started)
+        return result
+
+
+async def _first_success(
+    attempts: Sequence[asyncio.Future[T]],
+) -> asyncio.Future[T]:
+    """Wait for the first attempt to succeed, or for all of them to fail."""
+    pending = set(attempts)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for attempt in done:
+            if attempt.exception() is None:
+                return attempt
+    # Every attempt failed; report the primary's error.
+    return attempts[0]
+
+
+# Hedger used by fetch_with_retry in the current task; RateSession sets it.
+hedger: ContextVar[Hedger | None] = ContextVar("hedger", default=None)
@@ -0,0 +1,14 @@
+"""
+Long-term storage of fetched rates.
+
+Example:
+    >>> from perexchange.history import HistoryStore
+    >>> with HistoryStore("history/") as store:
+    ...     store.append(await fetch_rates())
+"""
+
+from perexchange.history.binary import HistoryStore
+from perexchange.history.sqlite import SQLiteHistory
+
+
+__all__ = ["HistoryStore", "SQLiteHistory"]
@@ -0,0 +1,301 @@
+import json
+import mmap
+import os
+import struct
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+from perexchange.models import ExchangeRate
+
+
+# House ID, epoch milliseconds, buy and sell in millionths of a sol.
+RECORD = struct.Struct("<HqII")
+PRICE_SCALE = 1_000_000
+_MAX_FIXED = 2**32 - 1
+
+_REGISTRY = "houses.json"
+_MAX_HOUSES = 2**16
+
+
+class HistoryStore:
+    """
+    Append-only archive of rates in fixed-width binary records.
+
+    Each rate is stored in 18 bytes: a house ID, the timestamp in epoch
+    milliseconds, and buy and sell prices as fixed-point integers (six
+    decimals). Rates are grouped by name (`tkambio`, `tkambio_500`, ...) into
+    one directory per house ID with one segment file per month, so ten-second
+    polling of every house for a year is a few hundred MB.
+
+    Reads map the segments with mmap and binary-search them by timestamp:
+    a range query touches only the pages it returns and nothing is loaded up
+    front. Segments stay sorted because rates older than the newest one
+    stored under their name are skipped, as are repeats of it: a rate
+    served from a cache, or an upstream stamp that has not moved, keeps its
+    timestamp and prices from one poll to the next.
+
+    A store has a single writer; readers in other processes see every
+    append once `append()` returns.
+
+    Example:
+        >>> with HistoryStore("history/") as store:
+        ...     store.append(await fetch_rates())
+        ...     week = list(store.range("yanki", start=now - timedelta(days=7)))
+        ...     last = store.latest("yanki")
+    """
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        """
+        Args:
+            root: Directory holding the store; created if missing
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        registry = self.root / _REGISTRY
+        self._ids: dict[str, int] = (
+            json.loads(registry.read_text(encoding="utf-8"))
+            if registry.exists()
+            else {}
+        )
+        # Newest record per name: (epoch ms, buy, sell), prices fixed-point.
+        self._last: dict[str, tuple[int, int, int]] = {}
+        self._writers: dict[Path, BinaryIO] = {}
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the segment files open for appending."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def names(self) -> list[str]:
+        """Names of every rate series in the store."""
+        return sorted(self._ids)
+
+    def append(self, rates: Iterable[ExchangeRate]) -> int:
+        """
+        Store `rates`; return how many were written.
+
+        Rates older than the newest one already stored under the same name
+        are skipped, and so are exact repeats of it (same timestamp and
+        prices). A new price with the same timestamp is stored.
+
+        Raises:
+            ValueError: If a price is negative or not below 4294.967296;
+                        nothing is written then
+        """
+        # Convert every rate first so a bad one leaves the store untouched.
+        records = [
+            (
+                rate,
+                (
+                    to_epoch_ms(rate.timestamp),
+                    _to_fixed(rate.buy_price),
+                    _to_fixed(rate.sell_price),
+                ),
+            )
+            for rate in rates
+        ]
+        written = 0
+        touched: set[BinaryIO] = set()
+        for rate, record in records:
+            last = self._last_stored(rate.name)
+            if last is not None and (record[0] < last[0] or record == last):
+                continue
+            house_id = self._id_for(rate.name)
+            writer = self._writer(house_id, rate.timestamp)
+            writer.write(RECORD.pack(house_id, *record))
+            touched.add(writer)
+            self._last[rate.name] = record
+            written += 1
+        for writer in touched:
+            writer.flush()
+        return written
+
+    def range(
+        self,
+        name: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[ExchangeRate]:
+        """
+        Yield the rates stored under `name` from `start` up to, not including, `end`.
+
+        Rates are read from the mapped segments as they are iterated.
+        """
+        house_id = self._ids.get(name)
+        if house_id is None:
+            return
+        start_ms = to_epoch_ms(start) if start is not None else None
+        end_ms = to_epoch_ms(end) if end is not None else None
+        for segment in self._segments(house_id, start, end):
+            with _Mapped(segment) as buffer:
+                if buffer is None:
+                    continue
+                count = len(buffer) // RECORD.size
+                lo = 0 if start_ms is None else _bisect(buffer, start_ms, count)
+                hi = count if end_ms is None else _bisect(buffer, end_ms, count)
+                for index in range(lo, hi):
+                    yield _decode(name, buffer, index)
+
+    def latest(self, name: str) -> ExchangeRate | None:
+        """Return the newest rate stored under `name`."""
+        house_id = self._ids.get(name)
+        if house_id is None:
+            return None
+        for segment in reversed(self._segments(house_id)):
+            with _Mapped(segment) as buffer:
+                if buffer is not None:
+                    return _decode(name, buffer, len(buffer) // RECORD.size - 1)
+        return None
+
+    def as_of(self, name: str, when: datetime) -> ExchangeRate | None:
+        """Return the rate in effect at `when`: the newest one stored at or before it."""
+        house_id = self._ids.get(name)
+        if house_id is None:
+            return None
+        when_ms = to_epoch_ms(when)
+        for segment in reversed(self._segments(house_id, end=when)):
+            with _Mapped(segment) as buffer:
+                if buffer is None:
+                    continue
+                index = _bisect(buffer, when_ms + 1, len(buffer) // RECORD.size)
+                if index > 0:
+                    return _decode(name, buffer, index - 1)
+        return None
+
+    def _id_for(self, name: str) -> int:
+        house_id = self._ids.get(name)
+        if house_id is None:
+            house_id = len(self._ids)
+            if house_id >= _MAX_HOUSES:
+                msg = f"History store {self.root} is full ({_MAX_HOUSES} names)"
+                raise ValueError(msg)
+            self._ids[name] = house_id
+            registry = self.root / _REGISTRY
+            tmp = registry.with_name(f".{registry.name}.tmp")
+            tmp.write_text(json.dumps(self._ids, sort_keys=True), encoding="utf-8")
+            tmp.replace(registry)
+        return house_id
+
+    def _last_stored(self, name: str) -> tuple[int, int, int] | None:
+        if name not in self._last:
+            latest = self.latest(name)
+            if latest is None:
+                return None
+            self._last[name] = (
+                to_epoch_ms(latest.timestamp),
+                _to_fixed(latest.buy_price),
+                _to_fixed(latest.sell_price),
+            )
+        return self._last[name]
+
+    def _writer(self, house_id: int, timestamp: datetime) -> BinaryIO:
+        path = self.root / str(house_id) / f"{_month(timestamp)}.bin"
+        writer = self._writers.get(path)
+        if writer is None:
+            path.parent.mkdir(exist_ok=True)
+            writer = self._writers[path] = path.open("ab")
+        return writer
+
+    def _segments(
+        self,
+        house_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Path]:
+        """Segment files of a house, oldest first, that may hold [start, end)."""
+        directory = self.root / str(house_id)
+        if not directory.is_dir():
+            return []
+        first = _month(start) if start is not None else ""
+        last = _month(end) if end is not None else "9999-99"
+        for writer in self._writers.values():
+            writer.flush()
+        return sorted(
+            path for path in directory.glob("*.bin") if first <= path.stem <= last
+        )
+
+
+class _Mapped:
+    """Read-only mmap of a segment; None for an empty file."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._map: mmap.mmap | None = None
+
+    def __enter__(self) -> mmap.mmap | None:
+        with self._path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < RECORD.size:
+                return None
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._map is not None:
+            self._map.close()
+
+
+def _bisect(buffer: mmap.mmap, ms: int, count: int) -> int:
+    """Index of the first record at or after `ms`."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if RECORD.unpack_from(buffer, mid * RECORD.size)[1] < ms:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _decode(name: str, buffer: mmap.mmap, index: int) -> ExchangeRate:
+    _, ms, buy, sell = RECORD.unpack_from(buffer, index * RECORD.size)
+    return ExchangeRate(
+        name=name,
+        buy_price=buy / PRICE_SCALE,
+        sell_price=sell / PRICE_SCALE,
+        timestamp=from_epoch_ms(ms),
+    )
+
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    """Milliseconds since the epoch; naive datetimes are taken as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return round(timestamp.timestamp() * 1000)
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    """UTC datetime for milliseconds since the epoch."""
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def _to_fixed(price: float) -> int:
+    scaled = price * PRICE_SCALE
+    if not 0 <= scaled <= _MAX_FIXED:
+        msg = f"Price {price} does not fit a history record"
+        raise ValueError(msg)
+    return round(scaled)
+
+
+def _month(timestamp: datetime) -> str:
+    return timestamp.astimezone(timezone.utc).strftime("%Y-%m")
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from types import TracebackType
+
+from perexchange.history.binary import from_epoch_ms, to_epoch_ms
+from perexchange.models import ExchangeRate
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    house TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    buy REAL NOT NULL,
+    sell REAL NOT NULL,
+    PRIMARY KEY (house, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS houses (name TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+# Statements are compiled once per connection and reused from sqlite3's cache.
+_INSERT = "INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)"
+_INSERT_HOUSE = "INSERT OR IGNORE INTO houses VALUES (?)"
+_NAMES = "SELECT name FROM houses ORDER BY name"
+_RANGE = (
+    "SELECT house, timestamp, buy, sell FROM rates"
+    " WHERE house = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp"
+)
+_AS_OF = (
+    "SELECT house, timestamp, buy, sell FROM rates"
+    " WHERE house = ? AND timestamp <= ? ORDER BY timestamp DESC LIMIT 1"
+)
+# CROSS JOIN keeps houses as the outer loop: one index seek per house.
+_LATEST_ALL = (
+    "SELECT r.house, r.timestamp, r.buy, r.sell FROM houses h CROSS JOIN rates r"
+    " WHERE r.house = h.name AND r.timestamp ="
+    " (SELECT MAX(timestamp) FROM rates WHERE house = h.name)"
+    " ORDER BY r.house"
+)
+
+_MIN_MS = -(2**63)
+_MAX_MS = 2**63 - 1
+
+
+class SQLiteHistory:
+    """
+    Rate history in a SQLite database.
+
+    Same queries as `HistoryStore`, plus `latest_all()`, for when SQL access
+    to the data is worth more than the smaller files. Rows are keyed by
+    `(house, timestamp)`, where house is the rate's name, so range and as-of
+    lookups are index seeks and storing a rate twice keeps the last copy.
+
+    The database runs in WAL mode: readers, such as a dashboard in another
+    process, never block the poller, and each `append()` is one transaction.
+
+    Example:
+        >>> with SQLiteHistory("rates.db") as history:
+        ...     history.append(await fetch_rates())
+        ...     board = history.latest_all()
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """
+        Args:
+            path: Database file; created if missing
+        """
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Durable at every checkpoint rather than every commit; safe under WAL.
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SQLiteHistory":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def names(self) -> list[str]:
+        """Names of every rate series in the database."""
+        return [name for (name,) in self._db.execute(_NAMES)]
+
+    def append(self, rates: Iterable[ExchangeRate]) -> int:
+        """Store `rates` in a single transaction; return how many were written."""
+        rows = [
+            (rate.name, to_epoch_ms(rate.timestamp), rate.buy_price, rate.sell_price)
+            for rate in rates
+        ]
+        with self._db:
+            self._db.executemany(_INSERT_HOUSE, {(row[0],) for row in rows})
+            self._db.executemany(_INSERT, rows)
+        return len(rows)
+
+    def range(
+        self,
+        name: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[ExchangeRate]:
+        """Yield the rates stored under `name` from `start` up to, not including, `end`."""
+        start_ms = to_epoch_ms(start) if start is not None else _MIN_MS
+        end_ms = to_epoch_ms(end) if end is not None else _MAX_MS
+        for row in self._db.execute(_RANGE, (name, start_ms, end_ms)):
+            yield _decode(row)
+
+    def latest(self, name: str) -> ExchangeRate | None:
+        """Return the newest rate stored under `name`."""
+        row = self._db.execute(_AS_OF, (name, _MAX_MS)).fetchone()
+        return _decode(row) if row else None
+
+    def as_of(self, name: str, when: datetime) -> ExchangeRate | None:
+        """Return the rate in effect at `when`: the newest one stored at or before it."""
+        row = self._db.execute(_AS_OF, (name, to_epoch_ms(when))).fetchone()
+        return _decode(row) if row else None
+
+    def latest_all(self) -> dict[str, ExchangeRate]:
+        """Return the newest rate of every name."""
+        return {row[0]: _decode(row) for row in self._db.execute(_LATEST_ALL)}
+
+
+def _decode(row: tuple[str, int, float, float]) -> ExchangeRate:
+    name, ms, buy, sell = row
+    return ExchangeRate(
+        name=name,
+        buy_price=buy,
+        sell_price=sell,
+        timestamp=from_epoch_ms(ms),
+    )
@@ -0,0 +1,226 @@
+import copy
+import time
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from perexchange.context import current_house
+from perexchange.scrapers.base import HTTP_CACHE_EXTENSION
+
+
+_NOT_PARSED = object()
+
+# Headers a 304 may update on the stored response (RFC 9111, section 4.3.4).
+_REFRESHED_HEADERS = (
+    "age",
+    "cache-control",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+)
+
+
+@dataclass
+class HTTPCacheStats:
+    """Work an HTTP cache saved for one house."""
+
+    hits: int = 0  # Served from memory without a request
+    revalidated: int = 0  # Upstream answered 304 Not Modified
+    bytes_saved: int = 0  # Body bytes not downloaded again
+    parses_saved: int = 0  # Parses skipped by reusing an earlier result
+
+
+@dataclass
+class _Entry:
+    headers: httpx.Headers
+    body: bytes
+    expires_at: float
+    parsed: Any = field(default=_NOT_PARSED)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        conditional = {}
+        if etag := self.headers.get("etag"):
+            conditional["if-none-match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            conditional["if-modified-since"] = last_modified
+        return conditional
+
+
+class _ParseMemo:
+    """Response extension that lets scrapers reuse an entry's parsed rates."""
+
+    def __init__(self, entry: _Entry, stats: HTTPCacheStats | None) -> None:
+        self._entry = entry
+        self._stats = stats  # None when the body was just downloaded
+
+    def get(self) -> Any:
+        if self._stats is None or self._entry.parsed is _NOT_PARSED:
+            return None
+        self._stats.parses_saved += 1
+        return copy.copy(self._entry.parsed)
+
+    def put(self, result: Any) -> None:
+        self._entry.parsed = copy.copy(result)
+
+
+class HTTPCache:
+    """
+    Per-URL HTTP cache that honors ETag, Last-Modified and Cache-Control.
+
+    Responses to GET requests are stored with their validators. While
+    `max-age` lasts they are served from memory; afterwards the request is
+    sent with If-None-Match/If-Modified-Since and a 304 reuses the stored
+    body. Scrapers that parse through parse_json_response or
+    parse_html_response also reuse the rates parsed from that body, so rates
+    served this way keep the timestamp they were first parsed with.
+
+    Example:
+        >>> http_cache = HTTPCache()
+        >>> async with RateSession(http_cache=http_cache) as session:
+        ...     await session.fetch_rates()
+        ...     await session.fetch_rates()
+        >>> http_cache.stats()["chapacambio"].bytes_saved
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[str, _Entry] = {}
+        self._stats: dict[str, HTTPCacheStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, HTTPCacheStats]:
+        """Savings per house (or per host, for requests made outside a session)."""
+        return dict(self._stats)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def transport(self, inner: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        """Wrap `inner` so requests sent through it use this cache."""
+        return _CachingTransport(inner, self)
+
+    def _stats_for(self, request: httpx.Request) -> HTTPCacheStats:
+        key = current_house.get() or request.url.host
+        return self._stats.setdefault(key, HTTPCacheStats())
+
+    def _store(self, url: str, response: httpx.Response, body: bytes) -> _Entry | None:
+        directives = _cache_control(response.headers)
+        if "no-store" in directives:
+            self._entries.pop(url, None)
+            return None
+
+        entry = _Entry(response.headers, body, self._expires_at(directives, response))
+        if not entry.validators and entry.expires_at <= self._clock():
+            self._entries.pop(url, None)
+            return None
+
+        self._entries[url] = entry
+        return entry
+
+    def _expires_at(
+        self, directives: dict[str, str], response: httpx.Response
+    ) -> float:
+        if "no-cache" in directives:
+            return 0.0
+        try:
+            max_age = int(directives.get("max-age", "0"))
+            age = int(response.headers.get("age", "0"))
+        except ValueError:
+            return 0.0
+        return self._clock() + max(max_age - age, 0)
+
+
+class _CachingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: HTTPCache) -> None:
+        self._inner = inner
+        self._cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._inner.handle_async_request(request)
+
+        url = str(request.url)
+        entry = self._cache._entries.get(url)
+
+        if entry is not None and entry.expires_at > self._cache._clock():
+            stats = self._cache._stats_for(request)
+            stats.hits += 1
+            stats.bytes_saved += len(entry.body)
+            return _replay(entry, request, stats)
+
+        if entry is not None:
+            request.headers.update(entry.validators)
+
+        response = await self._inner.handle_async_request(request)
+
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            for name in _REFRESHED_HEADERS:
+                if name in response.headers:
+                    entry.headers[name] = response.headers[name]
+            entry.expires_at = self._cache._expires_at(
+                _cache_control(entry.headers), response
+            )
+            stats = self._cache._stats_for(request)
+            stats.revalidated += 1
+            stats.bytes_saved += len(entry.body)
+            return _replay(entry, request, stats)
+
+        if response.status_code != 200:
+            return response
+
+        try:
+            body = await _read_raw(response)
+        finally:
+            await response.aclose()
+
+        stored = self._cache._store(url, response, body)
+        extensions = dict(response.extensions)
+        if stored is not None:
+            extensions[HTTP_CACHE_EXTENSION] = _ParseMemo(stored, None)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions=extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+async def _read_raw(response: httpx.Response) -> bytes:
+    """Read the body as it came off the wire, before content decoding."""
+    if not isinstance(response.stream, httpx.AsyncByteStream):
+        msg = "Transport returned a synchronous stream"
+        raise TypeError(msg)
+    return b"".join([chunk async for chunk in response.stream])
+
+
+def _replay(
+    entry: _Entry, request: httpx.Request, stats: HTTPCacheStats
+) -> httpx.Response:
+    return httpx.Response(
+        status_code=200,
+        headers=entry.headers,
+        stream=httpx.ByteStream(entry.body),
+        request=request,
+        extensions={HTTP_CACHE_EXTENSION: _ParseMemo(entry, stats)},
+    )
+
+
+def _cache_control(headers: httpx.Headers) -> dict[str, str]:
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
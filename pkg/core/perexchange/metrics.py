@@ -0,0 +1,258 @@
+import asyncio
+import os
+import threading
+import time
+
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from perexchange.events import FetchEvent
+
+
+# Seconds; the houses answer in tens of milliseconds to a few seconds.
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Scraping health and latency in the Prometheus text format.
+
+    A Metrics object is a FetchEvent listener: register it with
+    `events.add_listener` and it records, per house, fetch latency and
+    outcomes, failures and retries by error class, parse durations, and the
+    age of the last successful fetch. `render()` returns the exposition text,
+    `write()` saves it for node_exporter's textfile collector, and `serve()`
+    answers scrapes on a local port.
+
+    Example:
+        >>> metrics = Metrics()
+        >>> events.add_listener(metrics)
+        >>> server = await metrics.serve(9464)
+        >>> async with RateSession() as session:
+        ...     rates = await session.fetch_rates()
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            buckets: Upper bounds, in seconds, of the latency histogram buckets
+            clock: Wall-clock time source, in seconds since the epoch
+        """
+        self.buckets = tuple(buckets)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fetches: dict[Labels, int] = {}
+        self._failures: dict[Labels, int] = {}
+        self._retries: dict[Labels, int] = {}
+        self._bytes: dict[Labels, int] = {}
+        self._latency: dict[Labels, _Histogram] = {}
+        self._parse: dict[Labels, _Histogram] = {}
+        self._last_success: dict[Labels, float] = {}
+
+    def __call__(self, event: FetchEvent) -> None:
+        house = (("house", event.house),)
+        with self._lock:
+            if event.kind == "outcome":
+                self._record_outcome(event, house)
+            elif event.kind == "retry":
+                labels = (*house, ("error", _error_class(event.error)))
+                self._retries[labels] = self._retries.get(labels, 0) + 1
+            elif event.kind == "parse":
+                self._histogram(self._parse, house).observe(event.seconds)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        now = self._clock()
+        lines: list[str] = []
+        with self._lock:
+            _counter(
+                lines,
+                "perexchange_fetches_total",
+                "House fetches by outcome (ok, error, over_budget, cancelled).",
+                self._fetches,
+            )
+            _counter(
+                lines,
+                "perexchange_failures_total",
+                "Failed house fetches by error class.",
+                self._failures,
+            )
+            _counter(
+                lines,
+                "perexchange_retries_total",
+                "Retried attempts by the error that caused them.",
+                self._retries,
+            )
+            _counter(
+                lines,
+                "perexchange_response_bytes_total",
+                "Response body bytes received.",
+                self._bytes,
+            )
+            _histogram(
+                lines,
+                "perexchange_fetch_duration_seconds",
+                "Time to fetch one house, including retries.",
+                self._latency,
+            )
+            _histogram(
+                lines,
+                "perexchange_parse_duration_seconds",
+                "Time spent in one call to a parse function.",
+                self._parse,
+            )
+            ages = {
+                labels: max(now - at, 0.0) for labels, at in self._last_success.items()
+            }
+            _gauge(
+                lines,
+                "perexchange_last_success_age_seconds",
+                "Seconds since the house last returned rates.",
+                ages,
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the metrics to `path`, replacing it atomically.
+
+        A scraper reading the file never sees a partial write.
+        """
+        target = Path(path)
+        tmp = target.with_name(f".{target.name}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(target)
+
+    async def serve(self, port: int = 9464, host: str = "127.0.0.1") -> asyncio.Server:
+        """
+        Answer `GET /metrics` on `host:port` until the returned server is closed.
+
+        Pass port 0 to pick a free port; read it from `server.sockets`.
+        """
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            method, path, *_ = head.split(b" ", 2)
+            if method == b"GET" and path.split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n"
+                "\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _record_outcome(self, event: FetchEvent, house: Labels) -> None:
+        status = (*house, ("status", event.status or "error"))
+        self._fetches[status] = self._fetches.get(status, 0) + 1
+        self._bytes[house] = self._bytes.get(house, 0) + event.bytes_received
+        self._histogram(self._latency, house).observe(event.seconds)
+        if event.status == "ok":
+            self._last_success[house] = self._clock()
+        elif event.status != "cancelled":
+            labels = (*house, ("error", _error_class(event.error)))
+            self._failures[labels] = self._failures.get(labels, 0) + 1
+
+    def _histogram(
+        self, series: dict[Labels, _Histogram], labels: Labels
+    ) -> _Histogram:
+        if labels not in series:
+            series[labels] = _Histogram(self.buckets)
+        return series[labels]
+
+
+def _error_class(error: BaseException | None) -> str:
+    return type(error).__name__ if error is not None else "unknown"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
+
+
+def _header(lines: list[str], name: str, help_text: str, kind: str) -> None:
+    lines.extend((f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"))
+
+
+def _counter(
+    lines: list[str], name: str, help_text: str, series: dict[Labels, int]
+) -> None:
+    _header(lines, name, help_text, "counter")
+    lines.extend(
+        f"{name}{_format_labels(labels)} {value}"
+        for labels, value in sorted(series.items())
+    )
+
+
+def _gauge(
+    lines: list[str], name: str, help_text: str, series: dict[Labels, float]
+) -> None:
+    _header(lines, name, help_text, "gauge")
+    lines.extend(
+        f"{name}{_format_labels(labels)} {_number(value)}"
+        for labels, value in sorted(series.items())
+    )
+
+
+def _histogram(
+    lines: list[str], name: str, help_text: str, series: dict[Labels, _Histogram]
+) -> None:
+    _header(lines, name, help_text, "histogram")
+    for labels, histogram in sorted(series.items()):
+        for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+            le = _format_labels((*labels, ("le", _number(bound))))
+            lines.append(f"{name}_bucket{le} {count}")
+        le = _format_labels((*labels, ("le", "+Inf")))
+        lines.extend(
+            (
+                f"{name}_bucket{le} {histogram.count}",
+                f"{name}_sum{_format_labels(labels)} {_number(histogram.total)}",
+                f"{name}_count{_format_labels(labels)} {histogram.count}",
+            )
+        )
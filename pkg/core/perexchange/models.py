@@ -1,5 +1,7 @@
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Literal
 
 
 @dataclass(frozen=True)
@@ -19,3 +21,53 @@ class ExchangeRate:
             f"ExchangeRate({self.name!r}, "
             f"buy={self.buy_price:.4f}, sell={self.sell_price:.4f})"
         )
+
+
+HouseStatus = Literal["ok", "error", "over_budget", "missed"]
+
+# Where a house's rates came from: its own request, a concurrent caller's
+# request it joined, or RateCache.
+RateSource = Literal["network", "shared", "cache"]
+
+
+@dataclass(frozen=True)
+class HouseReport:
+    """How one house did in a fetch_rates call."""
+
+    house: str
+    status: HouseStatus  # "missed" means the call's deadline cut it off
+    rates: int  # Rates returned, before deduplication
+    attempts: int  # Requests made, counting retries
+    elapsed: float  # Seconds
+    bytes_received: int  # Response body bytes
+    source: RateSource = "network"
+    error_type: str | None = None  # Exception class name
+    error_message: str | None = None
+
+
+class FetchResult(list[ExchangeRate]):  # noqa: FURB189 (fetch_rates has always returned a real list)
+    """
+    Rates returned by fetch_rates.
+
+    A plain list of rates, plus the houses that were still running when the
+    call's deadline expired (`missed`) and the houses cancelled for running
+    over their per-house budget (`over_budget`). With `report=True`,
+    `report` maps every requested house to its HouseReport.
+    """
+
+    def __init__(
+        self,
+        rates: Iterable[ExchangeRate] = (),
+        missed: Iterable[str] = (),
+        over_budget: Iterable[str] = (),
+        report: Mapping[str, HouseReport] | None = None,
+    ) -> None:
+        super().__init__(rates)
+        self.missed = list(missed)
+        self.over_budget = list(over_budget)
+        self.report = dict(report or {})
+
+    @property
+    def complete(self) -> bool:
+        """Whether every requested house finished before the deadline."""
+        return not self.missed
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+
+class RetryBudget:
+    """
+    Process-wide limit on retries, so retrying cannot amplify an outage.
+
+    A token bucket: every first attempt adds `ratio` tokens, time adds
+    `min_per_second` tokens per second, and each retry spends one token. The
+    bucket holds at most `max_tokens`. When it is empty, failures are
+    returned to the caller instead of retried. With the defaults, retries
+    settle at about 20% of requests (plus two per second) once upstream
+    fails persistently.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 2.0,
+        max_tokens: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(0.0)
+            return self._tokens
+
+    def record_request(self) -> None:
+        """Credit the bucket for a first attempt."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one token for a retry; False if the budget is exhausted."""
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _refill(self, extra: float) -> None:
+        now = self._clock()
+        earned = (now - self._updated_at) * self.min_per_second + extra
+        self._tokens = min(self.max_tokens, self._tokens + earned)
+        self._updated_at = now
+
+
+RETRY_BUDGET = RetryBudget()
+
+# 429 and every 5xx, including 501, 505 and the 52x codes CDNs answer with.
+RETRYABLE_STATUSES = frozenset({429, *range(500, 600)})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Which failures fetch_with_retry retries, and how long it waits between tries.
+
+    Only transient failures are retried: timeouts, connection errors, and
+    responses with a status in `retry_statuses` (429 and 5xx by default).
+    A 403 or 404 fails on the first attempt.
+
+    Waits use decorrelated jitter: each one is drawn between the base delay
+    and three times the previous wait, capped at `max_delay`, so clients
+    that failed together don't retry together. A Retry-After header, when
+    present, sets the wait instead (up to `max_retry_after`).
+
+    Every retry also needs a token from `budget`, shared by default by the
+    whole process.
+
+    Example:
+        >>> slow = RetryPolicy(max_delay=5.0, max_retry_after=60.0)
+        >>> async with RateSession(retry_policy={"westernunion": slow}) as session:
+        ...     rates = await session.fetch_rates()
+    """
+
+    max_delay: float = 10.0
+    retry_statuses: frozenset[int] = RETRYABLE_STATUSES
+    respect_retry_after: bool = True
+    max_retry_after: float = 30.0
+    budget: RetryBudget | None = field(default_factory=lambda: RETRY_BUDGET)
+    random: Callable[[float, float], float] = field(
+        default=random.uniform, compare=False, repr=False
+    )
+
+    def is_retryable(self, error: httpx.HTTPError) -> bool:
+        """Whether `error` is worth another attempt."""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+        return isinstance(
+            error,
+            (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError),
+        )
+
+    def next_delay(
+        self,
+        error: httpx.HTTPError,
+        base_delay: float,
+        previous_delay: float,
+    ) -> float:
+        """Seconds to wait before retrying after `error`."""
+        if self.respect_retry_after and isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        upper = max(base_delay, previous_delay * 3)
+        return min(self.max_delay, self.random(base_delay, upper))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait per a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+# Policy used by fetch_with_retry in the current task; RateSession sets it per house.
+retry_policy: ContextVar[RetryPolicy] = ContextVar(
+    "retry_policy", default=DEFAULT_POLICY
+)
@@ -1,5 +1,7 @@
 from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
+from perexchange.coalesce import coalesce
 from perexchange.scrapers.base import ExchangeRateScraper
 from perexchange.scrapers.cambiafx import fetch_cambiafx
 from perexchange.scrapers.cambioseguro import fetch_cambioseguro
@@ -14,6 +16,11 @@ from perexchange.scrapers.westernunion import fetch_westernunion
 from perexchange.scrapers.yanki import fetch_yanki
 
 
+if TYPE_CHECKING:
+    from perexchange.breaker import CircuitBreaker
+    from perexchange.cache import RateCache
+
+
 _SCRAPERS: dict[str, ExchangeRateScraper] = {
     "cambioseguro": fetch_cambioseguro,
     "cambiafx": fetch_cambiafx,
@@ -29,26 +36,71 @@ _SCRAPERS: dict[str, ExchangeRateScraper] = {
 }
 
 
-def get_scrapers(houses: Sequence[str] | None = None) -> list[ExchangeRateScraper]:
+def resolve_houses(houses: Sequence[str] | None = None) -> list[str]:
     """
-    Get scrapers for specified houses, or all if None.
+    Normalize house names, or list every known house if None.
 
     Raises:
         ValueError: If a house name is not recognized
     """
     if houses is None:
-        return list(_SCRAPERS.values())
+        return list(_SCRAPERS)
 
-    scrapers = []
+    names = []
     for house in houses:
         house_lower = house.lower()
         if house_lower not in _SCRAPERS:
             available = ", ".join(sorted(_SCRAPERS.keys()))
             msg = f"Unknown house: {house!r}. Available: {available}"
             raise ValueError(msg)
-        scrapers.append(_SCRAPERS[house_lower])
+        names.append(house_lower)
+
+    return names
+
+
+def get_scraper(
+    house: str,
+    cache: "RateCache | None" = None,
+    circuit_breaker: "CircuitBreaker | None" = None,
+    *,
+    shared: bool = True,
+) -> ExchangeRateScraper:
+    """
+    Get the scraper for a single house, reading through `cache` if given.
+
+    Concurrent calls to the returned scraper share one in-flight request:
+    with any caller if `shared`, otherwise only with callers on the same
+    client, which then also runs the cache's background refreshes.
+    With a `circuit_breaker`, requests that do reach upstream go through the
+    house's breaker, once per shared request; cache hits don't.
+
+    Raises:
+        ValueError: If the house name is not recognized
+    """
+    name = resolve_houses([house])[0]
+    scraper = _SCRAPERS[name]
+    if circuit_breaker is not None:
+        scraper = circuit_breaker.wrap(name, scraper)
+    scraper = coalesce(name, scraper, shared=shared)
+    if cache is not None:
+        scraper = cache.wrap(name, scraper, shared=shared)
+    return scraper
+
 
-    return scrapers
+def get_scrapers(
+    houses: Sequence[str] | None = None,
+    cache: "RateCache | None" = None,
+    circuit_breaker: "CircuitBreaker | None" = None,
+) -> list[ExchangeRateScraper]:
+    """
+    Get scrapers for specified houses, or all if None.
+
+    Raises:
+        ValueError: If a house name is not recognized
+    """
+    return [
+        get_scraper(house, cache, circuit_breaker) for house in resolve_houses(houses)
+    ]
 
 
 __all__ = [
@@ -64,5 +116,7 @@ __all__ = [
     "fetch_tucambista",
     "fetch_westernunion",
     "fetch_yanki",
+    "get_scraper",
     "get_scrapers",
+    "resolve_houses",
 ]
@@ -1,16 +1,34 @@
 import asyncio
+import time
 
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Mapping
 from contextlib import asynccontextmanager
-from typing import Protocol, TypeVar
+from typing import Any, Protocol, TypeVar
 
 import httpx
 
+from bs4 import BeautifulSoup
+from bs4.filter import SoupStrainer
+from lxml import etree  # type: ignore[import-untyped]
+
+from perexchange import events
+from perexchange.executor import parse_executor
+from perexchange.hedge import hedger
 from perexchange.models import ExchangeRate
+from perexchange.retry import retry_policy
 
 
 T = TypeVar("T")
 
+# Response extension set by perexchange.http_cache on responses it can memoize.
+HTTP_CACHE_EXTENSION = "perexchange.http_cache"
+
+# Largest page fetch_html_stream will read before giving up on it.
+MAX_STREAM_BYTES = 2 * 1024 * 1024
+
+# Most body fetch_html_stream reads past an early parse to keep the connection.
+MAX_DRAIN_BYTES = 128 * 1024
+
 
 class ExchangeRateScraper(Protocol):
     """Protocol defining the interface all scrapers must implement."""
@@ -20,59 +38,342 @@ class ExchangeRateScraper(Protocol):
         timeout: float = 10.0,
         max_retries: int = 3,
         retry_delay: float = 0.5,
+        client: httpx.AsyncClient | None = None,
     ) -> Awaitable[list[ExchangeRate]]:  # fmt: skip
         ...
 
 
-@asynccontextmanager
-async def get_http_client(timeout: float) -> AsyncGenerator[httpx.AsyncClient, None]:
+def pool_limits(houses: int, keepalive_expiry: float = 5.0) -> httpx.Limits:
     """
-    Create HTTP client with connection pooling.
+    Connection pool limits for a client shared by `houses` scrapers.
+
+    Every house lives on its own host, so one keep-alive connection per house
+    is enough to reuse connections. The hard cap leaves room for scrapers that
+    issue more than one request per attempt (westernunion).
+    """
+    houses = max(houses, 1)
+    return httpx.Limits(
+        max_keepalive_connections=houses,
+        max_connections=houses * 2,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def create_http_client(
+    timeout: float,
+    limits: httpx.Limits | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create an HTTP/2-capable client. The caller is responsible for closing it.
+
+    When `transport` is given, pool limits and HTTP/2 are up to that transport.
     """
-    async with httpx.AsyncClient(
+    return httpx.AsyncClient(
         timeout=timeout,
-        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+        limits=limits or pool_limits(1),
         http2=True,
-    ) as client:
+        transport=transport,
+        event_hooks={
+            "request": [events.on_request],
+            "response": [events.on_response],
+        },
+    )
+
+
+@asynccontextmanager
+async def get_http_client(
+    timeout: float,
+    limits: httpx.Limits | None = None,
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Create HTTP client with connection pooling.
+    """
+    async with create_http_client(timeout, limits) as client:
         yield client
 
 
+async def run_parse(fn: Callable[..., T], *args: Any) -> T:
+    """Run a parse function on the executor of the current task."""
+    if not events.enabled():
+        return await parse_executor.get().run(fn, *args)
+    started = time.perf_counter()
+    try:
+        return await parse_executor.get().run(fn, *args)
+    finally:
+        events.emit("parse", time.perf_counter() - started)
+
+
+async def parse_json_response(
+    response: httpx.Response,
+    parse: Callable[[Any], T],
+) -> T:
+    """Decode a JSON body and parse it. See _parse_response."""
+    return await _parse_response(response, parse, response.json)
+
+
+async def parse_html_response(
+    response: httpx.Response,
+    parse: Callable[[str], T],
+) -> T:
+    """Parse an HTML body. See _parse_response."""
+    return await _parse_response(response, parse, lambda: response.text)
+
+
+async def _parse_response(
+    response: httpx.Response,
+    parse: Callable[[Any], T],
+    load: Callable[[], Any],
+) -> T:
+    """
+    Run `parse` on the loaded body, or reuse its earlier result.
+
+    Responses served by an HTTP cache (fresh hit or 304 revalidation) carry
+    the same body as the response they were stored from, so parsing them
+    again would give the same rates.
+    """
+    memo = response.extensions.get(HTTP_CACHE_EXTENSION)
+    if memo is not None:
+        cached: T | None = memo.get()
+        if cached is not None:
+            return cached
+
+    result = await run_parse(parse, load())
+
+    if memo is not None:
+        memo.put(result)
+    return result
+
+
+class AnyOf(SoupStrainer):
+    """SoupStrainer that keeps a top-level element if any of `strainers` would."""
+
+    def __init__(self, *strainers: SoupStrainer) -> None:
+        super().__init__()
+        self.strainers = strainers
+
+    def allow_tag_creation(
+        self,
+        nsprefix: str | None,
+        name: str,
+        attrs: Any,
+    ) -> bool:
+        return any(s.allow_tag_creation(nsprefix, name, attrs) for s in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+def parse_scoped(
+    html_content: str,
+    features: str,
+    scope: SoupStrainer,
+    extract: Callable[[BeautifulSoup], T | None],
+) -> T | None:
+    """
+    Run `extract` on a soup built only from the elements matched by `scope`.
+
+    Scrapers read one small area of a large page, so building just that
+    subtree saves most of the parse time and memory. If the scoped soup
+    yields nothing (the layout moved), the whole page is parsed instead.
+    """
+    result = extract(BeautifulSoup(html_content, features, parse_only=scope))
+    if result is not None:
+        return result
+    return extract(BeautifulSoup(html_content, features))
+
+
+async def fetch_html_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    parse: Callable[[str], T],
+    matches: Callable[[str, Mapping[str, str]], bool],
+    wanted: int = 1,
+    max_bytes: int = MAX_STREAM_BYTES,
+    max_drain: int = MAX_DRAIN_BYTES,
+) -> T:
+    """
+    GET an HTML page and parse it as soon as the elements it needs arrive.
+
+    The body is fed chunk by chunk into an incremental parser. Each element
+    for which `matches(tag, attrs)` is true is kept once it is complete;
+    when `wanted` of them are in, `parse` runs on just those elements. A
+    ValueError from that early parse is not final: streaming continues, and
+    if the page ends first, `parse` gets the whole page, exactly as
+    parse_html_response would.
+
+    After an early parse the rest of the body is still read, unparsed, so
+    the HTTP/1.1 connection goes back to the pool: closing a response
+    mid-body closes its connection, and the next fetch pays for a new TCP
+    and TLS handshake. Only when more than `max_drain` bytes remain (by
+    Content-Length, or as they arrive) is the response closed early; on a
+    slow link that is cheaper than downloading the rest.
+
+    Raises:
+        httpx.HTTPStatusError: On a non-2xx response
+        ValueError: If the page is larger than `max_bytes`, or parsing fails
+    """
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+
+        if HTTP_CACHE_EXTENSION in response.extensions:
+            # The cache already holds the whole body, and maybe its parse.
+            await response.aread()
+            return await parse_html_response(response, parse)
+
+        encoding = response.encoding or "utf-8"
+        collector = _ElementCollector(matches, encoding)
+        body = bytearray()
+        chunks = response.aiter_bytes()
+
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > max_bytes:
+                msg = f"Page is larger than {max_bytes} bytes"
+                raise ValueError(msg)
+
+            if collector.feed(chunk) and len(collector.found) >= wanted:
+                try:
+                    result = await run_parse(parse, "".join(collector.found))
+                except ValueError:
+                    continue
+                await _drain(response, chunks, max_drain)
+                return result
+
+    return await run_parse(parse, body.decode(encoding, errors="replace"))
+
+
+async def _drain(
+    response: httpx.Response,
+    chunks: AsyncIterator[bytes],
+    max_drain: int,
+) -> None:
+    """Read the rest of a body, unless more than `max_drain` bytes remain."""
+    start = response.num_bytes_downloaded
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) - start > max_drain:
+        return
+    async for _ in chunks:
+        if response.num_bytes_downloaded - start > max_drain:
+            return
+
+
+class _ElementCollector:
+    """Incremental HTML parser that keeps only the elements `matches` selects."""
+
+    def __init__(
+        self,
+        matches: Callable[[str, Mapping[str, str]], bool],
+        encoding: str,
+    ) -> None:
+        self.matches = matches
+        self.found: list[str] = []
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._open_matches = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse `chunk`; return True if it completed a matching element."""
+        found_before = len(self.found)
+        self._parser.feed(chunk)
+        for event, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue  # Comments and processing instructions
+            matched = self.matches(element.tag, element.attrib)
+            if event == "start":
+                self._open_matches += matched
+            elif matched:
+                self._open_matches -= 1
+                self.found.append(_to_html(element))
+            elif self._open_matches == 0:
+                _discard(element)
+        return len(self.found) > found_before
+
+
+def _to_html(element: Any) -> str:
+    html: str = etree.tostring(
+        element, encoding="unicode", method="html", with_tail=False
+    )
+    return html
+
+
+def _discard(element: Any) -> None:
+    """Free a finished element and its earlier siblings; nothing reads them."""
+    element.clear()
+    parent = element.getparent()
+    while parent is not None and element.getprevious() is not None:
+        del parent[0]
+
+
+@asynccontextmanager
+async def _use_client(
+    client: httpx.AsyncClient | None,
+    timeout: float,
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Yield the caller's client untouched, or a private one closed on exit."""
+    if client is not None:
+        yield client
+        return
+    async with get_http_client(timeout) as own_client:
+        yield own_client
+
+
 async def fetch_with_retry(
     fetch_fn: Callable[[httpx.AsyncClient], Awaitable[T]],
     timeout: float,
     max_retries: int,
     retry_delay: float,
     error_context: str,
+    client: httpx.AsyncClient | None = None,
 ) -> T:
     """
-    Execute fetch function with exponential backoff retry logic.
+    Execute fetch function, retrying transient network failures.
+
+    Which failures are retried and how long to wait in between is decided by
+    the RetryPolicy of the current task (RateSession sets one per house).
+    When a RateSession runs with a Hedger, each attempt is hedged by it.
 
     Args:
         fetch_fn: Async function that takes an httpx.AsyncClient and returns data
         timeout: Request timeout in seconds
-        max_retries: Maximum number of retry attempts
-        retry_delay: Base delay between retries (doubles each attempt)
+        max_retries: Maximum number of attempts
+        retry_delay: Base delay between retries, before jitter
         error_context: URL or context string for error messages
+        client: Shared client to send requests with. When None, a client is
+                created for this call and closed afterwards.
 
     Returns:
         Result from fetch_fn
 
     Raises:
         ValueError: On parsing errors (fails immediately, no retry)
-        httpx.HTTPError: On network errors after all retries exhausted
+        httpx.HTTPError: On a permanent error, or on a transient one once
+                         attempts or the retry budget run out
     """
-    async with get_http_client(timeout) as client:
-        last_error = None
+    policy = retry_policy.get()
+    active_hedger = hedger.get()
+    if active_hedger is not None:
+        fetch_fn = active_hedger.wrap(fetch_fn)
+    if policy.budget is not None:
+        policy.budget.record_request()
+
+    async with _use_client(client, timeout) as http:
+        delay = retry_delay
 
         for attempt in range(max_retries):
+            number = events.count_attempt() or attempt + 1
             try:
-                return await fetch_fn(client)
+                return await fetch_fn(http)
 
             except httpx.HTTPError as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay * (2**attempt))
-                continue
+                if (
+                    attempt == max_retries - 1
+                    or not policy.is_retryable(e)
+                    or (policy.budget is not None and not policy.budget.try_spend())
+                ):
+                    raise
+                delay = policy.next_delay(e, retry_delay, delay)
+                events.emit("retry", delay, url=error_context, attempt=number, error=e)
+                await asyncio.sleep(delay)
 
             except (ValueError, KeyError, TypeError, AttributeError, IndexError) as e:
                 msg = (
@@ -81,7 +382,5 @@ async def fetch_with_retry(
                 )
                 raise ValueError(msg) from e
 
-        if last_error is None:
-            msg = "Failed to fetch rates: no attempts were made"
-            raise ValueError(msg)
-        raise last_error
+    msg = "Failed to fetch rates: no attempts were made"
+    raise ValueError(msg)
@@ -1,33 +1,52 @@
+import re
+
 from datetime import datetime, timezone
 
 import httpx
 
 from bs4 import BeautifulSoup
-from bs4.element import Tag
+from bs4.element import ResultSet, Tag
+from bs4.filter import SoupStrainer
 
 from perexchange.models import ExchangeRate
-from perexchange.scrapers.base import fetch_with_retry
+from perexchange.scrapers.base import (
+    fetch_with_retry,
+    parse_html_response,
+    parse_scoped,
+)
 
 
 URL = "https://cuantoestaeldolar.pe/cambio-de-dolar-online"
 
+# The list of exchange house cards. Class names carry a build hash suffix.
+CARDS_SCOPE = SoupStrainer("div", class_=re.compile(r"^ExchangeHouses_root__"))
+
 
 async def fetch_cuantoestaeldolar(
     timeout: float = 10.0,
     max_retries: int = 3,
     retry_delay: float = 0.5,
+    client: httpx.AsyncClient | None = None,
 ) -> list[ExchangeRate]:
     async def _fetch(client: httpx.AsyncClient) -> list[ExchangeRate]:
         response = await client.get(URL)
         response.raise_for_status()
-        return _parse_html(response.text)
+        return await parse_html_response(response, _parse_html)
+
+    return await fetch_with_retry(
+        _fetch, timeout, max_retries, retry_delay, URL, client=client
+    )
+
 
-    return await fetch_with_retry(_fetch, timeout, max_retries, retry_delay, URL)
+def _find_change_buttons(soup: BeautifulSoup) -> ResultSet[Tag] | None:
+    buttons: ResultSet[Tag] = soup.find_all("a", string="CAMBIAR")  # type: ignore[call-overload]
+    return buttons or None
 
 
 def _parse_html(html_content: str) -> list[ExchangeRate]:
-    soup = BeautifulSoup(html_content, "lxml")
-    change_buttons = soup.find_all("a", string="CAMBIAR")  # type: ignore[call-overload]
+    change_buttons = parse_scoped(
+        html_content, "lxml", CARDS_SCOPE, _find_change_buttons
+    )
 
     if not change_buttons:
         msg = "No exchange houses found in HTML"
@@ -1,33 +1,73 @@
+from collections.abc import Mapping
 from datetime import datetime, timezone
 
 import httpx
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
+from bs4.filter import SoupStrainer
 
 from perexchange.models import ExchangeRate
-from perexchange.scrapers.base import fetch_with_retry
+from perexchange.scrapers.base import (
+    AnyOf,
+    fetch_html_stream,
+    fetch_with_retry,
+    parse_scoped,
+)
 
 
 URL = "https://app.dollarhouse.pe/calculadorav2"
 
+# The visual rate display and the hidden inputs that back it.
+RATES_SCOPE = AnyOf(
+    SoupStrainer("div", class_="exchange-rate"),
+    SoupStrainer("input", id=["purchaseprice", "op_saleprice"]),
+)
+
 
 async def fetch_dollarhouse(
     timeout: float = 10.0,
     max_retries: int = 3,
     retry_delay: float = 0.5,
+    client: httpx.AsyncClient | None = None,
 ) -> list[ExchangeRate]:
     async def _fetch(client: httpx.AsyncClient) -> list[ExchangeRate]:
-        response = await client.get(URL)
-        response.raise_for_status()
-        return _parse_html(response.text)
+        # Stop reading once both visual rates are in. The hidden inputs come
+        # earlier in the page but only serve as a fallback, which needs the
+        # whole page anyway.
+        return await fetch_html_stream(
+            client, URL, _parse_html, _is_visual_rate, wanted=2
+        )
+
+    return await fetch_with_retry(
+        _fetch, timeout, max_retries, retry_delay, URL, client=client
+    )
+
 
-    return await fetch_with_retry(_fetch, timeout, max_retries, retry_delay, URL)
+def _is_visual_rate(tag: str, attrs: Mapping[str, str]) -> bool:
+    return tag == "div" and "exchange-rate" in attrs.get("class", "").split()
 
 
 def _parse_html(html_content: str) -> list[ExchangeRate]:
-    soup = BeautifulSoup(html_content, "html.parser")
+    prices = parse_scoped(html_content, "html.parser", RATES_SCOPE, _extract_prices)
+
+    if prices is None:
+        msg = "No valid exchange rates parsed"
+        raise ValueError(msg)
+
+    buy_price, sell_price = prices
+    timestamp = datetime.now(timezone.utc)
+    return [
+        ExchangeRate(
+            name="dollarhouse",
+            buy_price=buy_price,
+            sell_price=sell_price,
+            timestamp=timestamp,
+        )
+    ]
 
+
+def _extract_prices(soup: BeautifulSoup) -> tuple[float, float] | None:
     buy_price = None
     sell_price = None
 
@@ -52,18 +92,9 @@ def _parse_html(html_content: str) -> list[ExchangeRate]:
             sell_price = _parse_float(value if isinstance(value, str) else None)
 
     if buy_price is None or sell_price is None or buy_price <= 0 or sell_price <= 0:
-        msg = "No valid exchange rates parsed"
-        raise ValueError(msg)
+        return None
 
-    timestamp = datetime.now(timezone.utc)
-    return [
-        ExchangeRate(
-            name="dollarhouse",
-            buy_price=buy_price,
-            sell_price=sell_price,
-            timestamp=timestamp,
-        )
-    ]
+    return buy_price, sell_price
 
 
 def _extract_rate_from_div(rate_div: Tag) -> float | None:
@@ -1,30 +1,44 @@
 import re
 
+from collections.abc import Mapping
 from datetime import datetime, timezone
 
 import httpx
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
+from bs4.filter import SoupStrainer
 
 from perexchange.models import ExchangeRate
-from perexchange.scrapers.base import fetch_with_retry
+from perexchange.scrapers.base import (
+    fetch_html_stream,
+    fetch_with_retry,
+    parse_scoped,
+)
 
 
 URL = "https://instakash.net/"
 
+RATES_CONTAINER_CLASS = "flex items-center justify-center text-primary gap-10 py-1"
+RATES_SCOPE = SoupStrainer("div", class_=RATES_CONTAINER_CLASS)
+
 
 async def fetch_instakash(
     timeout: float = 10.0,
     max_retries: int = 3,
     retry_delay: float = 0.5,
+    client: httpx.AsyncClient | None = None,
 ) -> list[ExchangeRate]:
     async def _fetch(client: httpx.AsyncClient) -> list[ExchangeRate]:
-        response = await client.get(URL)
-        response.raise_for_status()
-        return _parse_html(response.text)
+        return await fetch_html_stream(client, URL, _parse_html, _is_rates_container)
+
+    return await fetch_with_retry(
+        _fetch, timeout, max_retries, retry_delay, URL, client=client
+    )
+
 
-    return await fetch_with_retry(_fetch, timeout, max_retries, retry_delay, URL)
+def _is_rates_container(tag: str, attrs: Mapping[str, str]) -> bool:
+    return tag == "div" and attrs.get("class") == RATES_CONTAINER_CLASS
 
 
 def _extract_rate_value(rate_div: Tag) -> float | None:
@@ -37,11 +51,13 @@ def _extract_rate_value(rate_div: Tag) -> float | None:
     return float(match.group(0)) if match else None
 
 
-def _parse_html(html_content: str) -> list[ExchangeRate]:
-    soup = BeautifulSoup(html_content, "html.parser")
+def _find_rates_container(soup: BeautifulSoup) -> Tag | None:
+    return soup.find("div", class_=RATES_CONTAINER_CLASS)
+
 
-    rates_container = soup.find(
-        "div", class_="flex items-center justify-center text-primary gap-10 py-1"
+def _parse_html(html_content: str) -> list[ExchangeRate]:
+    rates_container = parse_scoped(
+        html_content, "html.parser", RATES_SCOPE, _find_rates_container
     )
 
     if not rates_container:
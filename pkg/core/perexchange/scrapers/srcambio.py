@@ -4,7 +4,7 @@ from typing import Any
 import httpx
 
 from perexchange.models import ExchangeRate
-from perexchange.scrapers.base import fetch_with_retry
+from perexchange.scrapers.base import fetch_with_retry, parse_json_response
 
 
 URL = "https://api.srcambio.com/Exchange/Rate?moneda=USD"
@@ -14,13 +14,16 @@ async def fetch_srcambio(
     timeout: float = 10.0,
     max_retries: int = 3,
     retry_delay: float = 0.5,
+    client: httpx.AsyncClient | None = None,
 ) -> list[ExchangeRate]:
     async def _fetch(client: httpx.AsyncClient) -> list[ExchangeRate]:
         response = await client.get(URL)
         response.raise_for_status()
-        return _parse_json(response.json())
+        return await parse_json_response(response, _parse_json)
 
-    return await fetch_with_retry(_fetch, timeout, max_retries, retry_delay, URL)
+    return await fetch_with_retry(
+        _fetch, timeout, max_retries, retry_delay, URL, client=client
+    )
 
 
 def _parse_json(response_data: dict[str, Any]) -> list[ExchangeRate]:
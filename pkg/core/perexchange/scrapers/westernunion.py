@@ -1,66 +1,165 @@
+import html
+import re
+import time
+import weakref
+
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
 import httpx
 
-from bs4 import BeautifulSoup
-
 from perexchange.models import ExchangeRate
-from perexchange.scrapers.base import fetch_with_retry
+from perexchange.scrapers.base import (
+    fetch_with_retry,
+    parse_json_response,
+    run_parse,
+)
 
 
 PAGE_URL = "https://www.westernunionperu.pe/cambiodemoneda"
 API_URL = "https://www.westernunionperu.pe/cambiodemoneda/Operation/PostTipoCambio"
 
+# How long a token is reused when its cookies carry no expiry of their own.
+TOKEN_TTL = 20 * 60
+
+# Status codes the antiforgery filter answers with when a token is stale.
+_REJECTED_STATUSES = {400, 401, 403, 419, 440}
+
+_INPUT_TAG = re.compile(r"<input\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+
+@dataclass(frozen=True)
+class _Credentials:
+    token: str
+    expires_at: float  # time.time() seconds
+
+
+# Tokens are bound to the cookies in the jar of the client that loaded the
+# page, so each client (one per RateSession) keeps its own.
+_credentials: weakref.WeakKeyDictionary[httpx.AsyncClient, _Credentials] = (
+    weakref.WeakKeyDictionary()
+)
+
 
 async def fetch_westernunion(
     timeout: float = 10.0,
     max_retries: int = 3,
     retry_delay: float = 0.5,
+    client: httpx.AsyncClient | None = None,
 ) -> list[ExchangeRate]:
     async def _fetch(client: httpx.AsyncClient) -> list[ExchangeRate]:
-        page_response = await client.get(PAGE_URL)
-        page_response.raise_for_status()
-
-        token = _extract_verification_token(page_response.text)
-
-        api_response = await client.post(
-            API_URL,
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": PAGE_URL,
-            },
-            data={
-                "monto": "1000",
-                "moneda": "2",
-                "tipo": "1",
-                "__RequestVerificationToken": token,
-                "ERequestServicesGeneral[Recaptcha]": "",
-            },
-        )
+        credentials = _cached_credentials(client)
+        reused = credentials is not None
+        if credentials is None:
+            credentials = await _fetch_credentials(client)
+
+        api_response = await _post_rates(client, credentials)
+
+        if reused and _is_rejected(api_response):
+            clear_token_cache(client)
+            credentials = await _fetch_credentials(client)
+            api_response = await _post_rates(client, credentials)
+
         api_response.raise_for_status()
 
-        return _parse_json(api_response.json())
+        return await parse_json_response(api_response, _parse_json)
+
+    return await fetch_with_retry(
+        _fetch, timeout, max_retries, retry_delay, API_URL, client=client
+    )
+
 
-    return await fetch_with_retry(_fetch, timeout, max_retries, retry_delay, API_URL)
+def clear_token_cache(client: httpx.AsyncClient | None = None) -> None:
+    """
+    Forget the CSRF token cached for `client`, or for every client if None,
+    so the next fetch loads the page again.
+    """
+    if client is None:
+        _credentials.clear()
+    else:
+        _credentials.pop(client, None)
+
+
+def _cached_credentials(client: httpx.AsyncClient) -> _Credentials | None:
+    credentials = _credentials.get(client)
+    if credentials is None or credentials.expires_at <= time.time():
+        return None
+    return credentials
+
+
+async def _fetch_credentials(client: httpx.AsyncClient) -> _Credentials:
+    page_response = await client.get(PAGE_URL)
+    page_response.raise_for_status()
+
+    token = await run_parse(_extract_verification_token, page_response.text)
+
+    now = time.time()
+    expires_at = now + TOKEN_TTL
+    for cookie in page_response.cookies.jar:
+        if cookie.expires is not None:
+            expires_at = min(expires_at, cookie.expires)
+
+    credentials = _credentials[client] = _Credentials(token, expires_at)
+    return credentials
+
+
+async def _post_rates(
+    client: httpx.AsyncClient,
+    credentials: _Credentials,
+) -> httpx.Response:
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+        "X-Requested-With": "XMLHttpRequest",
+        "Referer": PAGE_URL,
+    }
+    return await client.post(
+        API_URL,
+        headers=headers,
+        data={
+            "monto": "1000",
+            "moneda": "2",
+            "tipo": "1",
+            "__RequestVerificationToken": credentials.token,
+            "ERequestServicesGeneral[Recaptcha]": "",
+        },
+    )
+
+
+def _is_rejected(response: httpx.Response) -> bool:
+    return response.status_code in _REJECTED_STATUSES or response.is_redirect
 
 
 def _extract_verification_token(html_content: str) -> str:
-    """Extract CSRF token from Western Union page."""
-    soup = BeautifulSoup(html_content, "html.parser")
-    token_input = soup.find("input", {"name": "__RequestVerificationToken"})
+    """
+    Extract CSRF token from Western Union page.
+
+    Scans `<input>` tags with a regex instead of building a parse tree; the
+    token is the only thing needed from the page.
+    """
+    for tag in _INPUT_TAG.finditer(html_content):
+        if "__RequestVerificationToken" not in tag.group(0):
+            continue
+
+        attributes = {
+            match.group(1).lower(): html.unescape(
+                match.group(2) or match.group(3) or match.group(4) or ""
+            )
+            for match in _ATTRIBUTE.finditer(tag.group(0))
+        }
+        if attributes.get("name") != "__RequestVerificationToken":
+            continue
 
-    if not token_input:
-        msg = "Could not find verification token on page"
-        raise ValueError(msg)
+        token = attributes.get("value")
+        if not token:
+            msg = "Verification token is empty or invalid"
+            raise ValueError(msg)
 
-    token = token_input.get("value")
-    if not token or not isinstance(token, str):
-        msg = "Verification token is empty or invalid"
-        raise ValueError(msg)
+        return token
 
-    return token
+    msg = "Could not find verification token on page"
+    raise ValueError(msg)
 
 
 def _parse_json(data: dict[str, Any]) -> list[ExchangeRate]:
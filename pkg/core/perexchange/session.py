@@ -0,0 +1,452 @@
+import asyncio
+import time
+
+from collections.abc import AsyncGenerator, Container, Iterable, Mapping, Sequence
+from types import TracebackType
+
+import httpx
+
+from perexchange import events
+from perexchange.breaker import CircuitBreaker
+from perexchange.cache import RateCache
+from perexchange.cassette import Cassette
+from perexchange.context import current_house, house_cutoff
+from perexchange.events import HouseTrace, house_trace
+from perexchange.executor import ParseExecutor, parse_executor
+from perexchange.hedge import Hedger, hedger
+from perexchange.http_cache import HTTPCache
+from perexchange.models import ExchangeRate, FetchResult, HouseReport, HouseStatus
+from perexchange.retry import DEFAULT_POLICY, RetryPolicy, retry_policy
+from perexchange.scrapers import get_scraper, resolve_houses
+from perexchange.scrapers.base import create_http_client, pool_limits
+from perexchange.watch import PollScheduler
+
+
+class HouseBudgetError(Exception):
+    """A house was cancelled because it used up its `house_budget`."""
+
+
+class RateSession:
+    """
+    Long-lived fetcher that keeps HTTP connections warm between calls.
+
+    The session owns one HTTP/2-capable client shared by every house. Idle
+    connections stay in the pool (one per host) for `keepalive_expiry`
+    seconds, so a service that polls every few seconds pays for TCP and TLS
+    setup only on the first round.
+
+    Example:
+        >>> async with RateSession() as session:
+        ...     while True:
+        ...         rates = await session.fetch_rates()
+        ...         await asyncio.sleep(5)
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        keepalive_expiry: float = 60.0,
+        client: httpx.AsyncClient | None = None,
+        cache: RateCache | None = None,
+        http_cache: HTTPCache | None = None,
+        parse_executor: ParseExecutor | None = None,
+        hedger: Hedger | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retry_policy: RetryPolicy | Mapping[str, RetryPolicy] | None = None,
+        house_budget: float | None = None,
+        cassette: Cassette | None = None,
+    ) -> None:
+        """
+        Args:
+            timeout: Request timeout per house (seconds)
+            max_retries: Retry attempts for failed requests
+            keepalive_expiry: Seconds an idle connection is kept open
+            client: Client to use instead of creating one. It is not closed
+                    by the session.
+            cache: Serve each house from this cache while its rates are fresh
+            http_cache: Send conditional requests and reuse unchanged bodies.
+                        Ignored when `client` is given.
+            parse_executor: Where scrapers parse responses. Defaults to
+                            parsing inline on the event loop.
+            hedger: Send a backup request when a house is slower than its
+                    usual p90 latency. Off by default.
+            circuit_breaker: Skip houses that keep failing until a probe
+                             request succeeds again
+            retry_policy: How failed requests are retried, for every house or
+                          per house name. Houses missing from a mapping use
+                          the default policy.
+            house_budget: Seconds one house may take in total, across all of
+                          its attempts, requests and backoff. A house that
+                          runs over is cancelled.
+            cassette: Record every response to a file, or answer requests
+                      from a recording instead of the network. Ignored when
+                      `client` is given.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.cache = cache
+        self.http_cache = http_cache
+        self.parse_executor = parse_executor
+        self.hedger = hedger
+        self.circuit_breaker = circuit_breaker
+        self.retry_policy = retry_policy
+        self.house_budget = house_budget
+        self.cassette = cassette
+        self._owns_client = client is None
+        # Only sessions on a plain client of their own may join scrapes
+        # started by other sessions: their answers come from the network.
+        self._shared = client is None and http_cache is None and cassette is None
+        if client is None:
+            limits = pool_limits(len(resolve_houses()), keepalive_expiry)
+            transport: httpx.AsyncBaseTransport | None = None
+            if http_cache is not None or cassette is not None:
+                transport = httpx.AsyncHTTPTransport(http2=True, limits=limits)
+                if cassette is not None:
+                    transport = cassette.transport(transport)
+                if http_cache is not None:
+                    transport = http_cache.transport(transport)
+            client = create_http_client(timeout, limits, transport)
+        self._client = client
+
+    @property
+    def closed(self) -> bool:
+        return self._client.is_closed
+
+    async def fetch_rates(
+        self,
+        houses: Sequence[str] | None = None,
+        *,
+        deadline: float | None = None,
+        report: bool = False,
+    ) -> FetchResult:
+        """
+        Fetch current exchange rates, skipping houses that fail.
+
+        Args:
+            houses: Specific house names to fetch. If None, fetches all.
+            deadline: Seconds the whole call may take. Houses still running
+                      when it expires are cancelled and listed in the
+                      result's `missed`. Houses cut off by the session's
+                      `house_budget` are listed in `over_budget`.
+            report: Fill the result's `report` with a HouseReport per house:
+                    status, attempts, elapsed time, bytes and error.
+
+        Returns:
+            FetchResult (a list of ExchangeRate objects). Empty if all houses
+            fail.
+
+        Raises:
+            ValueError: If a house name is not recognized
+        """
+        names = resolve_houses(houses)
+        traces = {name: HouseTrace(meter=report) for name in names}
+        cutoff = None
+        if deadline is not None:
+            cutoff = asyncio.get_running_loop().time() + deadline
+        tasks = {
+            asyncio.ensure_future(self._fetch_house(name, traces[name], cutoff)): name
+            for name in names
+        }
+        if not tasks:
+            return FetchResult()
+
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if pending:
+            # Let the cancelled scrapers unwind before the client can close.
+            await asyncio.wait(pending)
+
+        rates: list[ExchangeRate] = []
+        reports = {}
+        for task, name in tasks.items():
+            status, found, error = _outcome(task, pending)
+            rates.extend(found)
+            reports[name] = _house_report(name, status, traces[name], len(found), error)
+
+        return FetchResult(
+            _deduplicate(rates),
+            missed=[name for name in names if reports[name].status == "missed"],
+            over_budget=[
+                name for name in names if reports[name].status == "over_budget"
+            ],
+            report=reports if report else None,
+        )
+
+    async def stream_rates(
+        self,
+        houses: Sequence[str] | None = None,
+    ) -> AsyncGenerator[ExchangeRate, None]:
+        """
+        Yield rates as each house finishes, fastest house first.
+
+        Rates are deduplicated by name as they arrive, like fetch_rates does
+        at the end: a rate is yielded if its name is new, or if it is more
+        recent than the rate already yielded under that name. Consumers that
+        keep the last rate seen per name end up with fetch_rates' result.
+
+        Args:
+            houses: Specific house names to fetch. If None, fetches all.
+
+        Raises:
+            ValueError: If a house name is not recognized
+        """
+        names = resolve_houses(houses)
+        tasks = [asyncio.ensure_future(self._safe_fetch(name)) for name in names]
+        seen: dict[str, ExchangeRate] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for rate in await next_done:
+                    if _supersedes(rate, seen):
+                        seen[rate.name] = rate
+                        yield rate
+        finally:
+            # The consumer may stop early; don't leave scrapes running, and
+            # let them unwind before the client can close.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def watch_rates(
+        self,
+        houses: Sequence[str] | None = None,
+        *,
+        scheduler: PollScheduler | None = None,
+    ) -> AsyncGenerator[ExchangeRate, None]:
+        """
+        Poll houses until the consumer stops, yielding rates as they change.
+
+        Each house is polled on its own schedule (see PollScheduler): often
+        while its prices move, rarely while they don't. A rate is yielded on
+        the first poll and again whenever its price changes; names are
+        deduplicated across houses as in stream_rates. Failed polls are
+        skipped and retried after the house's current interval.
+
+        Args:
+            houses: Specific house names to poll. If None, polls all.
+            scheduler: Scheduler holding the per-house intervals. Pass one to
+                       inspect the intervals or keep them across calls.
+
+        Raises:
+            ValueError: If a house name is not recognized
+        """
+        names = resolve_houses(houses)
+        schedule = scheduler or PollScheduler()
+        changes: asyncio.Queue[list[ExchangeRate] | Exception] = asyncio.Queue()
+
+        tasks = [
+            asyncio.ensure_future(self._poll(name, schedule, changes)) for name in names
+        ]
+        seen: dict[str, ExchangeRate] = {}
+        try:
+            while True:
+                changed = await changes.get()
+                if isinstance(changed, Exception):
+                    raise changed
+                for rate in changed:
+                    if _supersedes(rate, seen):
+                        seen[rate.name] = rate
+                        yield rate
+        finally:
+            # Let the cancelled polls unwind before the client can close.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_house(self, house: str) -> list[ExchangeRate]:
+        """
+        Fetch rates from a single house.
+
+        Unlike fetch_rates, failures are not swallowed.
+
+        Raises:
+            ValueError: If the house name is not recognized or parsing fails
+            httpx.HTTPError: On network errors after all retries exhausted
+            CircuitOpenError: If the house's circuit breaker is open
+            HouseBudgetError: If the house ran over the session's house_budget
+        """
+        return await self._fetch_house(house, HouseTrace())
+
+    async def _fetch_house(
+        self,
+        house: str,
+        trace: HouseTrace,
+        cutoff: float | None = None,
+    ) -> list[ExchangeRate]:
+        if self.house_budget is not None:
+            budget_ends = asyncio.get_running_loop().time() + self.house_budget
+            cutoff = budget_ends if cutoff is None else min(cutoff, budget_ends)
+        scraper = get_scraper(
+            house, self.cache, self.circuit_breaker, shared=self._shared
+        )
+        house_token = current_house.set(house.lower())
+        trace_token = house_trace.set(trace)
+        hedger_token = hedger.set(self.hedger)
+        policy_token = retry_policy.set(self._policy_for(house.lower()))
+        cutoff_token = house_cutoff.set(cutoff)
+        executor_token = None
+        if self.parse_executor is not None:
+            executor_token = parse_executor.set(self.parse_executor)
+
+        started = time.perf_counter()
+        status = "error"
+        error: BaseException | None = None
+        try:
+            rates = await asyncio.wait_for(
+                scraper(
+                    timeout=self.timeout,
+                    max_retries=self.max_retries,
+                    client=self._client,
+                ),
+                self.house_budget,
+            )
+            status = "ok"
+            return rates
+        except asyncio.TimeoutError:
+            status = "over_budget"
+            msg = f"{house} did not finish within its {self.house_budget}s budget"
+            error = HouseBudgetError(msg)
+            raise error from None
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            trace.elapsed = time.perf_counter() - started
+            events.emit(
+                "outcome",
+                trace.elapsed,
+                attempt=trace.attempts,
+                bytes_received=trace.bytes_received,
+                status=status,
+                error=error,
+            )
+            if executor_token is not None:
+                parse_executor.reset(executor_token)
+            house_cutoff.reset(cutoff_token)
+            retry_policy.reset(policy_token)
+            hedger.reset(hedger_token)
+            house_trace.reset(trace_token)
+            current_house.reset(house_token)
+
+    async def close(self) -> None:
+        """
+        Close pooled connections. Safe to call more than once.
+
+        Background cache refreshes still running on the session's client (a
+        session with its own cassette or HTTP cache refreshes through it) are
+        awaited first.
+        """
+        if self._owns_client and not self._client.is_closed:
+            if self.cache is not None:
+                await self.cache.wait_refreshes(self._client)
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "RateSession":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def _policy_for(self, house: str) -> RetryPolicy:
+        if self.retry_policy is None:
+            return DEFAULT_POLICY
+        if isinstance(self.retry_policy, RetryPolicy):
+            return self.retry_policy
+        return self.retry_policy.get(house, DEFAULT_POLICY)
+
+    async def _poll(
+        self,
+        house: str,
+        scheduler: PollScheduler,
+        changes: "asyncio.Queue[list[ExchangeRate] | Exception]",
+    ) -> None:
+        """Poll one house on its schedule, queueing the rates that changed."""
+        try:
+            while True:
+                try:
+                    rates = await self.fetch_house(house)
+                except (httpx.HTTPError, ValueError, HouseBudgetError):
+                    wait = scheduler.record_failure(house)
+                else:
+                    changed, wait = scheduler.record(house, rates)
+                    if changed:
+                        changes.put_nowait(changed)
+                await asyncio.sleep(wait)
+        except Exception as e:  # noqa: BLE001 (re-raised by watch_rates)
+            changes.put_nowait(e)
+
+    async def _safe_fetch(self, house: str) -> list[ExchangeRate]:
+        """Fetch from one house, return empty list on failure."""
+        try:
+            return await self.fetch_house(house)
+        except (httpx.HTTPError, ValueError, HouseBudgetError):
+            return []
+
+
+def _outcome(
+    task: "asyncio.Future[list[ExchangeRate]]",
+    pending: Container["asyncio.Future[list[ExchangeRate]]"],
+) -> tuple[HouseStatus, list[ExchangeRate], BaseException | None]:
+    """Classify a finished fetch_house task; re-raise unexpected errors."""
+    if task in pending:
+        return "missed", [], None
+    error = task.exception()
+    if error is None:
+        return "ok", task.result(), None
+    if isinstance(error, HouseBudgetError):
+        return "over_budget", [], error
+    if isinstance(error, (httpx.HTTPError, ValueError)):
+        return "error", [], error
+    raise error
+
+
+def _house_report(
+    house: str,
+    status: HouseStatus,
+    trace: HouseTrace,
+    rates: int = 0,
+    error: BaseException | None = None,
+) -> HouseReport:
+    return HouseReport(
+        house=house,
+        status=status,
+        rates=rates,
+        attempts=trace.attempts,
+        elapsed=trace.elapsed,
+        bytes_received=trace.bytes_received,
+        source=trace.source,
+        error_type=type(error).__name__ if error is not None else None,
+        error_message=str(error) if error is not None else None,
+    )
+
+
+def _deduplicate(rates: Iterable[ExchangeRate]) -> list[ExchangeRate]:
+    # Deduplicate by name, keeping the most recent rate for each house.
+    # This handles cases where cuantoestaeldolar (an aggregator) returns rates for houses
+    # we also scrape directly (e.g., chapacambio). We prioritize the most recent timestamp,
+    # which is typically from direct scrapers since they have fresher data.
+    # This is a temporary measure until cuantoestaeldolar is replaced with individual scrapers.
+    seen: dict[str, ExchangeRate] = {}
+    for rate in rates:
+        if _supersedes(rate, seen):
+            seen[rate.name] = rate
+
+    return list(seen.values())
+
+
+def _supersedes(rate: ExchangeRate, seen: dict[str, ExchangeRate]) -> bool:
+    """Whether `rate` replaces the rate kept so far under its name."""
+    kept = seen.get(rate.name)
+    return kept is None or rate.timestamp > kept.timestamp
@@ -0,0 +1,153 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+
+from perexchange.models import ExchangeRate
+
+
+# Houses whose rates carry the upstream update time (yanki's `fecha`,
+# chapacambio's `updateAt`). Other scrapers stamp the parse time, which is
+# old for rates served from RateCache or an HTTPCache memo, so their
+# timestamps say nothing about when upstream changed.
+UPSTREAM_STAMPED = frozenset({"chapacambio", "yanki"})
+
+# chapacambio falls back to "now" when `updateAt` is missing; stamps this
+# recent are not taken as update times.
+UPSTREAM_STAMP_AGE = timedelta(seconds=1)
+
+# Weight of the newest gap in the running estimate of a house's update gap.
+_GAP_WEIGHT = 0.3
+
+
+@dataclass
+class HouseSchedule:
+    """Polling state for one house."""
+
+    interval: float  # Seconds between polls while nothing changes
+    polls: int = 0
+    changes: int = 0  # Polls that returned a new or different price
+    failures: int = 0
+    updated_at: datetime | None = None  # Latest upstream update time seen
+    update_gap: float | None = None  # Estimated seconds between upstream updates
+    prices: dict[str, tuple[float, float]] = field(default_factory=dict, repr=False)
+
+
+class PollScheduler:
+    """
+    Per-house polling intervals that follow how often prices change.
+
+    Every house starts at `min_interval`. A poll that finds no new price
+    stretches that house's interval by `slowdown`, up to `max_interval`; a
+    poll that finds one shrinks it by `speedup`. Houses whose prices sit
+    still for hours end up polled every `max_interval` seconds, while busy
+    ones stay near `min_interval`.
+
+    Houses that report when upstream last updated (yanki, chapacambio) also
+    get an estimate of their update gap, and are polled again just after the
+    next update is expected instead of on the plain interval.
+
+    Example:
+        >>> scheduler = PollScheduler(min_interval=30.0, max_interval=1800.0)
+        >>> async for rate in watch_rates(scheduler=scheduler):
+        ...     print(rate.name, rate.buy_price)
+        >>> scheduler.schedules()["yanki"].interval
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 15.0,
+        max_interval: float = 900.0,
+        *,
+        speedup: float = 0.5,
+        slowdown: float = 1.5,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Args:
+            min_interval: Shortest time between two polls of a house (seconds)
+            max_interval: Longest time between two polls of a house (seconds)
+            speedup: Interval multiplier after a poll that found a change
+            slowdown: Interval multiplier after a poll that found none
+            clock: Wall-clock time source, comparable with rate timestamps
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self._clock = clock
+        self._schedules: dict[str, HouseSchedule] = {}
+
+    def schedule(self, house: str) -> HouseSchedule:
+        """Return a snapshot of the schedule for `house`."""
+        return replace(self._schedule(house.lower()))
+
+    def schedules(self) -> dict[str, HouseSchedule]:
+        """Snapshots of every house polled so far."""
+        return {house: replace(s) for house, s in self._schedules.items()}
+
+    def record(
+        self, house: str, rates: Sequence[ExchangeRate]
+    ) -> tuple[list[ExchangeRate], float]:
+        """
+        Record a successful poll of `house`.
+
+        Returns:
+            The rates that are new or whose price changed since the last
+            poll, and the seconds to wait before polling the house again.
+        """
+        now = self._clock()
+        schedule = self._schedule(house)
+        changed = [
+            rate
+            for rate in rates
+            if schedule.prices.get(rate.name) != (rate.buy_price, rate.sell_price)
+        ]
+        schedule.prices = {r.name: (r.buy_price, r.sell_price) for r in rates}
+        if house in UPSTREAM_STAMPED:
+            self._observe_update(schedule, rates, now)
+
+        if schedule.polls > 0:
+            factor = self.speedup if changed else self.slowdown
+            schedule.interval = self._clamp(schedule.interval * factor)
+            schedule.changes += bool(changed)
+        schedule.polls += 1
+        return changed, self._wait(schedule, now)
+
+    def record_failure(self, house: str) -> float:
+        """Record a failed poll; return the seconds to wait before the next one."""
+        schedule = self._schedule(house)
+        schedule.failures += 1
+        return schedule.interval
+
+    def _schedule(self, house: str) -> HouseSchedule:
+        return self._schedules.setdefault(house, HouseSchedule(self.min_interval))
+
+    def _clamp(self, seconds: float) -> float:
+        return min(max(seconds, self.min_interval), self.max_interval)
+
+    def _observe_update(
+        self, schedule: HouseSchedule, rates: Sequence[ExchangeRate], now: datetime
+    ) -> None:
+        stamped = [r.timestamp for r in rates if now - r.timestamp > UPSTREAM_STAMP_AGE]
+        if not stamped:
+            return
+        updated_at = max(stamped)
+        previous = schedule.updated_at
+        if previous is not None and updated_at > previous:
+            gap = (updated_at - previous).total_seconds()
+            if schedule.update_gap is None:
+                schedule.update_gap = gap
+            else:
+                schedule.update_gap += _GAP_WEIGHT * (gap - schedule.update_gap)
+        if previous is None or updated_at > previous:
+            schedule.updated_at = updated_at
+
+    def _wait(self, schedule: HouseSchedule, now: datetime) -> float:
+        if schedule.updated_at is None or schedule.update_gap is None:
+            return schedule.interval
+        expected = schedule.updated_at + timedelta(seconds=schedule.update_gap)
+        until_update = (expected - now).total_seconds()
+        if until_update <= 0:
+            # Overdue; fall back to the interval the price history suggests.
+            return schedule.interval
+        return self._clamp(until_update)
@@ -1,5 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from perexchange.models import ExchangeRate
+
+
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
         "integration: marks tests as integration tests (slow, hits real websites)",
     )
+
+
+class FakeClock:
+    """Time source that only moves when a test moves it."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        if isinstance(self.now, datetime):
+            self.now += timedelta(seconds=seconds)
+        else:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Monotonic-style FakeClock starting at 0.0 seconds."""
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_clock():
+    """FakeClock factory, for a clock starting elsewhere: fake_clock(NOW)."""
+    return FakeClock
+
+
+@pytest.fixture
+def make_rate():
+    """ExchangeRate factory; sell defaults to buy + 0.05, timestamp to now."""
+
+    def make(name, buy=3.7, sell=None, timestamp=None):
+        return ExchangeRate(
+            name=name,
+            buy_price=buy,
+            sell_price=buy + 0.05 if sell is None else sell,
+            timestamp=timestamp or datetime.now(timezone.utc),
+        )
+
+    return make
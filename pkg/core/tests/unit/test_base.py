@@ -1,7 +1,15 @@
 import httpx
 import pytest
 
-from perexchange.scrapers.base import fetch_with_retry
+from bs4 import BeautifulSoup
+from bs4.filter import SoupStrainer
+from perexchange.scrapers.base import (
+    AnyOf,
+    fetch_html_stream,
+    fetch_with_retry,
+    parse_scoped,
+    pool_limits,
+)
 
 
 @pytest.mark.asyncio
@@ -12,9 +20,9 @@ async def test_retries_on_network_errors():
         nonlocal call_count
         call_count += 1
         msg = "Connection failed"
-        raise httpx.HTTPError(msg)
+        raise httpx.ConnectError(msg)
 
-    with pytest.raises(httpx.HTTPError):
+    with pytest.raises(httpx.ConnectError):
         await fetch_with_retry(
             failing_fetch,
             timeout=1.0,
@@ -35,7 +43,7 @@ async def test_succeeds_after_transient_failure():
         call_count += 1
         if call_count < 2:
             msg = "Temporary failure"
-            raise httpx.HTTPError(msg)
+            raise httpx.ReadTimeout(msg)
         return "success"
 
     result = await fetch_with_retry(
@@ -70,3 +78,164 @@ async def test_fails_immediately_on_parsing_errors():
         )
 
     assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_uses_shared_client_when_given():
+    seen = []
+
+    async def fetch(client):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        seen.append(client)
+        return "ok"
+
+    async with httpx.AsyncClient() as shared:
+        await fetch_with_retry(
+            fetch,
+            timeout=1.0,
+            max_retries=1,
+            retry_delay=0.01,
+            error_context="test-url",
+            client=shared,
+        )
+        assert not shared.is_closed
+
+    assert seen == [shared]
+
+
+def test_pool_limits_scale_with_houses():
+    limits = pool_limits(11)
+
+    assert limits.max_keepalive_connections == 11
+    assert limits.max_connections == 22
+
+
+def test_parse_scoped_builds_only_the_scope():
+    html = "<div class='rate'>3.37</div><p>footer</p><script>x = 1</script>"
+    seen = []
+
+    def extract(soup):
+        seen.append(soup.get_text())
+        return soup.find("div", class_="rate").get_text()
+
+    result = parse_scoped(html, "html.parser", SoupStrainer("div"), extract)
+
+    assert result == "3.37"
+    assert seen == ["3.37"]
+
+
+def test_parse_scoped_falls_back_to_full_parse():
+    html = "<section><span class='rate'>3.37</span></section>"
+    calls = 0
+
+    def extract(soup):
+        nonlocal calls
+        calls += 1
+        rate = soup.find("span", class_="rate")
+        return rate.get_text() if rate else None
+
+    result = parse_scoped(html, "html.parser", SoupStrainer("div"), extract)
+
+    assert result == "3.37"
+    assert calls == 2
+
+
+def test_any_of_keeps_elements_matching_either_strainer():
+    html = "<div class='a'>1</div><p>2</p><input id='b' value='3'>"
+    scope = AnyOf(SoupStrainer("div"), SoupStrainer("input", id="b"))
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=scope)
+
+    assert [tag.name for tag in soup.find_all()] == ["div", "input"]
+
+
+def chunked_page(chunks, sent, headers=None):
+    async def body():  # noqa: RUF029 (httpx streams response bodies from async iterators)
+        for chunk in chunks:
+            sent.append(chunk)
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, headers=headers, content=body())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def is_rate(tag, attrs):
+    return tag == "span" and attrs.get("class") == "rate"
+
+
+def read_rate(html):
+    soup = BeautifulSoup(html, "html.parser")
+    rate = soup.find("span", class_="rate")
+    if rate is not None and rate.get_text():
+        return rate.get_text()
+    backup = soup.find("input", id="rate")
+    if backup is None:
+        msg = "No rate"
+        raise ValueError(msg)
+    return backup["value"]
+
+
+@pytest.mark.asyncio
+async def test_html_stream_stops_once_elements_are_found():
+    sent = []
+    chunks = [b"<html><body><span class='rate'>3.37</span>", b"<p>", b"</p>"]
+    size = {"Content-Length": str(1024 * 1024)}
+
+    async with chunked_page(chunks, sent, size) as client:
+        result = await fetch_html_stream(client, "https://x.test", read_rate, is_rate)
+
+    assert result == "3.37"
+    assert sent == chunks[:1]
+
+
+@pytest.mark.asyncio
+async def test_html_stream_reads_a_short_rest_to_keep_the_connection():
+    sent = []
+    chunks = [b"<html><body><span class='rate'>3.37</span>", b"<p>", b"</p>"]
+
+    async with chunked_page(chunks, sent) as client:
+        result = await fetch_html_stream(client, "https://x.test", read_rate, is_rate)
+
+    assert result == "3.37"
+    assert sent == chunks
+
+
+@pytest.mark.asyncio
+async def test_html_stream_stops_draining_after_max_drain():
+    sent = []
+    chunks = [b"<span class='rate'>3.37</span>"] + [b"x" * 60 for _ in range(10)]
+
+    async with chunked_page(chunks, sent) as client:
+        result = await fetch_html_stream(
+            client, "https://x.test", read_rate, is_rate, max_drain=100
+        )
+
+    assert result == "3.37"
+    assert len(sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_html_stream_parses_whole_page_if_early_parse_fails():
+    sent = []
+    chunks = [b"<span class='rate'></span>", b"<div>", b"<input id='rate' value=3.4>"]
+
+    async with chunked_page(chunks, sent) as client:
+        result = await fetch_html_stream(client, "https://x.test", read_rate, is_rate)
+
+    assert result == "3.4"
+    assert sent == chunks
+
+
+@pytest.mark.asyncio
+async def test_html_stream_rejects_oversized_pages():
+    sent = []
+    chunks = [b"<p>" + b"x" * 60 for _ in range(10)]
+
+    async with chunked_page(chunks, sent) as client:
+        with pytest.raises(ValueError, match="larger than 100 bytes"):
+            await fetch_html_stream(
+                client, "https://x.test", read_rate, is_rate, max_bytes=100
+            )
+
+    assert len(sent) == 2
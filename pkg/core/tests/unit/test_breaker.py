@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from perexchange import RateSession, scrapers
+from perexchange.breaker import CircuitBreaker, CircuitOpenError
+from perexchange.models import ExchangeRate
+
+
+class Upstream:
+    """Scraper that fails while `down` is set, recording each call's retries."""
+
+    def __init__(self):
+        self.down = True
+        self.calls = []
+
+    async def __call__(self, timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        self.calls.append(max_retries)
+        await asyncio.sleep(0)
+        if self.down:
+            msg = "down"
+            raise httpx.ConnectError(msg)
+        return [
+            ExchangeRate(
+                name="westernunion",
+                buy_price=3.7,
+                sell_price=3.8,
+                timestamp=datetime.now(timezone.utc),
+            )
+        ]
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+async def call(scraper, times=1):
+    for _ in range(times):
+        with contextlib.suppress(httpx.HTTPError):
+            await scraper()
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures(clock, upstream):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30.0, clock=clock)
+    scraper = breaker.wrap("westernunion", upstream)
+
+    await call(scraper, times=3)
+    assert breaker.state("westernunion").status == "open"
+
+    with pytest.raises(CircuitOpenError, match=r"next probe in 30\.0s"):
+        await scraper()
+    assert len(upstream.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_probe_success_closes_breaker(clock, upstream):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30.0, clock=clock)
+    scraper = breaker.wrap("westernunion", upstream)
+    await call(scraper, times=2)
+
+    clock.now = 30.0
+    upstream.down = False
+    rates = await scraper()
+
+    assert [r.name for r in rates] == ["westernunion"]
+    assert upstream.calls[-1] == 1  # The probe is a single request
+    state = breaker.state("westernunion")
+    assert (state.status, state.failures, state.trips) == ("closed", 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_probe_failure_reopens_breaker(clock, upstream):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30.0, clock=clock)
+    scraper = breaker.wrap("westernunion", upstream)
+    await call(scraper, times=2)
+
+    clock.now = 31.0
+    await call(scraper)
+
+    state = breaker.state("westernunion")
+    assert (state.status, state.opened_at, state.trips) == ("open", 31.0, 2)
+    with pytest.raises(CircuitOpenError):
+        await scraper()
+
+
+@pytest.mark.asyncio
+async def test_only_one_probe_at_a_time(clock, upstream):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30.0, clock=clock)
+    scraper = breaker.wrap("westernunion", upstream)
+    await call(scraper)
+
+    clock.now = 30.0
+    upstream.down = False
+    probe = asyncio.create_task(scraper())
+    await asyncio.sleep(0)
+
+    with pytest.raises(CircuitOpenError, match="probe is in progress"):
+        await scraper()
+    await probe
+    assert breaker.state("westernunion").status == "closed"
+
+
+@pytest.mark.asyncio
+async def test_parse_errors_do_not_open_breaker(clock):
+    async def broken(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        msg = "layout changed"
+        raise ValueError(msg)
+
+    breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+    scraper = breaker.wrap("westernunion", broken)
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="layout changed"):
+            await scraper()
+    assert breaker.state("westernunion").status == "closed"
+
+
+@pytest.mark.asyncio
+async def test_session_skips_open_houses(clock, upstream, monkeypatch):
+    monkeypatch.setitem(scrapers._SCRAPERS, "westernunion", upstream)
+    breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+
+    async with RateSession(circuit_breaker=breaker) as session:
+        assert await session.fetch_rates(["westernunion"]) == []
+        assert await session.fetch_rates(["westernunion"]) == []
+
+    assert len(upstream.calls) == 1
+    assert breaker.states()["westernunion"].status == "open"
+
+
+@pytest.mark.asyncio
+async def test_shared_request_counts_one_failure(clock, monkeypatch):
+    async def down(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        await asyncio.sleep(0.01)
+        msg = "down"
+        raise httpx.ConnectError(msg)
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "westernunion", down)
+    breaker = CircuitBreaker(failure_threshold=5, clock=clock)
+
+    async with RateSession(circuit_breaker=breaker) as session:
+        await asyncio.gather(*(session.fetch_rates(["westernunion"]) for _ in range(5)))
+
+    state = breaker.state("westernunion")
+    assert (state.status, state.failures) == ("closed", 1)
+
+
+@pytest.mark.asyncio
+async def test_houses_cut_off_by_their_budget_count_as_failures(clock, monkeypatch):
+    requests = []
+
+    async def hang(request):
+        requests.append(request)
+        await asyncio.Event().wait()
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        await client.get("https://westernunion.test/rates")
+        return []
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "westernunion", scraper)
+    breaker = CircuitBreaker(failure_threshold=3, clock=clock)
+
+    async with (
+        httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client,
+        RateSession(
+            client=client, circuit_breaker=breaker, house_budget=0.01
+        ) as session,
+    ):
+        statuses = [
+            (await session.fetch_rates(["westernunion"], report=True))
+            .report["westernunion"]
+            .status
+            for _ in range(5)
+        ]
+
+    assert statuses == ["over_budget"] * 3 + ["error"] * 2
+
+    state = breaker.state("westernunion")
+    assert (state.status, state.failures) == ("open", 3)
+    assert len(requests) == 3
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from perexchange import HTTPCache, RateCache, RateSession, fetch_rates, scrapers
+
+
+def counting_scraper(name, calls, make_rate, error=None):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        calls.append(name)
+        if error:
+            raise error
+        return [make_rate(name, buy=3.7 + len(calls) / 100)]
+
+    return scraper
+
+
+@pytest.fixture
+def calls(monkeypatch, make_rate):
+    seen = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "tkambio", counting_scraper("tkambio", seen, make_rate)
+    )
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_skip_upstream(calls):
+    cache = RateCache(ttl=60.0)
+
+    first = await fetch_rates(houses=["tkambio"], cache=cache)
+    second = await fetch_rates(houses=["tkambio"], cache=cache)
+
+    assert calls == ["tkambio"]
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing(calls, clock):
+    async with RateCache(ttl=10.0, stale_ttl=60.0, clock=clock) as cache:
+        first = await fetch_rates(houses=["tkambio"], cache=cache)
+
+        clock.now = 15.0
+        stale = await fetch_rates(houses=["tkambio"], cache=cache)
+        assert stale == first
+
+        await cache.wait_refreshes()
+        assert calls == ["tkambio", "tkambio"]
+        assert cache.get("tkambio") != first
+
+
+def slow_refresh(clients, make_rate):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        clients.append(client)
+        if len(clients) > 1:
+            await asyncio.sleep(0.05)
+        assert not client.is_closed
+        return [make_rate("tkambio")]
+
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_one_shot_calls_do_not_wait_for_refreshes(monkeypatch, clock, make_rate):
+    clients = []
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", slow_refresh(clients, make_rate))
+
+    async with RateCache(ttl=10.0, stale_ttl=60.0, clock=clock) as cache:
+        await fetch_rates(houses=["tkambio"], cache=cache)
+
+        clock.now = 15.0
+        started = time.perf_counter()
+        await fetch_rates(houses=["tkambio"], cache=cache)
+        assert time.perf_counter() - started < 0.05
+
+        await cache.wait_refreshes()
+        assert clients[1] is cache._client
+        assert not clients[1].is_closed
+
+    assert clients[1].is_closed
+
+
+@pytest.mark.asyncio
+async def test_sessions_with_their_own_transport_refresh_through_it(
+    monkeypatch, clock, make_rate
+):
+    clients = []
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", slow_refresh(clients, make_rate))
+    cache = RateCache(ttl=10.0, stale_ttl=60.0, clock=clock)
+    await fetch_rates(houses=["tkambio"], cache=cache)
+
+    clock.now = 15.0
+    session = RateSession(cache=cache, http_cache=HTTPCache())
+    async with session:
+        await session.fetch_rates(["tkambio"])
+
+    assert clients[1] is session._client
+    assert not cache._refreshing
+    assert cache.get("tkambio") is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_fetched_again(calls, clock):
+    cache = RateCache(ttl=10.0, stale_ttl=5.0, clock=clock)
+    await fetch_rates(houses=["tkambio"], cache=cache)
+
+    clock.now = 20.0
+    await fetch_rates(houses=["tkambio"], cache=cache)
+
+    assert calls == ["tkambio", "tkambio"]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached(monkeypatch, make_rate):
+    seen = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "yanki",
+        counting_scraper("yanki", seen, make_rate, error=httpx.ConnectError("down")),
+    )
+    cache = RateCache()
+
+    await fetch_rates(houses=["yanki"], cache=cache)
+    await fetch_rates(houses=["yanki"], cache=cache)
+
+    assert seen == ["yanki", "yanki"]
+    assert len(cache) == 0
+
+
+def test_per_house_ttl_and_eviction(clock):
+    cache = RateCache(ttl=10.0, ttls={"yanki": 100.0}, max_entries=2, clock=clock)
+    cache.set("tkambio", [])
+    cache.set("yanki", [])
+
+    clock.now = 50.0
+    assert cache.get("tkambio") is None
+    assert cache.get("yanki") == []
+
+    cache.set("cambiafx", [])
+    assert len(cache) == 2
+    assert "tkambio" not in cache._entries
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from perexchange import Cassette, CassetteMissError, RateSession
+from perexchange.cassette import Interaction
+from perexchange.scrapers import westernunion
+from perexchange.scrapers.base import create_http_client
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures" / "westernunion"
+PAGE = (FIXTURES_DIR / "page.html").read_text(encoding="utf-8")
+RATES = json.loads((FIXTURES_DIR / "happy_path.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    westernunion.clear_token_cache()
+    yield
+    westernunion.clear_token_cache()
+
+
+def upstream(request):
+    if request.method == "GET":
+        return httpx.Response(
+            200,
+            text=PAGE,
+            headers={"set-cookie": "__RequestVerificationToken_x=cookie; Path=/"},
+        )
+    return httpx.Response(200, json=RATES)
+
+
+def offline(request):
+    msg = "a replaying cassette used the network"
+    raise AssertionError(msg)
+
+
+async def record(path):
+    cassette = Cassette(path, "record")
+    transport = cassette.transport(httpx.MockTransport(upstream))
+    async with (
+        create_http_client(5.0, transport=transport) as client,
+        RateSession(client=client) as session,
+    ):
+        rates = await session.fetch_house("westernunion")
+    return cassette, rates
+
+
+async def test_records_both_westernunion_requests(tmp_path):
+    path = tmp_path / "wu.cassette"
+
+    cassette, _ = await record(path)
+
+    assert [(i.method, i.url) for i in cassette.interactions] == [
+        ("GET", westernunion.PAGE_URL),
+        ("POST", westernunion.API_URL),
+    ]
+    assert path.exists()
+    assert len(Cassette(path)) == 2
+
+
+async def test_replay_serves_recorded_responses_offline(tmp_path):
+    path = tmp_path / "wu.cassette"
+    _, recorded_rates = await record(path)
+    westernunion.clear_token_cache()
+
+    async with RateSession(cassette=Cassette(path)) as session:
+        rates = await session.fetch_house("westernunion")
+
+    assert [(r.name, r.buy_price, r.sell_price) for r in rates] == [
+        (r.name, r.buy_price, r.sell_price) for r in recorded_rates
+    ]
+
+
+async def test_replay_cycles_and_reports_misses(tmp_path):
+    path = tmp_path / "wu.cassette"
+    await record(path)
+    transport = Cassette(path).transport(httpx.MockTransport(offline))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        pages = [await client.get(westernunion.PAGE_URL) for _ in range(3)]
+        with pytest.raises(CassetteMissError, match="No recorded response"):
+            await client.get("https://example.test/")
+
+    assert [page.text for page in pages] == [PAGE] * 3
+
+
+async def test_realtime_replay_waits_recorded_latency(tmp_path, monkeypatch):
+    path = tmp_path / "slow.cassette"
+    cassette = Cassette(path, "record")
+    cassette.interactions.append(
+        Interaction("GET", "https://example.test/", 200, [], b"ok", 0.3, 0.2)
+    )
+    cassette.save()
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    transport = Cassette(path, realtime=True).transport(httpx.MockTransport(offline))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("https://example.test/")
+
+    assert response.content == b"ok"
+    assert sleeps == [0.3, 0.2]
@@ -0,0 +1,164 @@
+import asyncio
+
+from collections import Counter
+
+import httpx
+import pytest
+
+from perexchange import RateSession, fetch_rates, scrapers
+from perexchange.coalesce import SingleFlight
+
+
+HOUSES = ["cambioseguro", "tkambio", "yanki"]
+
+
+@pytest.fixture
+def upstream(monkeypatch, make_rate):
+    calls = Counter()
+
+    def slow_scraper(name):
+        async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+            calls[name] += 1
+            await asyncio.sleep(0.05)
+            return [make_rate(name)]
+
+        return scraper
+
+    for house in HOUSES:
+        monkeypatch.setitem(scrapers._SCRAPERS, house, slow_scraper(house))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_request_per_house(upstream):
+    results = await asyncio.gather(*(fetch_rates(houses=HOUSES) for _ in range(20)))
+
+    assert upstream == dict.fromkeys(HOUSES, 1)
+    for rates in results:
+        assert sorted(r.name for r in rates) == HOUSES
+    assert results[0] is not results[1]
+
+
+@pytest.mark.asyncio
+async def test_overlapping_house_sets_are_coalesced(upstream):
+    async with RateSession() as session:
+        first, second = await asyncio.gather(
+            session.fetch_rates(["tkambio", "yanki"]),
+            session.fetch_rates(["yanki", "cambioseguro"]),
+        )
+
+    assert upstream == dict.fromkeys(HOUSES, 1)
+    assert sorted(r.name for r in first) == ["tkambio", "yanki"]
+    assert sorted(r.name for r in second) == ["cambioseguro", "yanki"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced(upstream):
+    await fetch_rates(houses=["tkambio"])
+    await fetch_rates(houses=["tkambio"])
+
+    assert upstream["tkambio"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(flight.run("key", work))
+    await started.wait()
+    second = asyncio.create_task(flight.run("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_every_caller_is():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    finished = []
+
+    async def work():
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return "done"
+
+    callers = [asyncio.create_task(flight.run("key", work)) for _ in range(2)]
+    await started.wait()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.sleep(0.1)
+
+    assert finished == []
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_outlives_the_session_that_started_the_scrape(
+    monkeypatch, make_rate
+):
+    calls = []
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        calls.append(client)
+        await asyncio.sleep(0.05)
+        if client.is_closed:
+            msg = "Cannot send a request, as the client has been closed."
+            raise RuntimeError(msg)
+        return [make_rate("tkambio")]
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    hurried, patient = await asyncio.gather(
+        fetch_rates(["tkambio"], deadline=0.01),
+        fetch_rates(["tkambio"]),
+    )
+
+    assert hurried.missed == ["tkambio"]
+    assert [r.name for r in patient] == ["tkambio"]
+    assert len(calls) == 2
+    assert calls[0] is not calls[1]
+
+
+@pytest.mark.asyncio
+async def test_sessions_with_their_own_client_use_their_own_transport(
+    monkeypatch, make_rate
+):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        response = await client.get("https://tkambio.test/rate")
+        await asyncio.sleep(0.05)
+        return [make_rate("tkambio", buy=response.json()["buy"])]
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    def client_for(buy, requests):
+        def upstream(request):
+            requests.append(request)
+            return httpx.Response(200, json={"buy": buy})
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+
+    first_requests, second_requests = [], []
+    async with (
+        client_for(9.99, first_requests) as first_client,
+        client_for(3.71, second_requests) as second_client,
+        RateSession(client=first_client) as first,
+        RateSession(client=second_client) as second,
+    ):
+        first_rates, second_rates = await asyncio.gather(
+            first.fetch_rates(["tkambio"]),
+            second.fetch_rates(["tkambio"]),
+        )
+
+    assert first_rates[0].buy_price == pytest.approx(9.99)
+    assert second_rates[0].buy_price == pytest.approx(3.71)
+    assert len(first_requests) == len(second_requests) == 1
@@ -0,0 +1,66 @@
+import pytest
+
+from perexchange import DeltaTracker
+
+
+def test_first_update_adds_everything(make_rate):
+    tracker = DeltaTracker()
+
+    delta = tracker.update([make_rate("tkambio"), make_rate("yanki")])
+
+    assert [r.name for r in delta.added] == ["tkambio", "yanki"]
+    assert not delta.changed
+    assert not delta.removed
+
+
+def test_unchanged_prices_give_empty_delta(make_rate):
+    tracker = DeltaTracker()
+    tracker.update([make_rate("tkambio")])
+
+    delta = tracker.update([make_rate("tkambio")])
+
+    assert not delta
+
+
+def test_changed_and_removed_rates(make_rate):
+    tracker = DeltaTracker()
+    tracker.update([make_rate("tkambio"), make_rate("yanki")])
+
+    delta = tracker.update([make_rate("tkambio", sell=3.76), make_rate("cambiafx")])
+
+    assert [r.name for r in delta.added] == ["cambiafx"]
+    assert [c.current.name for c in delta.changed] == ["tkambio"]
+    assert delta.changed[0].sell_change == pytest.approx(0.01)
+    assert [r.name for r in delta.removed] == ["yanki"]
+    assert set(tracker.snapshot) == {"tkambio", "cambiafx"}
+
+
+def test_tolerance_accumulates_drift(make_rate):
+    tracker = DeltaTracker(tolerance=0.0025)
+    tracker.update([make_rate("tkambio", buy=3.700)])
+
+    assert not tracker.update([make_rate("tkambio", buy=3.702)])
+    delta = tracker.update([make_rate("tkambio", buy=3.704)])
+
+    assert delta.changed[0].previous.buy_price == pytest.approx(3.700)
+    assert delta.changed[0].buy_change == pytest.approx(0.004)
+
+
+def test_remove_after_ignores_brief_outages(make_rate):
+    tracker = DeltaTracker(remove_after=2)
+    tracker.update([make_rate("tkambio"), make_rate("yanki")])
+
+    assert not tracker.update([make_rate("tkambio")])
+    assert not tracker.update([make_rate("tkambio"), make_rate("yanki")])
+    assert not tracker.update([make_rate("tkambio")])
+    delta = tracker.update([make_rate("tkambio")])
+
+    assert [r.name for r in delta.removed] == ["yanki"]
+
+
+def test_reset_reports_everything_again(make_rate):
+    tracker = DeltaTracker()
+    tracker.update([make_rate("tkambio")])
+    tracker.reset()
+
+    assert [r.name for r in tracker.update([make_rate("tkambio")]).added] == ["tkambio"]
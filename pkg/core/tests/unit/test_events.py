@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from perexchange import HouseBudgetError, RateSession, events, scrapers
+from perexchange.scrapers.base import create_http_client
+
+
+BODY = b'{"buying_rate": "3.70", "selling_rate": "3.75"}'
+
+
+def tkambio_client(statuses):
+    """Client answering tkambio with each status in turn, then 200s."""
+    pending = list(statuses)
+
+    async def body():  # noqa: RUF029 (MockTransport streams async iterators only)
+        yield BODY
+
+    def handler(request):
+        status = pending.pop(0) if pending else 200
+        return httpx.Response(status, content=body() if status == 200 else b"")
+
+    return create_http_client(5.0, transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def recorded():
+    seen = []
+    with events.listening(seen.append):
+        yield seen
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args):
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+
+def kinds(seen):
+    return [event.kind for event in seen]
+
+
+async def test_successful_fetch_reports_each_step(recorded):
+    async with tkambio_client([]) as client, RateSession(client=client) as session:
+        await session.fetch_house("tkambio")
+
+    assert kinds(recorded) == ["ttfb", "download", "parse", "outcome"]
+    assert {event.house for event in recorded} == {"tkambio"}
+    download, outcome = recorded[1], recorded[-1]
+    assert download.bytes_received == len(BODY)
+    assert download.url == scrapers.tkambio.URL
+    assert outcome.status == "ok"
+    assert outcome.attempt == 1
+    assert outcome.bytes_received == len(BODY)
+
+
+async def test_retries_are_reported(recorded, no_sleep):
+    async with tkambio_client([503]) as client, RateSession(client=client) as session:
+        await session.fetch_house("tkambio")
+
+    retries = [event for event in recorded if event.kind == "retry"]
+    assert len(retries) == 1
+    assert retries[0].attempt == 1
+    assert isinstance(retries[0].error, httpx.HTTPStatusError)
+    assert recorded[-1].attempt == 2
+
+
+async def test_failed_house_reports_error_outcome(recorded, no_sleep):
+    async with (
+        tkambio_client([404]) as client,
+        RateSession(client=client) as session,
+    ):
+        with pytest.raises(httpx.HTTPStatusError):
+            await session.fetch_house("tkambio")
+
+    outcome = recorded[-1]
+    assert outcome.kind == "outcome"
+    assert outcome.status == "error"
+    assert isinstance(outcome.error, httpx.HTTPStatusError)
+
+
+async def test_over_budget_house_reports_outcome(monkeypatch, recorded):
+    async def hanging_scraper(**kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", hanging_scraper)
+    async with RateSession(client=httpx.AsyncClient(), house_budget=0.01) as session:
+        with pytest.raises(HouseBudgetError):
+            await session.fetch_house("tkambio")
+
+    assert recorded[-1].status == "over_budget"
+    assert isinstance(recorded[-1].error, HouseBudgetError)
+
+
+async def test_nothing_is_built_without_listeners(monkeypatch):
+    def fail(*args, **kwargs):
+        msg = "event built without listeners"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(events, "FetchEvent", fail)
+    monkeypatch.setattr(events, "_MeteredStream", fail)
+    async with tkambio_client([]) as client, RateSession(client=client) as session:
+        rates = await session.fetch_house("tkambio")
+
+    assert rates
+
+
+def test_broken_listener_warns_instead_of_raising():
+    def broken(event):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    with events.listening(broken), pytest.warns(RuntimeWarning, match="boom"):
+        events.emit("parse", 0.1)
@@ -0,0 +1,70 @@
+import time
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from perexchange import ParseBudgetError, ParseExecutor, RateSession
+from perexchange.scrapers.cuantoestaeldolar import _parse_html
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+HTML = (FIXTURES_DIR / "cuantoestaeldolar" / "happy_path.html").read_text(
+    encoding="utf-8"
+)
+
+
+def spin(seconds):
+    deadline = time.thread_time() + seconds
+    while time.thread_time() < deadline:
+        pass
+    return seconds
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+async def test_executors_parse_fixtures(kind):
+    executor = ParseExecutor(kind, max_workers=1)
+    try:
+        rates = await executor.run(_parse_html, HTML)
+    finally:
+        executor.close()
+
+    assert len(rates) == 2
+    assert executor.stats()[""].parses == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["inline", "thread"])
+async def test_cpu_budget_is_enforced(kind):
+    executor = ParseExecutor(kind, budget=0.01)
+    try:
+        with pytest.raises(ParseBudgetError):
+            await executor.run(spin, 0.05)
+    finally:
+        executor.close()
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown executor kind"):
+        ParseExecutor("gpu")
+
+
+@pytest.mark.asyncio
+async def test_session_parses_on_its_executor():
+    def upstream(request):
+        return httpx.Response(200, text=HTML)
+
+    executor = ParseExecutor("thread")
+    async with (
+        httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client,
+        RateSession(client=client, parse_executor=executor) as session,
+    ):
+        rates = await session.fetch_house("cuantoestaeldolar")
+    executor.close()
+
+    assert len(rates) == 2
+    stats = executor.stats()["cuantoestaeldolar"]
+    assert stats.parses == 1
+    assert stats.cpu_seconds <= stats.seconds
@@ -0,0 +1,149 @@
+import asyncio
+
+from collections import deque
+
+import pytest
+
+from perexchange import scrapers
+from perexchange.context import current_house
+from perexchange.hedge import Hedger
+from perexchange.scrapers.base import fetch_with_retry
+from perexchange.session import RateSession
+
+
+def train(hedger, house, latency, samples=20):
+    hedger._latencies[house] = deque([latency] * samples, maxlen=hedger.window)
+
+
+def delayed_fetch(delays, cancelled, unwind=0.0):
+    """Fetch function whose n-th call takes delays[n] seconds."""
+    calls = 0
+
+    async def fetch(client):
+        nonlocal calls
+        call = calls
+        calls += 1
+        try:
+            await asyncio.sleep(delays[call])
+        except asyncio.CancelledError:
+            if unwind:
+                await asyncio.sleep(unwind)
+            cancelled.append(call)
+            raise
+        return call
+
+    return fetch
+
+
+@pytest.fixture
+def westernunion():
+    token = current_house.set("westernunion")
+    yield
+    current_house.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled(westernunion):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "westernunion", 0.01)
+    cancelled = []
+
+    result = await hedger.wrap(delayed_fetch([1.0, 0], cancelled))(None)
+    await asyncio.sleep(0)
+
+    assert result == 1
+    assert cancelled == [0]
+    stats = hedger.stats()["westernunion"]
+    assert (stats.requests, stats.hedges, stats.hedge_wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_loser_unwinds_before_the_result_is_returned(westernunion):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "westernunion", 0.01)
+    cancelled = []
+
+    result = await hedger.wrap(delayed_fetch([1.0, 0], cancelled, unwind=0.01))(None)
+
+    assert result == 1
+    assert cancelled == [0]
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged(westernunion):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "westernunion", 0.05)
+
+    result = await hedger.wrap(delayed_fetch([0], []))(None)
+
+    assert result == 0
+    assert hedger.stats()["westernunion"].hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_until_latency_is_known(westernunion):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "westernunion", 0.01, samples=5)
+
+    result = await hedger.wrap(delayed_fetch([0.05, 0], []))(None)
+
+    assert result == 0
+    assert hedger.delay("westernunion") is None
+
+
+@pytest.mark.asyncio
+async def test_extra_load_is_capped(westernunion):
+    hedger = Hedger(max_extra=0.5)
+    train(hedger, "westernunion", 0.001, samples=100)
+
+    for _ in range(4):
+        await hedger.wrap(delayed_fetch([0.02, 0.02], []))(None)
+
+    stats = hedger.stats()["westernunion"]
+    assert stats.hedges == 2
+    assert stats.skipped == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_falls_back_to_primary(westernunion):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "westernunion", 0.01)
+    calls = []
+
+    async def fetch(client):
+        calls.append(len(calls))
+        if len(calls) == 2:
+            msg = "hedge failed"
+            raise ValueError(msg)
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await hedger.wrap(fetch)(None) == "primary"
+    assert calls == [0, 1]
+
+
+def test_only_listed_houses_are_hedged():
+    hedger = Hedger(houses=["WesternUnion"])
+    train(hedger, "westernunion", 0.2)
+    train(hedger, "tkambio", 0.2)
+
+    assert hedger.delay("westernunion") == pytest.approx(0.2)
+    assert hedger.delay("tkambio") is None
+
+
+@pytest.mark.asyncio
+async def test_session_hedges_scraper_requests(monkeypatch):
+    hedger = Hedger(max_extra=1.0)
+    train(hedger, "tkambio", 0.01)
+    fetch = delayed_fetch([1.0, 0], [])
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        return [await fetch_with_retry(fetch, timeout, 1, 0, "test", client=client)]
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    async with RateSession(hedger=hedger) as session:
+        result = await session.fetch_house("tkambio")
+
+    assert result == [1]
+    assert hedger.stats()["tkambio"].hedge_wins == 1
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from perexchange import HistoryStore, SQLiteHistory
+from perexchange.history.binary import RECORD
+
+
+START = datetime(2025, 1, 31, 23, 59, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def rate(make_rate):
+    """Rate stamped `seconds` after START."""
+
+    def at(name, seconds, buy=3.7):
+        return make_rate(name, buy, timestamp=START + timedelta(seconds=seconds))
+
+    return at
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(tmp_path) as store:
+        yield store
+
+
+def test_rates_round_trip(store, rate):
+    store.append([rate("tkambio", 0, 3.712345), rate("yanki", 0)])
+
+    [stored] = store.range("tkambio")
+
+    assert stored == rate("tkambio", 0, 3.712345)
+    assert store.names() == ["tkambio", "yanki"]
+
+
+def test_records_are_fixed_width_monthly_segments(store, tmp_path, rate):
+    store.append(rate("tkambio", s) for s in range(0, 60, 10))
+
+    segments = sorted(p.name for p in (tmp_path / "0").iterdir())
+
+    assert segments == ["2025-01.bin", "2025-02.bin"]
+    assert (tmp_path / "0" / "2025-01.bin").stat().st_size == 3 * RECORD.size
+
+
+def test_range_spans_segments(store, rate):
+    store.append(rate("tkambio", s) for s in range(0, 60, 10))
+
+    found = store.range(
+        "tkambio", START + timedelta(seconds=10), START + timedelta(seconds=40)
+    )
+
+    assert [r.timestamp.second for r in found] == [40, 50, 0]
+
+
+def test_latest_and_as_of(store, rate):
+    store.append(rate("tkambio", s, 3.7 + s / 1000) for s in range(0, 60, 10))
+
+    assert store.latest("tkambio").buy_price == pytest.approx(3.75)
+    assert store.as_of("tkambio", START + timedelta(seconds=35)).buy_price == (
+        pytest.approx(3.73)
+    )
+    assert store.as_of("tkambio", START - timedelta(seconds=1)) is None
+    assert store.latest("yanki") is None
+
+
+def test_out_of_order_rates_are_skipped(store, rate):
+    assert store.append([rate("tkambio", 10), rate("tkambio", 0)]) == 1
+    assert store.append([rate("tkambio", 10, 3.8)]) == 1
+
+    assert [r.buy_price for r in store.range("tkambio")] == [3.7, 3.8]
+
+
+def test_repeated_rates_are_stored_once(tmp_path, rate):
+    with HistoryStore(tmp_path) as store:
+        assert store.append([rate("yanki", 0)]) == 1
+        assert store.append([rate("yanki", 0)]) == 0
+
+    with HistoryStore(tmp_path) as store:
+        assert store.append([rate("yanki", 0), rate("yanki", 10)]) == 1
+        assert len(list(store.range("yanki"))) == 2
+
+
+@pytest.mark.parametrize("buy", [-0.01, 4294.967296, float("nan")])
+def test_unstorable_prices_reject_the_whole_batch(store, rate, buy):
+    with pytest.raises(ValueError, match="does not fit"):
+        store.append([rate("tkambio", 0), rate("tkambio", 10, buy)])
+
+    assert store.names() == []
+    assert store.append([rate("tkambio", 0)]) == 1
+
+
+def test_reopened_store_keeps_ids_and_order(tmp_path, rate):
+    with HistoryStore(tmp_path) as store:
+        store.append([rate("tkambio", 10), rate("yanki", 10)])
+
+    with HistoryStore(tmp_path) as store:
+        assert store.append([rate("yanki", 0), rate("yanki", 20)]) == 1
+        assert [r.timestamp.second for r in store.range("yanki")] == [40, 50]
+        assert store.latest("tkambio") == rate("tkambio", 10)
+
+
+@pytest.fixture
+def database(tmp_path):
+    with SQLiteHistory(tmp_path / "rates.db") as history:
+        yield history
+
+
+def test_sqlite_uses_wal(database):
+    assert database._db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_sqlite_queries(database, rate):
+    database.append(rate("tkambio", s, 3.7 + s / 1000) for s in range(0, 60, 10))
+    database.append([rate("yanki", 5)])
+
+    found = database.range(
+        "tkambio", START + timedelta(seconds=10), START + timedelta(seconds=40)
+    )
+
+    assert [r.timestamp.second for r in found] == [40, 50, 0]
+    assert database.latest("tkambio") == rate("tkambio", 50, 3.75)
+    assert database.as_of("tkambio", START + timedelta(seconds=35)) == (
+        rate("tkambio", 30, 3.73)
+    )
+    assert database.as_of("yanki", START) is None
+    assert database.names() == ["tkambio", "yanki"]
+    assert sorted(database.latest_all()) == ["tkambio", "yanki"]
+
+
+def test_sqlite_keeps_last_copy_of_a_rate(tmp_path, rate):
+    with SQLiteHistory(tmp_path / "rates.db") as history:
+        history.append([rate("tkambio", 0), rate("tkambio", 0, 3.8)])
+
+    with SQLiteHistory(tmp_path / "rates.db") as history:
+        assert [r.buy_price for r in history.range("tkambio")] == [3.8]
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from perexchange import HTTPCache, RateSession
+from perexchange.scrapers import cambioseguro
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+BODY = (FIXTURES_DIR / "cambioseguro" / "happy_path.json").read_bytes()
+
+
+class Upstream:
+    def __init__(self, headers):
+        self.headers = headers
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        etag = self.headers.get("etag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=self.headers)
+        return httpx.Response(200, headers=self.headers, content=BODY)
+
+
+def make_session(upstream, http_cache):
+    client = httpx.AsyncClient(
+        transport=http_cache.transport(httpx.MockTransport(upstream))
+    )
+    return client, RateSession(client=client)
+
+
+@pytest.mark.asyncio
+async def test_revalidates_with_etag_and_skips_parsing(monkeypatch):
+    parses = []
+    original = cambioseguro._parse_json
+    monkeypatch.setattr(
+        cambioseguro, "_parse_json", lambda data: parses.append(data) or original(data)
+    )
+    upstream = Upstream({"etag": '"v1"', "content-type": "application/json"})
+    http_cache = HTTPCache()
+    client, session = make_session(upstream, http_cache)
+
+    async with client, session:
+        first = await session.fetch_house("cambioseguro")
+        second = await session.fetch_house("cambioseguro")
+
+    assert len(upstream.requests) == 2
+    assert "if-none-match" not in upstream.requests[0].headers
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+    assert first == second
+    assert len(parses) == 1
+
+    stats = http_cache.stats()["cambioseguro"]
+    assert stats.revalidated == 1
+    assert stats.bytes_saved == len(BODY)
+    assert stats.parses_saved == 1
+
+
+@pytest.mark.asyncio
+async def test_serves_from_memory_while_max_age_lasts(clock):
+    upstream = Upstream({"cache-control": "max-age=30"})
+    http_cache = HTTPCache(clock=clock)
+    client, session = make_session(upstream, http_cache)
+
+    async with client, session:
+        await session.fetch_house("cambioseguro")
+        await session.fetch_house("cambioseguro")
+        clock.now = 31.0
+        await session.fetch_house("cambioseguro")
+
+    assert len(upstream.requests) == 2
+    assert http_cache.stats()["cambioseguro"].hits == 1
+
+
+@pytest.mark.asyncio
+async def test_no_store_responses_are_not_cached():
+    upstream = Upstream({"etag": '"v1"', "cache-control": "no-store"})
+    http_cache = HTTPCache()
+    client, session = make_session(upstream, http_cache)
+
+    async with client, session:
+        await session.fetch_house("cambioseguro")
+        await session.fetch_house("cambioseguro")
+
+    assert len(http_cache) == 0
+    assert "if-none-match" not in upstream.requests[1].headers
+
+
+@pytest.mark.asyncio
+async def test_last_modified_is_sent_back():
+    upstream = Upstream({"last-modified": "Wed, 01 Oct 2025 10:00:00 GMT"})
+    http_cache = HTTPCache()
+    client, session = make_session(upstream, http_cache)
+
+    async with client, session:
+        await session.fetch_house("cambioseguro")
+        await session.fetch_house("cambioseguro")
+
+    sent = upstream.requests[1].headers["if-modified-since"]
+    assert sent == "Wed, 01 Oct 2025 10:00:00 GMT"
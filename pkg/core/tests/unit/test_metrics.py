@@ -0,0 +1,120 @@
+import httpx
+import pytest
+
+from perexchange import HouseBudgetError, Metrics, events
+from perexchange.events import FetchEvent
+
+
+def outcome(house, status, seconds=0.2, error=None, bytes_received=100):
+    return FetchEvent(
+        "outcome",
+        house,
+        seconds,
+        attempt=1,
+        status=status,
+        error=error,
+        bytes_received=bytes_received,
+    )
+
+
+def samples(text):
+    """Map each sample line's name and labels to its value."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_counts_outcomes_failures_and_retries():
+    metrics = Metrics()
+    metrics(outcome("tkambio", "ok"))
+    metrics(outcome("tkambio", "ok"))
+    metrics(outcome("yanki", "error", error=httpx.ConnectError("refused")))
+    metrics(outcome("yanki", "over_budget", error=HouseBudgetError("slow")))
+    metrics(FetchEvent("retry", "yanki", 0.5, error=httpx.ReadTimeout("slow")))
+
+    values = samples(metrics.render())
+
+    assert values['perexchange_fetches_total{house="tkambio",status="ok"}'] == 2
+    assert values['perexchange_fetches_total{house="yanki",status="error"}'] == 1
+    assert values['perexchange_failures_total{house="yanki",error="ConnectError"}'] == 1
+    assert (
+        values['perexchange_failures_total{house="yanki",error="HouseBudgetError"}']
+        == 1
+    )
+    assert values['perexchange_retries_total{house="yanki",error="ReadTimeout"}'] == 1
+    assert values['perexchange_response_bytes_total{house="tkambio"}'] == 200
+
+
+def test_histograms_are_cumulative():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 5.0):
+        metrics(outcome("tkambio", "ok", seconds=seconds))
+    metrics(FetchEvent("parse", "tkambio", 0.002))
+
+    values = samples(metrics.render())
+
+    name = "perexchange_fetch_duration_seconds"
+    assert values[f'{name}_bucket{{house="tkambio",le="0.1"}}'] == 1
+    assert values[f'{name}_bucket{{house="tkambio",le="1.0"}}'] == 2
+    assert values[f'{name}_bucket{{house="tkambio",le="+Inf"}}'] == 3
+    assert values[f'{name}_count{{house="tkambio"}}'] == 3
+    assert values[f'{name}_sum{{house="tkambio"}}'] == pytest.approx(5.55)
+    parse = 'perexchange_parse_duration_seconds_count{house="tkambio"}'
+    assert values[parse] == 1
+
+
+def test_last_success_age_grows_until_next_success(fake_clock):
+    clock = fake_clock(1_000.0)
+    metrics = Metrics(clock=clock)
+    metrics(outcome("tkambio", "ok"))
+    clock.advance(30)
+    metrics(outcome("tkambio", "error", error=httpx.ConnectError("refused")))
+
+    age = 'perexchange_last_success_age_seconds{house="tkambio"}'
+    assert samples(metrics.render())[age] == 30
+
+    metrics(outcome("tkambio", "ok"))
+    assert samples(metrics.render())[age] == 0
+
+
+def test_write_replaces_file(tmp_path):
+    metrics = Metrics()
+    metrics(outcome("tkambio", "ok"))
+    path = tmp_path / "perexchange.prom"
+    path.write_text("stale")
+
+    metrics.write(path)
+
+    assert 'perexchange_fetches_total{house="tkambio",status="ok"} 1' in (
+        path.read_text()
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["perexchange.prom"]
+
+
+async def test_serve_answers_metrics_requests(fake_clock):
+    metrics = Metrics(clock=fake_clock(1_000.0))
+    metrics(outcome("tkambio", "ok"))
+    server = await metrics.serve(0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://127.0.0.1:{port}/metrics")
+            missing = await client.get(f"http://127.0.0.1:{port}/")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text == metrics.render()
+    assert missing.status_code == 404
+
+
+def test_records_events_once_registered():
+    metrics = Metrics()
+    with events.listening(metrics):
+        events.emit("parse", 0.01)
+
+    assert "perexchange_parse_duration_seconds_count" in metrics.render()
@@ -1,9 +1,13 @@
 import json
 
 from pathlib import Path
+from unittest.mock import patch
 
+import httpx
 import pytest
 
+from bs4 import BeautifulSoup
+from perexchange.scrapers import cuantoestaeldolar, dollarhouse, instakash
 from perexchange.scrapers.cambiafx import _parse_json as parse_cambiafx
 from perexchange.scrapers.cambioseguro import _parse_json as parse_cambioseguro
 from perexchange.scrapers.chapacambio import _parse_json as parse_chapacambio
@@ -15,6 +19,9 @@ from perexchange.scrapers.instakash import _parse_html as parse_instakash
 from perexchange.scrapers.srcambio import _parse_json as parse_srcambio
 from perexchange.scrapers.tkambio import _parse_json as parse_tkambio
 from perexchange.scrapers.tucambista import _parse_json as parse_tucambista
+from perexchange.scrapers.westernunion import (
+    _extract_verification_token as extract_westernunion_token,
+)
 from perexchange.scrapers.westernunion import _parse_json as parse_westernunion
 from perexchange.scrapers.yanki import _parse_json as parse_yanki
 
@@ -204,6 +211,25 @@ def test_westernunion_parsing(fixture, expected_count, should_fail):
             assert rate.spread > 0
 
 
+def test_westernunion_token_extraction():
+    html = load_html("westernunion", "page.html")
+
+    assert extract_westernunion_token(html) == "test-token-12345"
+
+
+@pytest.mark.parametrize(
+    "html,error",
+    [
+        ("<input name='__RequestVerificationToken' value=''>", "empty or invalid"),
+        ("<input name='other' value='x'>", "Could not find"),
+        ("<p>__RequestVerificationToken</p>", "Could not find"),
+    ],
+)
+def test_westernunion_token_extraction_errors(html, error):
+    with pytest.raises(ValueError, match=error):
+        extract_westernunion_token(html)
+
+
 @pytest.mark.parametrize(
     "fixture,expected_count,should_fail",
     [
@@ -301,3 +327,67 @@ def test_yanki_parsing(fixture, expected_count, should_fail):
             assert 2.0 <= rate.buy_price <= 5.0
             assert 2.0 <= rate.sell_price <= 5.0
             assert rate.spread > 0
+
+
+@pytest.mark.parametrize(
+    "module,house",
+    [
+        (cuantoestaeldolar, "cuantoestaeldolar"),
+        (dollarhouse, "dollarhouse"),
+        (instakash, "instakash"),
+    ],
+)
+def test_scoped_parse_matches_full_parse(module, house):
+    html = load_html(house, "happy_path.html")
+
+    def without_fallback(html_content, features, scope, extract):
+        return extract(BeautifulSoup(html_content, features, parse_only=scope))
+
+    def unscoped(html_content, features, scope, extract):
+        return extract(BeautifulSoup(html_content, features))
+
+    with patch.object(module, "parse_scoped", without_fallback):
+        scoped = module._parse_html(html)
+    with patch.object(module, "parse_scoped", unscoped):
+        full = module._parse_html(html)
+
+    assert scoped
+    assert [(r.name, r.buy_price, r.sell_price) for r in scoped] == [
+        (r.name, r.buy_price, r.sell_price) for r in full
+    ]
+
+
+@pytest.mark.parametrize(
+    "fetch,house,fixture,expected",
+    [
+        (instakash.fetch_instakash, "instakash", "happy_path.html", (3.362, 3.382)),
+        (
+            dollarhouse.fetch_dollarhouse,
+            "dollarhouse",
+            "happy_path.html",
+            (3.365, 3.372),
+        ),
+        (
+            dollarhouse.fetch_dollarhouse,
+            "dollarhouse",
+            "mismatched_data.html",
+            (3.365, 3.372),
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_streamed_fetch_matches_fixture(fetch, house, fixture, expected):
+    html = load_html(house, fixture).encode()
+    chunks = [html[i : i + 64] for i in range(0, len(html), 64)]
+
+    async def body():  # noqa: RUF029 (httpx streams response bodies from async iterators)
+        for chunk in chunks:
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, content=body())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        rates = await fetch(max_retries=1, client=client)
+
+    assert [(r.buy_price, r.sell_price) for r in rates] == [expected]
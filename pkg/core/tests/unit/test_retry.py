@@ -0,0 +1,169 @@
+import asyncio
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from perexchange import RateSession, scrapers
+from perexchange.retry import RetryBudget, RetryPolicy, parse_retry_after, retry_policy
+from perexchange.scrapers.base import fetch_with_retry
+
+
+def status_error(status, headers=None):
+    request = httpx.Request("GET", "https://example.test")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("status", request=request, response=response)
+
+
+def failing(error, calls):
+    async def fetch(client):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        calls.append(error)
+        raise error
+
+    return fetch
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    seen = []
+
+    async def fake_sleep(delay):  # noqa: RUF029 (Must be async to match asyncio.sleep)
+        seen.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return seen
+
+
+async def retry(error, policy, max_retries=3):
+    calls = []
+    token = retry_policy.set(policy)
+    try:
+        with pytest.raises(type(error)):
+            await fetch_with_retry(
+                failing(error, calls), 1.0, max_retries, 0.5, "test", client=object()
+            )
+    finally:
+        retry_policy.reset(token)
+    return len(calls)
+
+
+@pytest.mark.parametrize(
+    "error,attempts",
+    [
+        (httpx.ConnectError("refused"), 3),
+        (httpx.ReadTimeout("slow"), 3),
+        (status_error(503), 3),
+        (status_error(429), 3),
+        (status_error(404), 1),
+        (status_error(403), 1),
+        (httpx.UnsupportedProtocol("ftp"), 1),
+    ],
+)
+@pytest.mark.asyncio
+async def test_only_transient_errors_are_retried(error, attempts, sleeps):
+    assert await retry(error, RetryPolicy(budget=None)) == attempts
+
+
+@pytest.mark.parametrize(
+    "status,retried",
+    [
+        (428, False),
+        (429, True),
+        (430, False),
+        (499, False),
+        (500, True),
+        (501, True),
+        (505, True),
+        (520, True),
+        (524, True),
+        (599, True),
+        (600, False),
+    ],
+)
+def test_retryable_statuses_are_429_and_5xx(status, retried):
+    assert RetryPolicy().is_retryable(status_error(status)) is retried
+
+
+@pytest.mark.asyncio
+async def test_retry_after_sets_the_wait(sleeps):
+    policy = RetryPolicy(budget=None, max_retry_after=60.0)
+
+    await retry(status_error(429, {"Retry-After": "7"}), policy)
+    await retry(status_error(503, {"Retry-After": "120"}), policy)
+
+    assert sleeps == [7.0, 7.0, 60.0, 60.0]
+
+
+@pytest.mark.asyncio
+async def test_decorrelated_jitter_grows_from_base_delay(sleeps):
+    bounds = []
+
+    def upper_bound(low, high):
+        bounds.append((low, high))
+        return high
+
+    policy = RetryPolicy(budget=None, max_delay=3.0, random=upper_bound)
+    await retry(httpx.ConnectError("refused"), policy, max_retries=5)
+
+    assert bounds == [(0.5, 1.5), (0.5, 4.5), (0.5, 9.0), (0.5, 9.0)]
+    assert sleeps == [1.5, 3.0, 3.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_stops_retries(sleeps):
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=3.0)
+    policy = RetryPolicy(budget=budget)
+
+    assert await retry(httpx.ConnectError("refused"), policy) == 3
+    assert await retry(httpx.ConnectError("refused"), policy) == 2
+    assert await retry(httpx.ConnectError("refused"), policy) == 1
+
+
+def test_budget_refills_with_requests_and_time():
+    now = [0.0]
+    budget = RetryBudget(
+        ratio=0.5, min_per_second=1.0, max_tokens=2.0, clock=lambda: now[0]
+    )
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend()
+
+    now[0] = 10.0
+    assert budget.tokens == pytest.approx(2.0)
+
+
+def test_parse_retry_after():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert parse_retry_after("12") == pytest.approx(12.0)
+    assert 25 < parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_session_applies_policy_per_house(monkeypatch):
+    seen = {}
+
+    def scraper(name):
+        async def fetch(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+            seen[name] = retry_policy.get()
+            return []
+
+        return fetch
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper("tkambio"))
+    monkeypatch.setitem(scrapers._SCRAPERS, "yanki", scraper("yanki"))
+    patient = RetryPolicy(max_retry_after=120.0)
+
+    async with RateSession(retry_policy={"tkambio": patient}) as session:
+        await session.fetch_rates(["tkambio", "yanki"])
+
+    assert seen["tkambio"] is patient
+    assert seen["yanki"] == RetryPolicy()
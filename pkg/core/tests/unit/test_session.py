@@ -0,0 +1,346 @@
+import asyncio
+
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from perexchange import (
+    HouseBudgetError,
+    RateCache,
+    RateSession,
+    fetch_rates,
+    scrapers,
+    stream_rates,
+)
+from perexchange.scrapers.base import fetch_with_retry
+
+
+def fake_scraper(name, clients, make_rate, error=None):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        clients.append(client)
+        if error:
+            raise error
+        return [make_rate(name)]
+
+    return scraper
+
+
+@pytest.fixture
+def clients(monkeypatch, make_rate):
+    seen = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "tkambio",
+        fake_scraper("tkambio", seen, make_rate),
+    )
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "yanki",
+        fake_scraper("yanki", seen, make_rate, error=httpx.ConnectError("down")),
+    )
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_client_across_calls(clients):
+    async with RateSession() as session:
+        await session.fetch_rates(["tkambio"])
+        await session.fetch_rates(["tkambio"])
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert clients[0].is_closed
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_session_skips_failed_houses(clients):
+    async with RateSession() as session:
+        rates = await session.fetch_rates(["tkambio", "yanki"])
+
+    assert [r.name for r in rates] == ["tkambio"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_house_raises_errors(clients):
+    async with RateSession() as session:
+        with pytest.raises(httpx.ConnectError):
+            await session.fetch_house("yanki")
+        with pytest.raises(ValueError, match="Unknown house"):
+            await session.fetch_house("nonexistent")
+
+
+@pytest.mark.asyncio
+async def test_session_does_not_close_external_client(clients):
+    async with httpx.AsyncClient() as client:
+        async with RateSession(client=client) as session:
+            await session.fetch_rates(["tkambio"])
+
+        assert clients == [client]
+        assert not client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_fetch_rates_is_one_shot_session(clients):
+    rates = await fetch_rates(houses=["tkambio"])
+
+    assert [r.name for r in rates] == ["tkambio"]
+    assert clients[0].is_closed
+
+
+def delayed_scraper(rates, delay, finished):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        await asyncio.sleep(delay)
+        finished.append(delay)
+        return rates
+
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_stream_rates_yields_in_completion_order(monkeypatch, make_rate):
+    finished = []
+    old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    slow = [make_rate("westernunion"), make_rate("chapacambio")]
+    fast = [make_rate("tkambio"), make_rate("chapacambio", timestamp=old)]
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "westernunion", delayed_scraper(slow, 0.05, finished)
+    )
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "cuantoestaeldolar", delayed_scraper(fast, 0, finished)
+    )
+
+    rates = [rate async for rate in stream_rates(["westernunion", "cuantoestaeldolar"])]
+
+    assert [(r.name, r.timestamp == old) for r in rates] == [
+        ("tkambio", False),
+        ("chapacambio", True),
+        ("westernunion", False),
+        ("chapacambio", False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_rates_cancels_remaining_houses(monkeypatch, make_rate):
+    finished = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "westernunion",
+        delayed_scraper([make_rate("westernunion")], 0.05, finished),
+    )
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "tkambio",
+        delayed_scraper([make_rate("tkambio")], 0, finished),
+    )
+
+    async with RateSession() as session:
+        stream = session.stream_rates(["westernunion", "tkambio"])
+        first = await anext(stream)
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+
+    assert first.name == "tkambio"
+    assert finished == [0]
+
+
+@pytest.mark.asyncio
+async def test_stream_rates_lets_cancelled_houses_unwind(monkeypatch, make_rate):
+    unwound = []
+
+    async def slow(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            unwound.append(client.is_closed)
+            raise
+        return []
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "westernunion", slow)
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "tkambio", delayed_scraper([make_rate("tkambio")], 0, [])
+    )
+
+    stream = stream_rates(["westernunion", "tkambio"])
+    await anext(stream)
+    await stream.aclose()
+
+    assert unwound == [False]
+
+
+@pytest.mark.asyncio
+async def test_stream_rates_skips_failed_houses(clients):
+    async with RateSession() as session:
+        rates = [rate async for rate in session.stream_rates(["tkambio", "yanki"])]
+
+    assert [r.name for r in rates] == ["tkambio"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_partial_results(monkeypatch, make_rate):
+    finished = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "westernunion",
+        delayed_scraper([make_rate("westernunion")], 1.0, finished),
+    )
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "tkambio",
+        delayed_scraper([make_rate("tkambio")], 0, finished),
+    )
+
+    started = asyncio.get_running_loop().time()
+    rates = await fetch_rates(["westernunion", "tkambio"], deadline=0.05)
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert [r.name for r in rates] == ["tkambio"]
+    assert rates.missed == ["westernunion"]
+    assert not rates.complete
+    assert elapsed < 0.5
+    await asyncio.sleep(0)
+    assert finished == [0]
+
+
+@pytest.mark.asyncio
+async def test_no_missed_houses_without_deadline(clients):
+    async with RateSession() as session:
+        rates = await session.fetch_rates(["tkambio", "yanki"])
+
+    assert rates.missed == []
+    assert rates.complete
+
+
+@pytest.mark.asyncio
+async def test_house_budget_cancels_slow_house(monkeypatch, make_rate):
+    finished = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "westernunion",
+        delayed_scraper([make_rate("westernunion")], 1.0, finished),
+    )
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "tkambio",
+        delayed_scraper([make_rate("tkambio")], 0, finished),
+    )
+
+    async with RateSession(house_budget=0.05) as session:
+        rates = await session.fetch_rates(["westernunion", "tkambio"])
+        with pytest.raises(HouseBudgetError, match=r"within its 0\.05s budget"):
+            await session.fetch_house("westernunion")
+
+    assert [r.name for r in rates] == ["tkambio"]
+    assert rates.over_budget == ["westernunion"]
+    assert rates.missed == []
+    assert finished == [0]
+
+
+@pytest.mark.asyncio
+async def test_house_budget_covers_retries(monkeypatch):
+    attempts = []
+
+    async def flaky(client):
+        attempts.append(client)
+        await asyncio.sleep(0.02)
+        msg = "refused"
+        raise httpx.ConnectError(msg)
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        return await fetch_with_retry(
+            flaky, timeout, max_retries, 0.02, "test", client=client
+        )
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    async with RateSession(max_retries=10, house_budget=0.1) as session:
+        rates = await session.fetch_rates(["tkambio"])
+
+    assert rates.over_budget == ["tkambio"]
+    assert 1 < len(attempts) < 10
+
+
+@pytest.mark.asyncio
+async def test_report_describes_every_house(clients, monkeypatch, make_rate):
+    finished = []
+    monkeypatch.setitem(
+        scrapers._SCRAPERS,
+        "westernunion",
+        delayed_scraper([make_rate("westernunion")], 1.0, finished),
+    )
+
+    async with RateSession() as session:
+        rates = await session.fetch_rates(
+            ["tkambio", "yanki", "westernunion"], deadline=0.05, report=True
+        )
+
+    ok, failed, missed = (
+        rates.report[name] for name in ("tkambio", "yanki", "westernunion")
+    )
+    assert (ok.status, ok.rates, ok.error_type) == ("ok", 1, None)
+    assert failed.status == "error"
+    assert failed.error_type == "ConnectError"
+    assert failed.error_message == "down"
+    assert missed.status == "missed"
+    # Timed from the house's start, which can trail the call's by a GC pause.
+    assert missed.elapsed == pytest.approx(0.05, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_report_counts_attempts(monkeypatch):
+    async def flaky(client):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        msg = "refused"
+        raise httpx.ConnectError(msg)
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        return await fetch_with_retry(
+            flaky, timeout, max_retries, 0.0, "test", client=client
+        )
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    rates = await fetch_rates(["tkambio"], max_retries=3, report=True)
+
+    assert rates.report["tkambio"].attempts == 3
+    assert rates.report["tkambio"].status == "error"
+
+
+@pytest.mark.asyncio
+async def test_report_credits_shared_and_cached_requests(monkeypatch, make_rate):
+    async def flaky_once(client):
+        attempts.append(client)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            msg = "refused"
+            raise httpx.ConnectError(msg)
+        return [make_rate("tkambio")]
+
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        return await fetch_with_retry(
+            flaky_once, timeout, max_retries, 0.0, "test", client=client
+        )
+
+    attempts = []
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", scraper)
+
+    async with RateSession(cache=RateCache()) as session:
+        started, joined = await asyncio.gather(
+            session.fetch_rates(["tkambio"], report=True),
+            session.fetch_rates(["tkambio"], report=True),
+        )
+        cached = await session.fetch_rates(["tkambio"], report=True)
+
+    assert len(attempts) == 2
+    first, second, third = (r.report["tkambio"] for r in (started, joined, cached))
+    assert (first.source, first.attempts) == ("network", 2)
+    assert (second.source, second.attempts, second.status) == ("shared", 2, "ok")
+    assert (third.source, third.attempts, third.status) == ("cache", 0, "ok")
+
+
+@pytest.mark.asyncio
+async def test_no_report_unless_asked(clients):
+    rates = await fetch_rates(["tkambio"])
+
+    assert rates.report == {}
@@ -0,0 +1,152 @@
+import asyncio
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from perexchange import PollScheduler, RateSession, scrapers, watch_rates
+
+
+NOW = datetime(2025, 11, 18, 19, 0, tzinfo=timezone.utc)
+
+
+def test_unchanged_house_backs_off_to_max_interval(fake_clock, make_rate):
+    scheduler = PollScheduler(min_interval=10, max_interval=60, clock=fake_clock(NOW))
+
+    waits = [scheduler.record("tkambio", [make_rate("tkambio")])[1] for _ in range(6)]
+
+    assert waits == [10, 15, 22.5, 33.75, 50.625, 60]
+    assert scheduler.schedule("tkambio").changes == 0
+
+
+def test_price_change_is_returned_and_speeds_up_polling(fake_clock, make_rate):
+    scheduler = PollScheduler(min_interval=10, max_interval=60, clock=fake_clock(NOW))
+    for _ in range(4):
+        scheduler.record("tkambio", [make_rate("tkambio")])
+
+    changed, wait = scheduler.record("tkambio", [make_rate("tkambio", buy=3.71)])
+
+    assert [r.buy_price for r in changed] == [3.71]
+    assert wait == pytest.approx(33.75 / 2)
+    assert scheduler.schedule("tkambio").changes == 1
+
+
+def test_first_poll_returns_every_rate(fake_clock, make_rate):
+    scheduler = PollScheduler(clock=fake_clock(NOW))
+
+    changed, wait = scheduler.record(
+        "tkambio", [make_rate("tkambio"), make_rate("tkambio_1")]
+    )
+
+    assert len(changed) == 2
+    assert wait == scheduler.min_interval
+
+
+def test_upstream_update_times_schedule_next_poll(fake_clock, make_rate):
+    clock = fake_clock(NOW)
+    scheduler = PollScheduler(min_interval=10, max_interval=3600, clock=clock)
+    updated = NOW - timedelta(seconds=300)
+
+    # Upstream updated 300s ago, then again 600s later.
+    scheduler.record("yanki", [make_rate("yanki", timestamp=updated)])
+    clock.advance(600)
+    changed, wait = scheduler.record(
+        "yanki", [make_rate("yanki", 3.71, timestamp=updated + timedelta(seconds=600))]
+    )
+
+    assert changed
+    assert scheduler.schedule("yanki").update_gap == 600
+    # The next update is expected 600s after the last one, which was 300s ago.
+    assert wait == 300
+
+
+def test_old_timestamps_of_other_houses_are_not_update_times(fake_clock, make_rate):
+    clock = fake_clock(NOW)
+    scheduler = PollScheduler(min_interval=10, max_interval=3600, clock=clock)
+    cached = NOW - timedelta(seconds=300)
+
+    scheduler.record("tkambio", [make_rate("tkambio", timestamp=cached)])
+    clock.advance(600)
+    _, wait = scheduler.record(
+        "tkambio",
+        [make_rate("tkambio", 3.71, timestamp=cached + timedelta(seconds=600))],
+    )
+
+    assert scheduler.schedule("tkambio").update_gap is None
+    assert wait == 10
+
+
+def test_failures_keep_the_interval(fake_clock):
+    scheduler = PollScheduler(min_interval=10, clock=fake_clock(NOW))
+
+    assert scheduler.record_failure("yanki") == 10
+    assert scheduler.schedule("yanki").failures == 1
+
+
+def sequence_scraper(prices, polls, make_rate):
+    async def scraper(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        polls.append(client)
+        price = prices[min(len(polls), len(prices)) - 1]
+        if price is None:
+            msg = "down"
+            raise httpx.ConnectError(msg)
+        return [make_rate("tkambio", price)]
+
+    return scraper
+
+
+async def test_watch_rates_yields_only_changes(monkeypatch, make_rate):
+    polls = []
+    prices = [3.70, 3.70, None, 3.70, 3.72]
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "tkambio", sequence_scraper(prices, polls, make_rate)
+    )
+    scheduler = PollScheduler(min_interval=0.001, max_interval=0.002)
+
+    seen = []
+    async for found in watch_rates(["tkambio"], scheduler=scheduler):
+        seen.append(found.buy_price)
+        if len(seen) == 2:
+            break
+
+    assert seen == [3.70, 3.72]
+    assert len(polls) == 5
+    assert scheduler.schedule("tkambio").failures == 1
+
+
+async def test_watch_rates_raises_unexpected_errors(monkeypatch):
+    async def broken(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):  # noqa: RUF029 (Must be async to match scraper protocol for awaiting)
+        msg = "bug"
+        raise RuntimeError(msg)
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "tkambio", broken)
+
+    async with RateSession() as session:
+        with pytest.raises(RuntimeError, match="bug"):
+            async for _ in session.watch_rates(["tkambio"]):
+                pass
+
+
+async def test_watch_rates_lets_cancelled_polls_unwind(monkeypatch, make_rate):
+    unwound = []
+
+    async def slow(timeout=10.0, max_retries=3, retry_delay=0.5, client=None):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            unwound.append(client.is_closed)
+            raise
+        return []
+
+    monkeypatch.setitem(scrapers._SCRAPERS, "westernunion", slow)
+    monkeypatch.setitem(
+        scrapers._SCRAPERS, "tkambio", sequence_scraper([3.70], [], make_rate)
+    )
+
+    watch = watch_rates(["westernunion", "tkambio"])
+    await anext(watch)
+    await watch.aclose()
+
+    assert unwound == [False]
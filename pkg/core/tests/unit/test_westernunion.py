@@ -0,0 +1,101 @@
+import json
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from perexchange.scrapers import westernunion
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures" / "westernunion"
+PAGE = (FIXTURES_DIR / "page.html").read_text(encoding="utf-8")
+RATES = json.loads((FIXTURES_DIR / "happy_path.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    westernunion.clear_token_cache()
+    yield
+    westernunion.clear_token_cache()
+
+
+class Upstream:
+    def __init__(self):
+        self.requests = []
+        self.reject_token = None
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(
+                200,
+                text=PAGE,
+                headers={"set-cookie": "__RequestVerificationToken_x=cookie; Path=/"},
+            )
+        if self.reject_token and self.reject_token in request.content.decode():
+            return httpx.Response(400)
+        return httpx.Response(200, json=RATES)
+
+
+def client_for(upstream):
+    return httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+
+
+async def fetch(upstream, client=None):
+    if client is not None:
+        return await westernunion.fetch_westernunion(client=client, retry_delay=0.01)
+    async with client_for(upstream) as own:
+        return await westernunion.fetch_westernunion(client=own, retry_delay=0.01)
+
+
+@pytest.mark.asyncio
+async def test_token_is_reused_by_the_same_client():
+    upstream = Upstream()
+
+    async with client_for(upstream) as client:
+        await fetch(upstream, client)
+        rates = await fetch(upstream, client)
+
+    assert [r.method for r in upstream.requests] == ["GET", "POST", "POST"]
+    assert (
+        upstream.requests[2].headers["cookie"] == "__RequestVerificationToken_x=cookie"
+    )
+    assert rates[0].name == "westernunion"
+
+
+@pytest.mark.asyncio
+async def test_token_is_not_shared_between_clients():
+    upstream = Upstream()
+
+    await fetch(upstream)
+    await fetch(upstream)
+
+    assert [r.method for r in upstream.requests] == ["GET", "POST"] * 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_refreshed_once():
+    upstream = Upstream()
+    upstream.reject_token = "stale"
+
+    async with client_for(upstream) as client:
+        westernunion._credentials[client] = westernunion._Credentials(
+            "stale", float("inf")
+        )
+        rates = await fetch(upstream, client)
+
+    assert [r.method for r in upstream.requests] == ["POST", "GET", "POST"]
+    assert rates[0].name == "westernunion"
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_fetched_again(monkeypatch):
+    upstream = Upstream()
+    monkeypatch.setattr(westernunion, "TOKEN_TTL", 0)
+
+    async with client_for(upstream) as client:
+        for _ in range(3):
+            await fetch(upstream, client)
+
+    assert [r.method for r in upstream.requests] == ["GET", "POST"] * 3